@@ -0,0 +1,152 @@
+"""
+Shared pytest fixtures for NewsAPI response stubs, saved articles and configs.
+"""
+import logging
+from contextlib import contextmanager
+from io import StringIO
+
+import pytest
+
+import update_news
+
+
+@pytest.fixture(autouse=True)
+def isolated_output_paths(monkeypatch, tmp_path):
+    """
+    Point topic files and the metrics JSON at a per-test temp dir so no test writes into
+    the repo's _data/ and tests can run in parallel (pytest -n auto) without sharing files.
+    """
+    monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path / "news"))
+    monkeypatch.setattr(update_news, "DEFAULT_METRICS_JSON_PATH", str(tmp_path / "news_metrics.json"))
+
+
+@contextmanager
+def _capture_logger_output():
+    """Send update_news log records (DEBUG and up) to a StringIO for the duration of the block."""
+    old_handlers = update_news.logger.handlers[:]
+    old_level = update_news.logger.level
+    output = StringIO()
+    handler = logging.StreamHandler(output)
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+    update_news.logger.handlers = [handler]
+    update_news.logger.setLevel(logging.DEBUG)
+    try:
+        yield output
+    finally:
+        update_news.logger.handlers = old_handlers
+        update_news.logger.setLevel(old_level)
+
+
+@pytest.fixture
+def capture_logger_output():
+    """Context manager factory: `with capture_logger_output() as output:` captures formatted log lines."""
+    return _capture_logger_output
+
+
+@pytest.fixture
+def article():
+    """Raw NewsAPI article as returned in a response page."""
+    return {"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}
+
+
+@pytest.fixture
+def fetch_ok(article):
+    """Factory for a successful fetch_articles_page result holding n articles with URLs start..start+n-1."""
+    def _make(n=1, start=1, total_results=250):
+        articles = [dict(article, url=str(start + i)) for i in range(n)]
+        return ({"status": "ok", "totalResults": total_results, "articles": articles}, True, False, False)
+    return _make
+
+
+@pytest.fixture
+def pagination_config():
+    """Single-topic config for multi-page fetch_from_newsapi tests (get_config_value needs a real dict)."""
+    return {
+        "news_sources": {
+            "machine-learning": {
+                "title_query": "Machine Learning",
+                "related_keywords": ["machine learning"]
+            }
+        },
+        "api": {
+            "max_page_size": 100,
+            "max_pages": 5
+        }
+    }
+
+
+@pytest.fixture(scope="module")
+def combined_config():
+    """Two-topic config with combined request mode enabled (treat as read-only)."""
+    return {
+        "news_sources": {
+            "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
+            "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
+        },
+        "api": {"combine_topics_in_single_request": True}
+    }
+
+
+@pytest.fixture
+def cached_article():
+    """Article as stored in a topic YAML file."""
+    return {"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
+
+
+@pytest.fixture
+def sample_article():
+    """Freshly fetched article, newer than cached_article and with a different URL."""
+    return {"title": "New", "date": "2025-01-16", "url": "2", "description": "", "source": ""}
+
+
+class Recorder:
+    """
+    Call-recording stub. Answers from `respond` (a callable taking the call's arguments, or an
+    iterator of results) when set, otherwise returns `value` (raising it if it is an exception).
+    """
+    __slots__ = ('calls', 'respond', 'value')
+    
+    def __init__(self, value=None):
+        self.calls = []
+        self.respond = None
+        self.value = value
+    
+    def __call__(self, *args, **kwargs):
+        # Keyword options (e.g. api_budget) are accepted but only positional args are recorded
+        self.calls.append(args)
+        if self.respond is None:
+            if isinstance(self.value, BaseException):
+                raise self.value
+            return self.value
+        if callable(self.respond):
+            return self.respond(*args)
+        return next(self.respond)
+
+
+@pytest.fixture
+def recorder():
+    """Factory for Recorder stubs: recorder(value) returns a fresh call-recording stand-in."""
+    return Recorder
+
+
+_TRACKER = update_news.MetricsTracker()
+
+
+@pytest.fixture
+def tracker():
+    """Shared MetricsTracker, reset to empty for each test."""
+    _TRACKER.reset()
+    return _TRACKER
+
+
+@pytest.fixture
+def api_call_count():
+    """Fresh run-wide API call counter, as main() passes to fetch_from_newsapi."""
+    return {'total': 0}
+
+
+@pytest.fixture
+def seen_urls():
+    """Empty set of already-seen article URLs."""
+    return set()
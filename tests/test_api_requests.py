@@ -1,23 +1,22 @@
 """
 Unit tests for API request handling functions.
 """
-import os
-import sys
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+import requests
+from unittest.mock import Mock, patch
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import (
     build_api_params,
     make_api_request,
     fetch_articles_page,
     MetricsTracker,
+    TokenBucket,
     DEFAULT_TIMEOUT_SECONDS,
     DEFAULT_SORT_BY,
     DEFAULT_LANGUAGE,
     DEFAULT_MAX_PAGE_SIZE
 )
+import update_news
 
 
 class TestBuildApiParams:
@@ -63,7 +62,7 @@ class TestBuildApiParams:
 class TestMakeApiRequest:
     """Test API request making."""
     
-    @patch('update_news.requests.get')
+    @patch('update_news._SESSION.get')
     def test_make_api_request_success(self, mock_get):
         """Test successful API request."""
         mock_response = Mock()
@@ -84,10 +83,9 @@ class TestMakeApiRequest:
         assert is_result_limit_reached is False
         mock_get.assert_called_once()
     
-    @patch('update_news.requests.get')
+    @patch('update_news._SESSION.get')
     def test_make_api_request_http_error(self, mock_get):
         """Test API request with HTTP error (rate limit detected dynamically)."""
-        import requests
         mock_response = Mock()
         mock_response.status_code = 400  # Any error status code
         mock_response.json.return_value = {"code": "rateLimitExceeded", "message": "Rate limit exceeded"}
@@ -109,10 +107,78 @@ class TestMakeApiRequest:
         assert is_rate_limited is True  # Rate limit errors return is_rate_limited=True (detected dynamically)
         assert is_result_limit_reached is False
     
-    @patch('update_news.requests.get')
+    @pytest.mark.parametrize("json_body", [True, False], ids=["json_error", "text_error"])
+    @patch('update_news.time.sleep')
+    @patch('update_news._SESSION.get')
+    def test_make_api_request_retries_after_retry_after(self, mock_get, mock_sleep, json_body):
+        """Test a throttled request with a short Retry-After is retried once, whether or not the body is JSON."""
+        throttled = Mock()
+        throttled.status_code = 429
+        throttled.headers = {"Retry-After": "2"}
+        if json_body:
+            throttled.json.return_value = {"code": "rateLimited", "message": "Too many requests"}
+        else:
+            throttled.json.side_effect = ValueError("No JSON")
+            throttled.text = "<html>429 Too Many Requests: rate limit exceeded</html>"
+        http_error = requests.exceptions.HTTPError()
+        http_error.response = throttled
+        
+        ok_response = Mock()
+        ok_response.json.return_value = {"status": "ok", "articles": []}
+        mock_get.side_effect = [http_error, ok_response]
+        on_retry = Mock(return_value=True)
+        
+        response_data, response_time, success, is_rate_limited, is_result_limit_reached = make_api_request("https://api.example.com", {"q": "test"}, {}, on_retry=on_retry)
+        
+        assert success is True
+        assert is_rate_limited is False
+        assert mock_get.call_count == 2
+        on_retry.assert_called_once()
+        assert 2 <= mock_sleep.call_args[0][0] <= 3
+    
+    @pytest.mark.parametrize("on_retry", [None, Mock(return_value=False)], ids=["no_budget", "budget_spent"])
+    @patch('update_news.time.sleep')
+    @patch('update_news._SESSION.get')
+    def test_make_api_request_no_retry_without_budget(self, mock_get, mock_sleep, on_retry):
+        """Test a short Retry-After is not retried unless the caller grants a budgeted retry."""
+        throttled = Mock()
+        throttled.status_code = 429
+        throttled.headers = {"Retry-After": "2"}
+        throttled.json.return_value = {"code": "rateLimited", "message": "Too many requests"}
+        http_error = requests.exceptions.HTTPError()
+        http_error.response = throttled
+        mock_get.side_effect = http_error
+        
+        response_data, response_time, success, is_rate_limited, is_result_limit_reached = make_api_request("https://api.example.com", {"q": "test"}, {}, on_retry=on_retry)
+        
+        assert success is False
+        assert is_rate_limited is True
+        mock_get.assert_called_once()
+        mock_sleep.assert_not_called()
+    
+    @pytest.mark.parametrize("retry_after", ["3600", "not-a-date", None])
+    @patch('update_news.time.sleep')
+    @patch('update_news._SESSION.get')
+    def test_make_api_request_no_retry_without_short_retry_after(self, mock_get, mock_sleep, retry_after):
+        """Test quota exhaustion (long, invalid or missing Retry-After) is not retried."""
+        throttled = Mock()
+        throttled.status_code = 429
+        throttled.headers = {"Retry-After": retry_after} if retry_after else {}
+        throttled.json.return_value = {"code": "rateLimited", "message": "Too many requests"}
+        http_error = requests.exceptions.HTTPError()
+        http_error.response = throttled
+        mock_get.side_effect = http_error
+        
+        response_data, response_time, success, is_rate_limited, is_result_limit_reached = make_api_request("https://api.example.com", {"q": "test"}, {}, on_retry=lambda elapsed: True)
+        
+        assert success is False
+        assert is_rate_limited is True
+        mock_get.assert_called_once()
+        mock_sleep.assert_not_called()
+    
+    @patch('update_news._SESSION.get')
     def test_make_api_request_timeout(self, mock_get):
         """Test API request with timeout."""
-        import requests
         mock_get.side_effect = requests.exceptions.Timeout()
         
         url = "https://api.example.com"
@@ -126,7 +192,7 @@ class TestMakeApiRequest:
         assert is_rate_limited is False  # Timeout is not a rate limit
         assert is_result_limit_reached is False
     
-    @patch('update_news.requests.get')
+    @patch('update_news._SESSION.get')
     def test_make_api_request_with_custom_timeout(self, mock_get):
         """Test API request with custom timeout."""
         mock_response = Mock()
@@ -143,6 +209,55 @@ class TestMakeApiRequest:
         mock_get.assert_called_once()
         call_kwargs = mock_get.call_args[1]
         assert call_kwargs["timeout"] == 30
+    
+    @patch('update_news._SESSION.get')
+    def test_make_api_request_304_uses_cache(self, mock_get, tmp_path, monkeypatch):
+        """Test a cached ETag is sent back and a 304 reuses the cached body without parsing."""
+        monkeypatch.setattr(update_news, "_HTTP_CACHES", {})
+        monkeypatch.setattr(update_news, "_HTTP_CACHES_DIRTY", set())
+        cache_file = tmp_path / "http_cache.json"
+        config = {"api": {"http_cache_file": str(cache_file)}}
+        params = {"q": "test", "page": 1, "apiKey": "secret"}
+        
+        fresh = Mock(status_code=200, headers={"ETag": '"v1"'})
+        fresh.json.return_value = {"status": "ok", "articles": [{"url": "1"}]}
+        mock_get.return_value = fresh
+        first = make_api_request("https://api.example.com", params, config)
+        
+        assert "headers" not in mock_get.call_args[1]
+        update_news._flush_http_caches()
+        assert "secret" not in cache_file.read_text()
+        
+        # A new process starts from the file on disk
+        monkeypatch.setattr(update_news, "_HTTP_CACHES", {})
+        not_modified = Mock(status_code=304, headers={})
+        mock_get.return_value = not_modified
+        second = make_api_request("https://api.example.com", dict(params, apiKey="rotated"), config)
+        
+        assert mock_get.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+        not_modified.json.assert_not_called()
+        assert second[0] == first[0] == {"status": "ok", "articles": [{"url": "1"}]}
+        assert second[2] is True
+        
+        # The 304 body is a copy, so mutating it leaves the cached entry intact
+        second[0]["articles"].clear()
+        third = make_api_request("https://api.example.com", params, config)
+        assert third[0] == {"status": "ok", "articles": [{"url": "1"}]}
+    
+    @patch('update_news._SESSION.get')
+    def test_make_api_request_without_validators_is_not_cached(self, mock_get, tmp_path, monkeypatch):
+        """Test responses lacking ETag/Last-Modified are neither cached nor made conditional."""
+        monkeypatch.setattr(update_news, "_HTTP_CACHES", {})
+        config = {"api": {"http_cache_file": str(tmp_path / "http_cache.json")}}
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {"status": "ok"}
+        mock_get.return_value = response
+        
+        make_api_request("https://api.example.com", {"q": "test"}, config)
+        make_api_request("https://api.example.com", {"q": "test"}, config)
+        
+        assert "headers" not in mock_get.call_args[1]
+        assert not (tmp_path / "http_cache.json").exists()
 
 
 class TestFetchArticlesPage:
@@ -205,4 +320,82 @@ class TestFetchArticlesPage:
         assert is_rate_limited is False
         assert is_result_limit_reached is False
         mock_sleep.assert_not_called()  # No delay when set to 0
+    
+    @patch('update_news.make_api_request')
+    @patch('update_news.time.sleep')
+    def test_fetch_articles_page_waits_for_token_bucket(self, mock_sleep, mock_make_request, monkeypatch):
+        """Test requests beyond the burst wait on the shared token bucket, first page included."""
+        monkeypatch.setattr(update_news, "_TOKEN_BUCKETS", {})
+        monkeypatch.setattr(update_news.time, "monotonic", lambda: 100.0)
+        mock_make_request.return_value = ({"status": "ok"}, 100.0, True, False, False)
+        config = {"api": {"max_requests_per_second": 2, "request_burst": 2}}
+        
+        for page in (1, 1, 1):
+            fetch_articles_page("https://api.example.com", {"q": "test"}, page, config, MetricsTracker(), "machine-learning")
+        
+        # Two requests fit the burst; the third waits one refill interval
+        mock_sleep.assert_called_once_with(0.5)
+        assert mock_make_request.call_count == 3
 
+    
+    @patch('update_news.time.sleep')
+    @patch('update_news._SESSION.get')
+    def test_fetch_articles_page_retry_is_budgeted_and_recorded(self, mock_get, mock_sleep, tracker):
+        """Test a Retry-After retry reserves a call from the run budget and both attempts are recorded."""
+        throttled = Mock(status_code=429, headers={"Retry-After": "1"})
+        throttled.json.return_value = {"code": "rateLimited", "message": "Too many requests"}
+        http_error = requests.exceptions.HTTPError()
+        http_error.response = throttled
+        ok_response = Mock(status_code=200, headers={})
+        ok_response.json.return_value = {"status": "ok", "articles": []}
+        mock_get.side_effect = [http_error, ok_response]
+        api_call_count = {'total': 1}  # The page's own call, reserved by the caller
+        
+        response_data, success, is_rate_limited, is_result_limit_reached = fetch_articles_page(
+            "https://api.example.com", {"q": "test"}, 1, {}, tracker, "machine-learning", api_budget=(api_call_count, 5)
+        )
+        
+        assert success is True
+        assert api_call_count['total'] == 2
+        stats = tracker.topic_metrics["machine-learning"]
+        assert stats["api_calls"] == 2
+        assert stats["api_errors"] == 1
+    
+    @patch('update_news.time.sleep')
+    @patch('update_news._SESSION.get')
+    def test_fetch_articles_page_no_retry_when_budget_spent(self, mock_get, mock_sleep, tracker):
+        """Test a throttled page is not retried once the run budget has no calls left."""
+        throttled = Mock(status_code=429, headers={"Retry-After": "1"})
+        throttled.json.return_value = {"code": "rateLimited", "message": "Too many requests"}
+        http_error = requests.exceptions.HTTPError()
+        http_error.response = throttled
+        mock_get.side_effect = http_error
+        api_call_count = {'total': 5}
+        
+        response_data, success, is_rate_limited, is_result_limit_reached = fetch_articles_page(
+            "https://api.example.com", {"q": "test"}, 1, {}, tracker, "machine-learning", api_budget=(api_call_count, 5)
+        )
+        
+        assert is_rate_limited is True
+        mock_get.assert_called_once()
+        assert api_call_count['total'] == 5
+        assert tracker.topic_metrics["machine-learning"]["api_calls"] == 1
+
+
+class TestTokenBucket:
+    """Test the request rate limiter."""
+    
+    @patch('update_news.time.sleep')
+    def test_token_bucket_refills_over_time(self, mock_sleep, monkeypatch):
+        """Test waits grow while callers queue on an empty bucket and vanish once it refills."""
+        now = [0.0]
+        monkeypatch.setattr(update_news.time, "monotonic", lambda: now[0])
+        bucket = TokenBucket(rate=4, capacity=1)
+        
+        assert bucket.acquire() == 0.0
+        assert bucket.acquire() == 0.25
+        assert bucket.acquire() == 0.5
+        
+        now[0] = 10.0
+        assert bucket.acquire() == 0.0
+        assert mock_sleep.call_count == 2
@@ -1,24 +1,31 @@
 """
 Unit tests for article processing functions.
 """
-import os
-import sys
 import pytest
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import process_article, DEFAULT_MAX_DESCRIPTION_LENGTH
 
+# Longer than every max_description_length exercised below
+_LONG_DESCRIPTION = "A" * 500
+
+
+@pytest.fixture
+def base_article():
+    """Raw NewsAPI article matching the "deep learning" keyword; copy with {**base_article, ...} per case."""
+    return {
+        "url": "https://example.com/article1",
+        "title": "Deep Learning News",
+        "description": "Some description",
+        "publishedAt": "2025-01-15T10:00:00Z",
+        "source": {"name": "Tech News"}
+    }
+
 
 class TestProcessArticle:
     """Test article processing functionality."""
     
-    def test_process_article_valid(self):
+    def test_process_article_valid(self, tracker, seen_urls):
         """Test processing a valid article."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
-        
         article = {
             "url": "https://example.com/article1",
             "title": "Deep Learning Breakthrough",
@@ -40,10 +47,8 @@ class TestProcessArticle:
         assert result["source"] == "Tech News"
         assert "https://example.com/article1" in seen_urls
     
-    def test_process_article_duplicate_url(self):
+    def test_process_article_duplicate_url(self, tracker):
         """Test that duplicate URLs are filtered."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
         seen_urls = {"https://example.com/article1"}
         
         article = {
@@ -60,12 +65,8 @@ class TestProcessArticle:
         
         assert result is None
     
-    def test_process_article_no_url(self):
+    def test_process_article_no_url(self, tracker, seen_urls):
         """Test article without URL is filtered."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
-        
         article = {
             "title": "Deep Learning News",
             "description": "Some description"
@@ -79,12 +80,8 @@ class TestProcessArticle:
         
         assert result is None
     
-    def test_process_article_no_title(self):
+    def test_process_article_no_title(self, tracker, seen_urls):
         """Test article without title is filtered."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
-        
         article = {
             "url": "https://example.com/article1",
             "description": "Some description"
@@ -98,12 +95,8 @@ class TestProcessArticle:
         
         assert result is None
     
-    def test_process_article_keyword_mismatch(self):
+    def test_process_article_keyword_mismatch(self, tracker, seen_urls):
         """Test article that doesn't match keywords is filtered."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
-        
         article = {
             "url": "https://example.com/article1",
             "title": "Weather Forecast",
@@ -119,89 +112,36 @@ class TestProcessArticle:
         assert result is None
         assert tracker.topic_metrics[topic]["articles_filtered"] == 1
     
-    def test_process_article_description_truncated(self):
-        """Test that long descriptions are truncated."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
+    @pytest.mark.parametrize("max_len", [None, 50, 100, 400])
+    def test_process_article_description_truncated(self, tracker, seen_urls, base_article, max_len):
+        """Test that long descriptions are truncated to the configured (or default) length."""
+        article = {**base_article, "description": _LONG_DESCRIPTION}
+        config = {} if max_len is None else {"article_processing": {"max_description_length": max_len}}
         
-        long_description = "A" * 500
-        article = {
-            "url": "https://example.com/article1",
-            "title": "Deep Learning News",
-            "description": long_description,
-            "publishedAt": "2025-01-15T10:00:00Z",
-            "source": {"name": "Tech News"}
-        }
-        
-        keywords = ["deep learning"]
-        config = {}
-        topic = "deep-learning"
-        
-        result = process_article(article, keywords, seen_urls, config, tracker, topic)
+        result = process_article(article, ["deep learning"], seen_urls, config, tracker, "deep-learning")
         
         assert result is not None
-        assert len(result["description"]) <= DEFAULT_MAX_DESCRIPTION_LENGTH
+        assert len(result["description"]) == (max_len or DEFAULT_MAX_DESCRIPTION_LENGTH)
     
-    def test_process_article_no_description(self):
-        """Test article with no description uses default."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
+    @pytest.mark.parametrize("field,result_key,expected", [
+        ("description", "description", "No description available."),
+        ("source", "source", "Unknown"),
+    ])
+    def test_process_article_none_field_uses_default(self, tracker, seen_urls, base_article, field, result_key, expected):
+        """Test a None description or source falls back to its default text."""
+        article = {**base_article, field: None}
         
-        article = {
-            "url": "https://example.com/article1",
-            "title": "Deep Learning News",
-            "description": None,
-            "publishedAt": "2025-01-15T10:00:00Z",
-            "source": {"name": "Tech News"}
-        }
-        
-        keywords = ["deep learning"]
-        config = {}
-        topic = "deep-learning"
-        
-        result = process_article(article, keywords, seen_urls, config, tracker, topic)
+        result = process_article(article, ["deep learning"], seen_urls, {}, tracker, "deep-learning")
         
         assert result is not None
-        assert result["description"] == "No description available."
-
-    def test_process_article_handles_none_published_at(self):
+        assert result[result_key] == expected
+    
+    def test_process_article_handles_none_published_at(self, tracker, seen_urls, base_article):
         """Test article with publishedAt=None falls back to today's date safely."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
-
-        article = {
-            "url": "https://example.com/article-none-date",
-            "title": "Deep Learning News",
-            "description": "Some description",
-            "publishedAt": None,
-            "source": {"name": "Tech News"}
-        }
-
+        article = {**base_article, "publishedAt": None}
+        
         result = process_article(article, ["deep learning"], seen_urls, {}, tracker, "deep-learning")
-
+        
         assert result is not None
         assert result["date"]
         assert len(result["date"]) == 10
-
-    def test_process_article_handles_none_source(self):
-        """Test article with source=None falls back to default source safely."""
-        from update_news import MetricsTracker
-        tracker = MetricsTracker()
-        seen_urls = set()
-
-        article = {
-            "url": "https://example.com/article-none-source",
-            "title": "Deep Learning News",
-            "description": "Some description",
-            "publishedAt": "2026-03-29T12:00:00Z",
-            "source": None
-        }
-
-        result = process_article(article, ["deep learning"], seen_urls, {}, tracker, "deep-learning")
-
-        assert result is not None
-        assert result["source"] == "Unknown"
-
@@ -1,15 +1,11 @@
 """
 Unit tests for configuration loading functions.
 """
-import os
-import sys
 import pytest
 import yaml
-import tempfile
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from update_news import load_config, get_config_value, DEFAULT_LOOKBACK_DAYS
+from update_news import load_config, get_config_value
+import update_news
 
 
 class TestLoadConfig:
@@ -30,7 +26,6 @@ class TestLoadConfig:
             yaml.dump(test_config, f)
         
         # Temporarily change the config file path
-        import update_news
         original_path = update_news.CONFIG_FILE
         update_news.CONFIG_FILE = str(config_file)
         
@@ -42,7 +37,6 @@ class TestLoadConfig:
     
     def test_load_config_file_not_exists(self):
         """Test loading config when file doesn't exist."""
-        import update_news
         original_path = update_news.CONFIG_FILE
         update_news.CONFIG_FILE = "nonexistent_config.yml"
         
@@ -56,37 +50,12 @@ class TestLoadConfig:
 class TestGetConfigValue:
     """Test config value retrieval."""
     
-    def test_get_nested_value(self):
-        """Test getting nested config value."""
-        config = {
-            'api': {
-                'timeout_seconds': 30
-            }
-        }
-        value = get_config_value(config, 'api.timeout_seconds', 15)
-        assert value == 30
-    
-    def test_get_missing_value_returns_default(self):
-        """Test getting missing value returns default."""
-        config = {}
-        value = get_config_value(config, 'api.timeout_seconds', 15)
-        assert value == 15
-    
-    def test_get_partially_missing_path(self):
-        """Test getting value with partially missing path."""
-        config = {
-            'api': {}
-        }
-        value = get_config_value(config, 'api.timeout_seconds', 15)
-        assert value == 15
-    
-    def test_get_deeply_nested_value(self):
-        """Test getting deeply nested value."""
-        config = {
-            'date_range': {
-                'lookback_days': 45
-            }
-        }
-        value = get_config_value(config, 'date_range.lookback_days', DEFAULT_LOOKBACK_DAYS)
-        assert value == 45
-
+    @pytest.mark.parametrize("config,path,expected", [
+        ({'api': {'timeout_seconds': 30}}, 'api.timeout_seconds', 30),
+        ({}, 'api.timeout_seconds', 15),
+        ({'api': {}}, 'api.timeout_seconds', 15),
+        ({'date_range': {'lookback_days': 45}}, 'date_range.lookback_days', 45),
+    ], ids=["nested_value", "missing_value", "partially_missing_path", "deeply_nested_value"])
+    def test_get_config_value(self, config, path, expected):
+        """Test nested lookups return the stored value and missing paths return the default."""
+        assert get_config_value(config, path, 15) == expected
@@ -7,116 +7,147 @@ import sys
 import pytest
 import yaml
 import json
-import tempfile
-import subprocess
 import logging
-from unittest.mock import Mock, patch, MagicMock, mock_open
+import threading
+from unittest.mock import patch, MagicMock
 from io import StringIO
-from contextlib import contextmanager
+from types import SimpleNamespace
+import runpy
+from datetime import datetime, timedelta, timezone
+import requests
+
+# Repository paths, resolved once for the whole module
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SCRIPT_PATH = os.path.join(_REPO_ROOT, "update_news.py")
+_PACKAGE_INIT_PATH = os.path.join(_REPO_ROOT, "update_news", "__init__.py")
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import (
     load_config,
     get_config_value,
     MetricsTracker,
+    article_matches_exact_phrase,
+    process_article,
     make_api_request,
     update_news_file,
     process_topic,
     fetch_from_newsapi,
     fetch_combined_from_newsapi,
-    build_combined_api_params,
-    route_article_to_topic,
+    filter_articles_by_retention,
+    merge_news_articles,
+    merge_and_filter,
+    load_existing_news,
     main,
-    CONFIG_FILE
+    run_cli
 )
 import update_news
 
+# Shared read-only fixtures; copy with dict(...) before mutating
+_ARTICLE = {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
+_TOPIC = {"name": "Test Topic", "title_query": "Test"}
+
+# Raw NewsAPI article and fetch_articles_page results used by pagination tests
+_RAW_ARTICLE = {"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}
+_PAGE_OK = ({"status": "ok", "totalResults": 250, "articles": [_RAW_ARTICLE]}, True, False, False)
+_PAGE_ERR = ({"status": "error", "message": "Rate limit"}, True, False, False)
+_PAGE_EMPTY = ({"status": "ok", "totalResults": 50, "articles": []}, True, False, False)
+_DATE_RANGE = ("2025-01-01", "2025-01-15")
+
+# Log markers any one of which satisfies an assertion; checked with any(...) against one captured string
+_RATE_LIMIT_MARKERS = ("Rate Limit Detected", "Quota Exhausted", "Quota")
+_RATE_LIMIT_ERROR_MARKERS = ("Rate limit detected", "Rate limit error detected")
+_MERGED_MARKERS = ("Merged", "existing +")
+_COMBINED_SKIPPED_MARKERS = ("No API calls remaining", "API call limit reached", "Skipping combined request")
+
+
+@pytest.fixture
+def get_stub(monkeypatch):
+    """Swap update_news._SESSION.get for a stub whose side_effect tests can set."""
+    stub = MagicMock()
+    monkeypatch.setattr(update_news._SESSION, "get", stub)
+    return stub
+
+
+@pytest.fixture
+def combined_main(monkeypatch, combined_config, recorder):
+    """
+    Prepare main() for a two-topic combined-mode run with an API key set.
+    Returns a setter that swaps update_news attributes for Recorder stubs (undone by monkeypatch).
+    """
+    monkeypatch.setenv('NEWSAPI_KEY', 'test-key')
+    monkeypatch.setattr(update_news, "load_config", lambda: combined_config)
+    
+    def stub(**returns):
+        stubs = {name: recorder(ret) for name, ret in returns.items()}
+        for name, counter in stubs.items():
+            monkeypatch.setattr(update_news, name, counter)
+        return stubs
+    return stub
+
 
-@contextmanager
-def capture_logger_output():
-    """Context manager to capture logger output to a StringIO."""
-    import update_news
-    old_handlers = update_news.logger.handlers[:]
-    old_level = update_news.logger.level
-    output = StringIO()
-    handler = logging.StreamHandler(output)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
-    update_news.logger.handlers = [handler]
-    update_news.logger.setLevel(logging.DEBUG)
-    try:
-        yield output
-    finally:
-        update_news.logger.handlers = old_handlers
-        update_news.logger.setLevel(old_level)
+def _resp(status_code, text=None, json_data=None, json_exc=ValueError("No JSON")):
+    """Build a minimal HTTP response stand-in for HTTPError.response."""
+    response = SimpleNamespace(status_code=status_code)
+    if text is not None:
+        response.text = text
+    
+    def _json():
+        if json_data is not None:
+            return json_data
+        raise json_exc
+    
+    response.json = _json
+    return response
 
 
 class TestLoadConfigErrorHandling:
     """Test error handling in load_config."""
     
-    @patch('update_news.open', side_effect=IOError("Permission denied"))
-    def test_load_config_file_error(self, mock_open):
-        """Test load_config handles file read errors."""
-        import update_news
-        original_path = update_news.CONFIG_FILE
-        update_news.CONFIG_FILE = "test_config.yml"
-        
-        try:
-            result = load_config()
-            assert result == {}
-        finally:
-            update_news.CONFIG_FILE = original_path
-    
-    @patch('update_news.yaml.safe_load', side_effect=yaml.YAMLError("Invalid YAML"))
-    def test_load_config_yaml_error(self, mock_yaml):
-        """Test load_config handles YAML parsing errors."""
-        import update_news
-        original_path = update_news.CONFIG_FILE
-        
-        # Create a temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
-            f.write("invalid: yaml: content:")
-            temp_path = f.name
-        
-        update_news.CONFIG_FILE = temp_path
-        
-        try:
-            result = load_config()
-            assert result == {}
-        finally:
-            update_news.CONFIG_FILE = original_path
-            os.unlink(temp_path)
+    @pytest.mark.parametrize(
+        "target,error",
+        [
+            pytest.param('update_news.open', IOError("Permission denied"), id="file_error"),
+            pytest.param('update_news.yaml.load', yaml.YAMLError("Invalid YAML"), id="yaml_error"),
+        ],
+    )
+    def test_load_config_error(self, mocker, monkeypatch, tmp_path, target, error):
+        """Test load_config handles file read and YAML parsing errors."""
+        config_path = tmp_path / "config.yml"
+        config_path.write_text("invalid: yaml: content:")
+        monkeypatch.setattr(update_news, "CONFIG_FILE", str(config_path))
+        mocker.patch(target, side_effect=error)
+        
+        result = load_config()
+        assert result == {}
 
 
 class TestGetConfigValueEdgeCases:
     """Test edge cases in get_config_value."""
     
-    def test_get_config_value_non_dict_intermediate(self):
-        """Test get_config_value when intermediate value is not a dict."""
-        config = {
-            'api': 'not_a_dict'  # This should cause line 91 to execute
-        }
-        result = get_config_value(config, 'api.timeout_seconds', 15)
-        assert result == 15
+    @pytest.mark.parametrize("config,default,expected", [
+        ({"api": "not_a_dict"}, 15, 15),
+        ({"api": {"timeout_seconds": None}}, 15, 15),
+        ({"api": {"timeout_seconds": ""}}, 15, ""),
+        ({"api": {"timeout_seconds": 0}}, 1.0, 0),
+        ({"api": {"timeout_seconds": False}}, True, False),
+    ], ids=["non_dict_intermediate", "none", "empty_string", "zero", "false"])
+    def test_get_config_value_edge_values(self, config, default, expected):
+        """Test non-dict intermediates and None fall back to the default, other falsy values are kept."""
+        assert get_config_value(config, 'api.timeout_seconds', default) == expected
 
 
 class TestMetricsTrackerComplete:
     """Complete tests for MetricsTracker."""
     
-    def test_export_to_json_error(self, tmp_path):
+    def test_export_to_json_error(self):
         """Test export_to_json error handling."""
         tracker = MetricsTracker()
         
-        # Create a path that will cause an error (read-only directory or invalid path)
-        invalid_path = os.path.join(tmp_path, "nonexistent", "nested", "metrics.json")
-        
-        # Mock os.makedirs to raise an error
+        # Mock os.makedirs to raise an error; the path is never touched
         with patch('update_news.os.makedirs', side_effect=OSError("Permission denied")):
-            result = tracker.export_to_json(invalid_path)
+            result = tracker.export_to_json("/nonexistent/nested/metrics.json")
             assert result is False
     
-    def test_print_summary_with_data(self):
+    def test_print_summary_with_data(self, capture_logger_output):
         """Test print_summary with actual metrics data."""
         tracker = MetricsTracker()
         tracker.record_api_call("test-topic", 100.0, True)
@@ -133,7 +164,7 @@ class TestMetricsTrackerComplete:
             assert "test-topic" in output_str
             assert "API Calls: 2" in output_str
     
-    def test_print_summary_empty(self):
+    def test_print_summary_empty(self, capture_logger_output):
         """Test print_summary with no metrics."""
         tracker = MetricsTracker()
         
@@ -147,18 +178,11 @@ class TestMetricsTrackerComplete:
 class TestMakeApiRequestErrorHandling:
     """Test error handling in make_api_request."""
     
-    @patch('update_news.requests.get')
-    def test_make_api_request_http_error_no_json(self, mock_get):
+    def test_make_api_request_http_error_no_json(self, get_stub):
         """Test HTTP error when response has no JSON."""
-        import requests
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error" * 100  # Long text
-        mock_response.json.side_effect = ValueError("No JSON")
-        
         http_error = requests.exceptions.HTTPError()
-        http_error.response = mock_response
-        mock_get.side_effect = http_error
+        http_error.response = _resp(500, text="Internal Server Error" * 100)  # Long text
+        get_stub.side_effect = http_error
         
         url = "https://api.example.com"
         params = {"q": "test"}
@@ -171,18 +195,11 @@ class TestMakeApiRequestErrorHandling:
         assert is_rate_limited is False
         assert is_result_limit_reached is False
     
-    @patch('update_news.requests.get')
-    def test_make_api_request_http_error_no_text(self, mock_get):
+    def test_make_api_request_http_error_no_text(self, get_stub):
         """Test HTTP error when response has no text attribute."""
-        import requests
-        mock_response = Mock()
-        mock_response.status_code = 500
-        del mock_response.text  # Remove text attribute
-        mock_response.json.side_effect = ValueError("No JSON")
-        
         http_error = requests.exceptions.HTTPError()
-        http_error.response = mock_response
-        mock_get.side_effect = http_error
+        http_error.response = _resp(500)  # No text attribute
+        get_stub.side_effect = http_error
         
         url = "https://api.example.com"
         params = {"q": "test"}
@@ -198,77 +215,73 @@ class TestMakeApiRequestErrorHandling:
 class TestUpdateNewsFileErrorHandling:
     """Test error handling in update_news_file."""
     
-    def test_update_news_file_write_error(self, tmp_path):
+    def test_update_news_file_write_error(self, monkeypatch):
         """Test update_news_file handles write errors."""
-        import update_news
-        original_dir = update_news.DATA_DIR
-        test_dir = str(tmp_path / "_data" / "news")
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", "/mocked")
         
-        news_items = [{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
+        news_items = [_ARTICLE]
         
-        # Mock open to raise an error
-        with patch('builtins.open', side_effect=IOError("Disk full")):
+        # Mock makedirs and the temp file so nothing touches the filesystem
+        with patch('update_news.os.makedirs'), \
+             patch('update_news._create_temp_file', side_effect=IOError("Disk full")):
             result = update_news_file("test-topic", news_items)
             assert result is False
-        
-        update_news.DATA_DIR = original_dir
+
+
+class BadConfig:
+    """Topic config stub whose every lookup raises."""
+    def get(self, key, default=None):
+        raise Exception("Config access error")
 
 
 class TestProcessTopicComplete:
     """Complete tests for process_topic function."""
     
-    @patch('update_news.load_existing_news')
-    @patch('update_news.fetch_from_newsapi')
-    @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_with_api_key_and_articles(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
-        """Test process_topic with API key and articles found."""
-        mock_load.return_value = []
-        mock_fetch.return_value = ([
-            {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
-        ], False)
-        mock_merge.return_value = [{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
-        mock_filter.return_value = [{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
-        mock_update.return_value = True
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", config, metrics, api_call_count, rate_limited_flag)
-        
-        assert result is True
-        assert is_rate_limited is False
-        mock_fetch.assert_called_once()
-        mock_update.assert_called_once()
-    
-    @patch('update_news.load_existing_news')
-    @patch('update_news.fetch_from_newsapi')
-    @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_both_existing_and_new_articles(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
-        """Test process_topic with both existing and new articles to cover merge code (lines 784-785)."""
-        existing = [{"title": "Existing", "date": "2025-01-14", "url": "1", "description": "", "source": ""}]
-        new = [{"title": "New", "date": "2025-01-15", "url": "2", "description": "", "source": ""}]
-        merged = existing + new
-        mock_load.return_value = existing
-        mock_fetch.return_value = (new, False)
-        mock_merge.return_value = merged
-        mock_filter.return_value = merged  # Filter returns merged
-        mock_update.return_value = True
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
+    @pytest.mark.parametrize(
+        "existing,fetched,filtered,update_ret,fetch_exc,api_key,expected",
+        [
+            pytest.param(
+                [],
+                [_ARTICLE],
+                [_ARTICLE],
+                True, None, "api-key", True,
+                id="with_api_key_and_articles",
+            ),
+            pytest.param(
+                [{"title": "Existing", "date": "2025-01-14", "url": "1", "description": "", "source": ""}],
+                [{"title": "New", "date": "2025-01-15", "url": "2", "description": "", "source": ""}],
+                [{"title": "Existing", "date": "2025-01-14", "url": "1", "description": "", "source": ""},
+                 {"title": "New", "date": "2025-01-15", "url": "2", "description": "", "source": ""}],
+                True, None, "api-key", True,
+                id="both_existing_and_new_articles",
+            ),
+            pytest.param([], [], [], True, None, "api-key", True, id="with_api_key_no_articles"),
+            pytest.param([], [], [], True, Exception("API Error"), "api-key", False, id="fetch_error"),
+            pytest.param([], [], [], True, None, "", True, id="no_api_key"),
+            pytest.param(
+                [],
+                [_ARTICLE],
+                [_ARTICLE],
+                False, None, "api-key", False,
+                id="save_failure",
+            ),
+            pytest.param([], [], [], Exception("Save Error"), None, "", False, id="save_exception"),
+            pytest.param([], [], [], Exception("Unexpected error"), None, "", False, id="general_exception"),
+        ],
+    )
+    def test_process_topic(self, mocker, monkeypatch, recorder, existing, fetched, filtered, update_ret, fetch_exc, api_key, expected, capture_logger_output):
+        """Test process_topic across fetch/merge/save outcomes."""
+        mocker.patch('update_news.load_existing_news', return_value=existing)
+        fetch_stub = recorder(fetch_exc or (fetched, False))
+        monkeypatch.setattr(update_news, "fetch_from_newsapi", fetch_stub)
+        mocker.patch('update_news.filter_articles_by_retention', return_value=filtered)
+        mocker.patch('update_news.merge_and_filter', return_value=filtered)
+        if isinstance(update_ret, Exception):
+            mock_update = mocker.patch('update_news.update_news_file', side_effect=update_ret)
+        else:
+            mock_update = mocker.patch('update_news.update_news_file', return_value=update_ret)
+        
+        topic_config = dict(_TOPIC)
         config = {}
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
@@ -276,161 +289,21 @@ class TestProcessTopicComplete:
         
         # Capture logger output
         with capture_logger_output() as output:
-            result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", config, metrics, api_call_count, rate_limited_flag)
+            result, is_rate_limited = process_topic("test-topic", topic_config, api_key, config, metrics, api_call_count, rate_limited_flag)
             output_str = output.getvalue()
-            assert result is True
-            # Should hit the merge code at lines 784-785
-            assert "Merged" in output_str or "existing +" in output_str
-    
-    @patch('update_news.load_existing_news')
-    @patch('update_news.fetch_from_newsapi')
-    @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_with_api_key_no_articles(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
-        """Test process_topic with API key but no articles."""
-        mock_load.return_value = []
-        mock_fetch.return_value = ([], False)
-        mock_merge.return_value = []
-        mock_filter.return_value = []
-        mock_update.return_value = True
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", config, metrics, api_call_count, rate_limited_flag)
-        
-        assert result is True
-        assert is_rate_limited is False
-    
-    @patch('update_news.load_existing_news')
-    @patch('update_news.fetch_from_newsapi', side_effect=Exception("API Error"))
-    def test_process_topic_fetch_error(self, mock_fetch, mock_load):
-        """Test process_topic handles fetch errors."""
-        mock_load.return_value = []  # No cached articles
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", config, metrics, api_call_count, rate_limited_flag)
-        
-        assert result is False
-        assert is_rate_limited is False
-    
-    @patch('update_news.load_existing_news')
-    @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_no_api_key(self, mock_filter, mock_merge, mock_update, mock_load):
-        """Test process_topic without API key."""
-        mock_load.return_value = []
-        mock_merge.return_value = []
-        mock_filter.return_value = []
-        mock_update.return_value = True
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        result, is_rate_limited = process_topic("test-topic", topic_config, "", config, metrics, api_call_count, rate_limited_flag)
         
-        assert result is True
-        assert is_rate_limited is False
-        mock_update.assert_called_once_with("test-topic", [])
-    
-    @patch('update_news.load_existing_news')
-    @patch('update_news.fetch_from_newsapi')
-    @patch('update_news.update_news_file', return_value=False)
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_save_failure(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
-        """Test process_topic handles save failure."""
-        mock_load.return_value = []
-        mock_fetch.return_value = ([{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}], False)
-        mock_merge.return_value = [{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
-        mock_filter.return_value = [{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", config, metrics, api_call_count, rate_limited_flag)
-        
-        assert result is False
+        assert result is expected
         assert is_rate_limited is False
-    
-    @patch('update_news.load_existing_news')
-    @patch('update_news.update_news_file', side_effect=Exception("Save Error"))
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_save_exception(self, mock_filter, mock_merge, mock_update, mock_load):
-        """Test process_topic handles save exceptions."""
-        mock_load.return_value = []  # No cached articles, so should return False
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        result, is_rate_limited = process_topic("test-topic", topic_config, "", config, metrics, api_call_count, rate_limited_flag)
-        
-        assert result is False
-        assert is_rate_limited is False
-    
-    @patch('update_news.load_existing_news')
-    def test_process_topic_general_exception(self, mock_load):
-        """Test process_topic handles general exceptions."""
-        mock_load.return_value = []
-        
-        topic_config = {
-            "name": "Test Topic",
-            "title_query": "Test"
-        }
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        rate_limited_flag = {'value': False}
-        
-        # Cause an exception by passing invalid config
-        with patch('update_news.update_news_file', side_effect=Exception("Unexpected error")):
-            result, is_rate_limited = process_topic("test-topic", topic_config, "", config, metrics, api_call_count, rate_limited_flag)
-            assert result is False
-            assert is_rate_limited is False
+        assert len(fetch_stub.calls) == (1 if api_key else 0)
+        if existing and fetched:
+            # Both cached and fresh articles go through the merge branch
+            assert any(m in output_str for m in _MERGED_MARKERS)
+        if update_ret is True and fetch_exc is None:
+            mock_update.assert_called_once_with("test-topic", filtered, update_news.DEFAULT_MAX_SAVED_ARTICLES)
     
     def test_process_topic_outer_exception(self):
         """Test process_topic handles exceptions in outer try block (lines 578-582)."""
-        # Create a topic_config that raises an exception when .get() is called
-        # This will trigger the outer exception handler at line 578
-        class BadConfig:
-            def get(self, key, default=None):
-                raise Exception("Config access error")
-        
+        # A topic_config whose .get() raises triggers the outer exception handler at line 578
         bad_topic_config = BadConfig()
         config = {}
         metrics = MetricsTracker()
@@ -448,64 +321,37 @@ class TestFetchFromNewsapiPagination:
     
     @patch('update_news.fetch_articles_page')
     @patch('update_news.process_article')
-    def test_fetch_from_newsapi_pagination_status_error(self, mock_process, mock_fetch_page):
+    def test_fetch_from_newsapi_pagination_status_error(self, mock_process, mock_fetch_page, pagination_config):
         """Test pagination stops when status is not ok."""
-        # First page success
-        mock_fetch_page.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
-            # Second page has error status
-            ({
-                "status": "error",
-                "message": "Rate limit"
-            }, True, False, False)
-        ]
+        # First page success, second page has error status
+        mock_fetch_page.side_effect = iter((_PAGE_OK, _PAGE_ERR))
+        mock_process.return_value = _ARTICLE
         
-        mock_process.return_value = {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": ["machine learning"]
-                }
-            },
-            "api": {
-                "max_page_size": 100,
-                "max_pages": 5
-            }
-        }
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
         
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
+        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", pagination_config, metrics, api_call_count)
         
         # Should stop after second page returns error status
         assert mock_fetch_page.call_count == 2
         assert is_rate_limited is False
 
 
+_EXACT_PHRASE_CASES = (
+    ("Machine Learning Advances", "Machine Learning", True),
+    ("Deep Learning", "Machine Learning", False),
+    ("MACHINE LEARNING", "Machine Learning", True),
+    ("", "Machine Learning", False),
+)
+
+
 class TestArticleMatchingFunctions:
     """Test article matching functions for 100% coverage."""
     
-    def test_article_matches_exact_phrase(self):
+    @pytest.mark.parametrize("title,phrase,expected", _EXACT_PHRASE_CASES)
+    def test_article_matches_exact_phrase(self, title, phrase, expected):
         """Test article_matches_exact_phrase function (lines 265-269)."""
-        from update_news import article_matches_exact_phrase
-        
-        article = {"title": "Machine Learning Advances"}
-        assert article_matches_exact_phrase(article, "Machine Learning", {}) is True
-        
-        article = {"title": "Deep Learning"}
-        assert article_matches_exact_phrase(article, "Machine Learning", {}) is False
-        
-        article = {"title": "MACHINE LEARNING"}
-        assert article_matches_exact_phrase(article, "Machine Learning", {}) is True
-        
-        article = {"title": ""}
-        assert article_matches_exact_phrase(article, "Machine Learning", {}) is False
+        assert article_matches_exact_phrase({"title": title}, phrase, {}) is expected
 
 
 class TestProcessArticleEdgeCases:
@@ -514,8 +360,6 @@ class TestProcessArticleEdgeCases:
     @patch('update_news.article_matches_exact_phrase', return_value=False)
     def test_process_article_exact_phrase_no_match(self, mock_match):
         """Test process_article with use_exact_phrase=True when article doesn't match (lines 307-309)."""
-        from update_news import process_article
-        
         article = {
             "url": "https://example.com/1",
             "title": "Test Article",
@@ -531,8 +375,6 @@ class TestProcessArticleEdgeCases:
     @patch('update_news.article_matches_keywords', return_value=True)
     def test_process_article_legacy_string_keyword(self, mock_match):
         """Test process_article with use_exact_phrase=False and exact_phrase as string (line 315)."""
-        from update_news import process_article
-        
         article = {
             "url": "https://example.com/1",
             "title": "Machine Learning Article",
@@ -549,23 +391,75 @@ class TestProcessArticleEdgeCases:
         assert "machine learning" in call_args[1]
 
 
+class TestHttpCache:
+    """Test the conditional-request cache helpers around make_api_request."""
+    
+    def test_non_dict_cache_file_starts_empty(self, tmp_path, monkeypatch):
+        """Test a cache file holding valid JSON that is not an object is ignored."""
+        monkeypatch.setattr(update_news, "_HTTP_CACHES", {})
+        cache_file = tmp_path / "http_cache.json"
+        cache_file.write_text("[1, 2]")
+        assert update_news._get_http_cache(str(cache_file)) == {}
+    
+    def test_last_modified_sent_and_oldest_entry_trimmed(self, tmp_path, monkeypatch, get_stub):
+        """Test Last-Modified becomes If-Modified-Since and the cache keeps only the newest entries."""
+        monkeypatch.setattr(update_news, "_HTTP_CACHES", {})
+        monkeypatch.setattr(update_news, "_HTTP_CACHES_DIRTY", set())
+        monkeypatch.setattr(update_news, "HTTP_CACHE_MAX_ENTRIES", 1)
+        cache_file = str(tmp_path / "http_cache.json")
+        config = {"api": {"http_cache_file": cache_file}}
+        stamp = "Wed, 15 Jan 2025 10:00:00 GMT"
+        get_stub.return_value = SimpleNamespace(status_code=200, headers={"Last-Modified": stamp},
+                                                raise_for_status=lambda: None, json=lambda: {"status": "ok"})
+        
+        make_api_request("https://api.example.com", {"page": 1}, config)
+        make_api_request("https://api.example.com", {"page": 2}, config)
+        make_api_request("https://api.example.com", {"page": 2}, config)
+        
+        assert get_stub.call_args[1]["headers"] == {"If-Modified-Since": stamp}
+        assert not os.path.exists(cache_file)  # Nothing is written until the end-of-run flush
+        update_news._flush_http_caches()
+        with open(cache_file) as f:
+            assert list(json.load(f)) == [update_news._http_cache_key("https://api.example.com", {"page": 2})]
+        if os.name != "nt":
+            # Same mode as any other newly created file, not mkstemp's 0600
+            reference = tmp_path / "reference"
+            reference.touch()
+            assert os.stat(cache_file).st_mode & 0o777 == reference.stat().st_mode & 0o777
+    
+    def test_save_failure_is_logged(self, tmp_path, monkeypatch, caplog):
+        """Test a cache write error only logs a warning."""
+        monkeypatch.setattr(update_news, "_HTTP_CACHES", {})
+        monkeypatch.setattr(update_news, "_HTTP_CACHES_DIRTY", set())
+        def fail(*args, **kwargs):
+            raise OSError("read-only")
+        monkeypatch.setattr(update_news, "_create_temp_file", fail)
+        response = SimpleNamespace(headers={"ETag": '"v1"'})
+        cache_file = str(tmp_path / "http_cache.json")
+        
+        update_news._save_http_cache_entry(cache_file, "key", response, {"status": "ok"})
+        update_news._flush_http_caches()
+        
+        assert "Could not save HTTP cache" in caplog.text
+        assert update_news._HTTP_CACHES[cache_file]["key"]["etag"] == '"v1"'
+        # Still pending, so a later flush can retry
+        assert update_news._HTTP_CACHES_DIRTY == {cache_file}
+
+
 class TestMakeApiRequestRateLimitError:
     """Test make_api_request rate limit error handling for 100% coverage (dynamic detection)."""
     
-    @patch('update_news.requests.get')
-    def test_make_api_request_rate_limit_with_exception(self, mock_get):
+    def test_make_api_request_rate_limit_with_exception(self, get_stub):
         """Test make_api_request rate limit error with exception in error parsing (dynamic detection)."""
-        import requests
-        mock_response = Mock()
-        mock_response.status_code = 400  # Any error status code
         # json() raises ValueError/TypeError/AttributeError which is caught by except block
         # Then error text is checked for rate limit keywords
-        mock_response.json.side_effect = ValueError("Parse error")
-        mock_response.text = "Rate limit exceeded"  # Error text contains rate limit indicator
-        
         http_error = requests.exceptions.HTTPError()
-        http_error.response = mock_response
-        mock_get.side_effect = http_error
+        http_error.response = _resp(
+            400,  # Any error status code
+            text="Rate limit exceeded",  # Error text contains rate limit indicator
+            json_exc=ValueError("Parse error"),
+        )
+        get_stub.side_effect = http_error
         
         url = "https://api.example.com"
         params = {"q": "test"}
@@ -578,17 +472,11 @@ class TestMakeApiRequestRateLimitError:
         assert response_data is None
         assert is_result_limit_reached is False
     
-    @patch('update_news.requests.get')
-    def test_make_api_request_other_http_error_with_json(self, mock_get):
+    def test_make_api_request_other_http_error_with_json(self, get_stub):
         """Test make_api_request other HTTP error with JSON response (line 409)."""
-        import requests
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.json.return_value = {"error": "Internal server error"}
-        
         http_error = requests.exceptions.HTTPError()
-        http_error.response = mock_response
-        mock_get.side_effect = http_error
+        http_error.response = _resp(500, json_data={"error": "Internal server error"})
+        get_stub.side_effect = http_error
         
         url = "https://api.example.com"
         params = {"q": "test"}
@@ -604,327 +492,185 @@ class TestMakeApiRequestRateLimitError:
 class TestFetchFromNewsapiApiLimits:
     """Test fetch_from_newsapi API limit checks for 100% coverage."""
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_api_limit_before_request(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi API limit check before making request (lines 463-464)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
+    @pytest.fixture
+    def api_mocks(self, mocker):
+        """Patch the four fetch_from_newsapi collaborators once per test."""
+        mocker.patch('update_news.calculate_date_range', return_value=("2025-01-01", "2025-01-15"))
+        mocker.patch('update_news.build_api_params', return_value={"q": "test"})
+        return SimpleNamespace(
+            fetch=mocker.patch('update_news.fetch_articles_page'),
+            process=mocker.patch('update_news.process_article'),
+        )
+    
+    @pytest.mark.parametrize(
+        "api_call_total,pages,processed,api,expected_len,expected_rate_limited,expected_fetch_calls",
+        [
+            # API limit check before making request (lines 463-464)
+            pytest.param(5, [], [], {"max_api_calls": 5}, 0, False, 0,
+                         id="api_limit_before_request"),
+            # No remaining calls, so max_pages <= 0 (lines 497-498)
+            pytest.param(10, [], [], {"max_api_calls": 10}, 0, False, 0,
+                         id="max_pages_zero"),
+            # Rate limit on first page (lines 513-514)
+            pytest.param(0, [(None, False, True, False)], [], {}, 0, True, 1,
+                         id="rate_limit_first_page"),
+            # First page fetch fails (line 517)
+            pytest.param(0, [(None, False, False, False)], [], {}, 0, False, 1,
+                         id="first_page_failure"),
+            # After the first page the call count equals max_api_calls (lines 555-556)
+            pytest.param(0, [_PAGE_OK], [_ARTICLE],
+                         {"max_api_calls": 1, "max_page_size": 100, "max_pages": 5}, 1, False, 1,
+                         id="api_limit_during_pagination"),
+            # First page success, second page rate limited (lines 562-563)
+            pytest.param(0, [_PAGE_OK, (None, False, True, False)], [_ARTICLE],
+                         {"max_page_size": 100, "max_pages": 5}, 1, True, 2,
+                         id="rate_limit_during_pagination"),
+            # Second page brings enough articles (lines 585-586)
+            pytest.param(
+                0,
+                [_PAGE_OK, ({"status": "ok", "articles": [dict(_RAW_ARTICLE, url="2", publishedAt="2025-01-14T10:00:00Z")]}, True, False, False)],
+                [_ARTICLE, dict(_ARTICLE, url="2", date="2025-01-14")],
+                {"max_page_size": 100, "max_pages": 5, "min_articles_per_topic": 2}, 2, False, 2,
+                id="early_stop_enough_articles"),
+            # Second page is all duplicates (lines 592-593)
+            pytest.param(
+                0,
+                [_PAGE_OK, ({"status": "ok", "articles": [_RAW_ARTICLE, _RAW_ARTICLE]}, True, False, False)],
+                [None, None, None],
+                {"max_page_size": 100, "max_pages": 5, "early_stop_duplicate_threshold": 0.5}, 0, False, 2,
+                id="early_stop_duplicates"),
+        ],
+    )
+    def test_fetch_from_newsapi_api_limits(self, api_mocks, api_call_total, pages, processed, api,
+                                           expected_len, expected_rate_limited, expected_fetch_calls):
+        """Test fetch_from_newsapi API limit, rate limit and early stop paths."""
+        api_mocks.fetch.side_effect = iter(pages)
+        api_mocks.process.side_effect = iter(processed)
         
         config = {
             "news_sources": {
                 "test-topic": {"title_query": "Test"}
             },
-            "api": {"max_api_calls": 5}
+            "api": api
         }
         metrics = MetricsTracker()
-        api_call_count = {'total': 5}  # Already at limit
+        api_call_count = {'total': api_call_total}
         
         result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        assert result == []
-        assert is_rate_limited is False
-        assert mock_fetch.call_count == 0
+        assert len(result) == expected_len
+        assert is_rate_limited is expected_rate_limited
+        assert api_mocks.fetch.call_count == expected_fetch_calls
+
+
+class TestFilterArticlesByRetention:
+    """Test filter_articles_by_retention for 100% coverage."""
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_max_pages_zero(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi when max_pages <= 0 (lines 497-498)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_api_calls": 10}
-        }
-        metrics = MetricsTracker()
-        # Set api_call_count so that remaining_calls results in max_pages = 0
-        api_call_count = {'total': 10}  # No remaining calls, so max_pages will be 0
+    def test_filter_articles_by_retention_empty_list(self):
+        """Test filter_articles_by_retention with empty list (line 623)."""
         
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
+        result = filter_articles_by_retention([], 30)
         assert result == []
-        assert is_rate_limited is False
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_api_limit_in_try(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi API limit check inside try block (lines 505-506)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
+    def test_filter_articles_by_retention_zero_days(self):
+        """Test filter_articles_by_retention with zero retention days (line 623)."""
         
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_api_calls": 5}
-        }
-        metrics = MetricsTracker()
-        # Set to exactly the limit so the check in try block triggers
-        api_call_count = {'total': 5}  # Already at limit
+        articles = [{"date": "2025-01-15", "title": "Test"}]
+        result = filter_articles_by_retention(articles, 0)
+        assert result == articles
+    
+    def test_filter_articles_by_retention_no_date(self):
+        """Test filter_articles_by_retention with article missing date (line 631)."""
         
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        # Should return early due to limit check in try block
-        assert result == []
-        assert is_rate_limited is False
-        assert mock_fetch.call_count == 0  # Should not call fetch
+        articles = [{"title": "Test", "url": "1"}]  # No date
+        result = filter_articles_by_retention(articles, 30)
+        assert result == []  # Articles without date are skipped
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_rate_limit_first_page(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi rate limit on first page (lines 513-514)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        mock_fetch.return_value = (None, False, True, False)  # is_rate_limited = True
+    def test_filter_articles_by_retention_invalid_date(self):
+        """Test filter_articles_by_retention with invalid date format (line 639)."""
         
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
+        articles = [{"date": "invalid-date", "title": "Test", "url": "1"}]
+        result = filter_articles_by_retention(articles, 30)
+        # Invalid dates are kept (better to show than hide)
+        assert len(result) == 1
+    
+    def test_filter_articles_by_retention_cutoff_boundary(self):
+        """Test the cutoff day itself is kept and the day before it is removed."""
         
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        assert result == []
-        assert is_rate_limited is True
+        today = datetime.now(timezone.utc).date()
+        articles = [
+            {"date": (today - timedelta(days=30)).isoformat(), "title": "Cutoff", "url": "1"},
+            {"date": (today - timedelta(days=31)).isoformat(), "title": "Expired", "url": "2"},
+            {"date": "2025-1-5", "title": "Unpadded", "url": "3"}
+        ]
+        result = filter_articles_by_retention(articles, 30)
+        assert [a["title"] for a in result] == ["Cutoff", "Unpadded"]
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_first_page_failure(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi when first page fetch fails (line 517)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        mock_fetch.return_value = (None, False, False, False)  # success = False
+    def test_filter_articles_by_retention_old_articles(self):
+        """Test filter_articles_by_retention removing old articles (lines 643-647)."""
         
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
+        # Create articles with dates
+        today = datetime.now(timezone.utc).date()
+        old_date = (today - timedelta(days=40)).strftime("%Y-%m-%d")
+        recent_date = (today - timedelta(days=10)).strftime("%Y-%m-%d")
         
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        assert result == []
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_api_limit_during_pagination(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi API limit check during pagination (lines 555-556)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # First page success, then limit reached before second page
-        mock_fetch.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
+        articles = [
+            {"date": old_date, "title": "Old", "url": "1"},
+            {"date": recent_date, "title": "Recent", "url": "2"}
         ]
-        mock_process.return_value = {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
         
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_api_calls": 1, "max_page_size": 100, "max_pages": 5}
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        # After first page, api_call_count['total'] will be 1, which equals max_api_calls
-        # So the check at line 554 should trigger and break the loop
-        assert len(result) == 1
-        assert is_rate_limited is False
-        # Should only call fetch once (first page), not for second page due to limit
-        assert mock_fetch.call_count == 1
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_rate_limit_during_pagination(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi rate limit during pagination (lines 562-563)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # First page success, second page rate limited
-        mock_fetch.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
-            (None, False, True, False)  # Rate limited on second page
-        ]
-        mock_process.return_value = {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
-        
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_page_size": 100, "max_pages": 5}
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
+        result = filter_articles_by_retention(articles, 30)
+        # Old article should be removed
         assert len(result) == 1
-        assert is_rate_limited is True
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_early_stop_enough_articles(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi early stopping when enough articles found (lines 585-586)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # First page + second page with enough articles
-        mock_fetch.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
-            ({
-                "status": "ok",
-                "articles": [{"url": "2", "title": "Test", "description": "test", "publishedAt": "2025-01-14T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
-        ]
-        mock_process.side_effect = [
-            {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""},
-            {"title": "Test", "date": "2025-01-14", "url": "2", "description": "", "source": ""}
-        ]
-        
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_page_size": 100, "max_pages": 5, "min_articles_per_topic": 2}
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        assert len(result) >= 2
-        assert is_rate_limited is False
+        assert result[0]["title"] == "Recent"
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_early_stop_duplicates(self, mock_build, mock_date, mock_process, mock_fetch):
-        """Test fetch_from_newsapi early stopping when too many duplicates (lines 592-593)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # First page + second page with all duplicates
-        mock_fetch.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
-            ({
-                "status": "ok",
-                "articles": [
-                    {"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}},  # Duplicate
-                    {"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}   # Duplicate
-                ]
-            }, True, False, False),
-        ]
-        mock_process.return_value = None  # All duplicates, so process_article returns None
+    def test_filter_articles_by_retention_presorted_matches_scan(self):
+        """Test the presorted fast path keeps exactly what the full scan keeps."""
         
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {
-                "max_page_size": 100,
-                "max_pages": 5,
-                "early_stop_duplicate_threshold": 0.5  # 50% threshold
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
+        today = datetime.now(timezone.utc).date()
+        articles = [{"date": "Jan 5", "title": "Odd Date", "url": "0"}]
+        articles += [{"date": (today - timedelta(days=d)).isoformat(), "title": f"Day {d}", "url": str(d)} for d in range(0, 60, 3)]
+        articles += [{"date": "", "title": "Undated", "url": "x"}]
+        articles.insert(15, {"date": "2020-1-5", "title": "Unpadded", "url": "u"})
         
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-        # Should stop early due to duplicates
-        assert is_rate_limited is False
-
-
-class TestFilterArticlesByRetention:
-    """Test filter_articles_by_retention for 100% coverage."""
+        assert filter_articles_by_retention(articles, 30, presorted=True) == filter_articles_by_retention(articles, 30)
+        assert filter_articles_by_retention(articles[:5], 30, presorted=True) == articles[:5]
     
-    def test_filter_articles_by_retention_empty_list(self):
-        """Test filter_articles_by_retention with empty list (line 623)."""
-        from update_news import filter_articles_by_retention
+    def test_filter_articles_by_retention_presorted_binary_search(self):
+        """Test an ISO-dated newest-first list is cut at the binary-searched split."""
         
-        result = filter_articles_by_retention([], 30)
-        assert result == []
-    
-    def test_filter_articles_by_retention_zero_days(self):
-        """Test filter_articles_by_retention with zero retention days (line 623)."""
-        from update_news import filter_articles_by_retention
+        today = datetime.now(timezone.utc).date()
+        articles = [{"date": (today - timedelta(days=d)).isoformat(), "title": f"Day {d}", "url": str(d)} for d in range(0, 60, 3)]
         
-        articles = [{"date": "2025-01-15", "title": "Test"}]
-        result = filter_articles_by_retention(articles, 0)
-        assert result == articles
-    
-    def test_filter_articles_by_retention_no_date(self):
-        """Test filter_articles_by_retention with article missing date (line 631)."""
-        from update_news import filter_articles_by_retention
+        with patch('update_news._within_retention') as mock_within:
+            result = filter_articles_by_retention(articles, 30, presorted=True)
         
-        articles = [{"title": "Test", "url": "1"}]  # No date
-        result = filter_articles_by_retention(articles, 30)
-        assert result == []  # Articles without date are skipped
+        mock_within.assert_not_called()
+        assert result == [a for a in articles if a["date"] >= (today - timedelta(days=30)).isoformat()]
     
-    def test_filter_articles_by_retention_invalid_date(self):
-        """Test filter_articles_by_retention with invalid date format (line 639)."""
-        from update_news import filter_articles_by_retention
+    def test_filter_articles_by_retention_presorted_unquoted_yaml_date(self):
+        """Test a datetime.date loaded from an unquoted YAML date falls back to the scan instead of raising."""
         
-        articles = [{"date": "invalid-date", "title": "Test", "url": "1"}]
-        result = filter_articles_by_retention(articles, 30)
-        # Invalid dates are kept (better to show than hide)
-        assert len(result) == 1
+        today = datetime.now(timezone.utc).date()
+        articles = [
+            {"date": today.isoformat(), "title": "Today", "url": "1"},
+            {"date": today - timedelta(days=5), "title": "Unquoted", "url": "2"},
+            {"date": (today - timedelta(days=40)).isoformat(), "title": "Expired", "url": "3"}
+        ]
+        result = filter_articles_by_retention(articles, 30, presorted=True)
+        assert [a["title"] for a in result] == ["Today", "Unquoted"]
     
-    def test_filter_articles_by_retention_old_articles(self):
-        """Test filter_articles_by_retention removing old articles (lines 643-647)."""
-        from update_news import filter_articles_by_retention
-        from datetime import datetime, timedelta, timezone
+    def test_filter_articles_by_retention_presorted_unsorted_file(self):
+        """Test an out-of-order file still has every expired article removed."""
         
-        # Create articles with dates
         today = datetime.now(timezone.utc).date()
-        old_date = (today - timedelta(days=40)).strftime("%Y-%m-%d")
-        recent_date = (today - timedelta(days=10)).strftime("%Y-%m-%d")
-        
         articles = [
-            {"date": old_date, "title": "Old", "url": "1"},
-            {"date": recent_date, "title": "Recent", "url": "2"}
+            {"date": (today - timedelta(days=1)).isoformat(), "title": "Recent", "url": "1"},
+            {"date": (today - timedelta(days=40)).isoformat(), "title": "Expired", "url": "2"},
+            {"date": (today - timedelta(days=2)).isoformat(), "title": "Also Recent", "url": "3"},
+            {"date": (today - timedelta(days=50)).isoformat(), "title": "Also Expired", "url": "4"}
         ]
-        
-        result = filter_articles_by_retention(articles, 30)
-        # Old article should be removed
-        assert len(result) == 1
-        assert result[0]["title"] == "Recent"
+        result = filter_articles_by_retention(articles, 30, presorted=True)
+        assert [a["title"] for a in result] == ["Recent", "Also Recent"]
 
 
 class TestMergeNewsArticles:
@@ -932,7 +678,6 @@ class TestMergeNewsArticles:
     
     def test_merge_news_articles_basic(self):
         """Test merge_news_articles basic functionality (lines 655-673)."""
-        from update_news import merge_news_articles
         
         existing = [
             {"url": "1", "title": "Article 1", "date": "2025-01-15"},
@@ -951,7 +696,6 @@ class TestMergeNewsArticles:
     
     def test_merge_news_articles_empty_urls(self):
         """Test merge_news_articles with articles missing URLs."""
-        from update_news import merge_news_articles
         
         existing = [{"title": "Article 1", "date": "2025-01-15"}]  # No URL
         new = [{"url": "1", "title": "Article 2", "date": "2025-01-14"}]
@@ -960,71 +704,108 @@ class TestMergeNewsArticles:
         # Article without URL should not be included
         assert len(result) == 1
         assert result[0]["url"] == "1"
+    
+    def test_merge_news_articles_keeps_newer_existing(self):
+        """Test merge_news_articles keeps the cached article when the new copy is older."""
+        
+        existing = [{"url": "1", "title": "Cached", "date": "2025-01-15"}]
+        new = [{"url": "1", "title": "Stale", "date": "2025-01-10"}]
+        
+        result = merge_news_articles(existing, new)
+        assert [a["title"] for a in result] == ["Cached"]
+    
+    @pytest.mark.parametrize("retention_days", [0, 30])
+    def test_merge_and_filter_matches_separate_passes(self, retention_days):
+        """Test merge_and_filter gives the same result as merging then filtering."""
+        
+        today = datetime.now(timezone.utc).date()
+        recent = (today - timedelta(days=5)).isoformat()
+        newer = (today - timedelta(days=2)).isoformat()
+        old = (today - timedelta(days=40)).isoformat()
+        existing = [
+            {"url": "1", "title": "Recent", "date": recent},
+            {"url": "2", "title": "Expired", "date": old},
+            {"url": "3", "title": "Refreshed", "date": old},
+            {"url": "4", "title": "Undated"},
+            {"title": "No URL", "date": recent}
+        ]
+        new = [
+            {"url": "1", "title": "Recent Stale Copy", "date": old},
+            {"url": "3", "title": "Refreshed Again", "date": newer},
+            {"url": "5", "title": "Odd Date", "date": "Jan 5"},
+            {"url": "6", "title": "Expired New", "date": old}
+        ]
+        
+        expected = filter_articles_by_retention(merge_news_articles(existing, new), retention_days)
+        assert merge_and_filter(existing, new, retention_days) == expected
 
 
 class TestLoadExistingNews:
     """Test load_existing_news for 100% coverage."""
     
-    def test_load_existing_news_file_not_exists(self, tmp_path):
+    def test_load_existing_news_file_not_exists(self, tmp_path, monkeypatch):
         """Test load_existing_news when file doesn't exist (line 718)."""
-        from update_news import load_existing_news
-        import update_news
         
-        original_dir = update_news.DATA_DIR
-        test_dir = str(tmp_path / "_data" / "news")
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path / "_data" / "news"))
         
-        try:
-            result = load_existing_news("nonexistent-topic")
-            assert result == []
-        finally:
-            update_news.DATA_DIR = original_dir
+        result = load_existing_news("nonexistent-topic")
+        assert result == []
     
-    def test_load_existing_news_success(self, tmp_path):
+    def test_load_existing_news_success(self, tmp_path, monkeypatch, capture_logger_output):
         """Test load_existing_news successful load (line 725)."""
-        from update_news import load_existing_news
-        import update_news
         
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "_data" / "news")
         os.makedirs(test_dir, exist_ok=True)
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
         
         # Create a test file
         test_file = os.path.join(test_dir, "test-topic.yml")
         with open(test_file, 'w') as f:
             yaml.dump({"news_items": [{"title": "Test", "date": "2025-01-15", "url": "1"}]}, f)
         
-        try:
-            # Capture logger output
-            with capture_logger_output() as output:
-                result = load_existing_news("test-topic")
-                output_str = output.getvalue()
-                assert len(result) == 1
-                assert "Loaded 1 cached article" in output_str
-        finally:
-            update_news.DATA_DIR = original_dir
+        # Capture logger output
+        with capture_logger_output() as output:
+            result = load_existing_news("test-topic")
+            output_str = output.getvalue()
+            assert len(result) == 1
+            assert "Loaded 1 cached article" in output_str
     
-    def test_load_existing_news_exception(self, tmp_path):
+    def test_load_existing_news_exception(self, tmp_path, monkeypatch):
         """Test load_existing_news exception handling (lines 727-729)."""
-        from update_news import load_existing_news
-        import update_news
         
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "_data" / "news")
         os.makedirs(test_dir, exist_ok=True)
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
         
         # Create a file that will cause an error
         test_file = os.path.join(test_dir, "test-topic.yml")
         with open(test_file, 'w') as f:
             f.write("invalid: yaml: content: [")
         
-        try:
-            result = load_existing_news("test-topic")
-            assert result == []
-        finally:
-            update_news.DATA_DIR = original_dir
+        result = load_existing_news("test-topic")
+        assert result == []
+    
+    def test_load_existing_news_cached_until_file_changes(self, tmp_path, monkeypatch):
+        """Test load_existing_news parses an unchanged file once and returns independent copies."""
+        
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        test_file = tmp_path / "test-topic.yml"
+        test_file.write_text(yaml.dump({"news_items": [{"title": "Test", "date": "2025-01-15", "url": "1"}]}))
+        
+        yaml_load = MagicMock(wraps=yaml.load)
+        monkeypatch.setattr(update_news.yaml, "load", yaml_load)
+        
+        first = load_existing_news("test-topic")
+        first[0]["title"] = "Mutated"
+        second = load_existing_news("test-topic")
+        assert second[0]["title"] == "Test"
+        assert yaml_load.call_count == 1
+        
+        # A rewrite changes mtime/size and invalidates the entry
+        test_file.write_text(yaml.dump({"news_items": [{"title": "New", "date": "2025-01-16", "url": "2"}]}))
+        os.utime(test_file, ns=(0, os.stat(test_file).st_mtime_ns + 1))
+        assert load_existing_news("test-topic")[0]["title"] == "New"
+        assert yaml_load.call_count == 2
 
 
 class TestProcessTopicEdgeCases:
@@ -1033,13 +814,11 @@ class TestProcessTopicEdgeCases:
     @patch('update_news.load_existing_news')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
     @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_with_existing_articles(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
+    def test_process_topic_with_existing_articles(self, mock_filter, mock_update, mock_fetch, mock_load, capture_logger_output):
         """Test process_topic with existing articles loaded (line 748)."""
         mock_load.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_fetch.return_value = ([], False)
-        mock_merge.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_filter.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_update.return_value = True
         
@@ -1055,17 +834,16 @@ class TestProcessTopicEdgeCases:
             output_str = output.getvalue()
             assert result is True
             assert "Loaded 1 cached article" in output_str
+        mock_update.assert_called_once_with("test-topic", mock_filter.return_value, update_news.DEFAULT_MAX_SAVED_ARTICLES)
     
     @patch('update_news.load_existing_news')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
     @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_rate_limited(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
+    def test_process_topic_rate_limited(self, mock_filter, mock_update, mock_fetch, mock_load, capture_logger_output):
         """Test process_topic when rate limited (lines 759-763)."""
         mock_load.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_fetch.return_value = ([], True)  # is_rate_limited = True
-        mock_merge.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_filter.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_update.return_value = True
         
@@ -1082,17 +860,16 @@ class TestProcessTopicEdgeCases:
             assert result is True
             assert is_rate_limited is True
             assert rate_limited_flag['value'] is True
-            assert "Rate limit detected" in output_str or "Rate limit error detected" in output_str
+            assert any(m in output_str for m in _RATE_LIMIT_ERROR_MARKERS)
+        mock_update.assert_called_once_with("test-topic", mock_filter.return_value, update_news.DEFAULT_MAX_SAVED_ARTICLES)
     
     @patch('update_news.load_existing_news')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
     @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_rate_limited_already_set(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
+    def test_process_topic_rate_limited_already_set(self, mock_filter, mock_update, mock_fetch, mock_load, capture_logger_output):
         """Test process_topic when rate_limited is already True (line 776)."""
         mock_load.return_value = []
-        mock_merge.return_value = []
         mock_filter.return_value = []
         mock_update.return_value = True
         
@@ -1108,46 +885,55 @@ class TestProcessTopicEdgeCases:
             output_str = output.getvalue()
             assert result is True
             assert "Skipping API call (rate limit detected)" in output_str
-    
+        # Nothing cached or fetched: an empty file is written without running the retention filter
+        mock_filter.assert_not_called()
+        mock_update.assert_called_once_with("test-topic", [], update_news.DEFAULT_MAX_SAVED_ARTICLES)
+    
+    @pytest.mark.parametrize(
+        "fetch_result,expected_message",
+        [
+            pytest.param(([], False), update_news.MSG_INFO_NO_NEW_USING_CACHED, id="nothing_new"),
+            pytest.param(([], True), update_news.MSG_INFO_API_FAILED_CACHED, id="rate_limited"),
+            pytest.param(Exception("API Error"), update_news.MSG_INFO_API_FAILED_CACHED, id="fetch_error"),
+        ],
+    )
     @patch('update_news.load_existing_news')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.update_news_file')
     @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_api_failed_with_cached(self, mock_filter, mock_update, mock_fetch, mock_load):
-        """Test process_topic when API fails but has cached articles (lines 787-789)."""
+    def test_process_topic_cached_only(self, mock_filter, mock_update, mock_fetch, mock_load, fetch_result, expected_message, capture_logger_output):
+        """Test the cached-only message says the API failed only when the request did."""
         cached_article = {"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
         mock_load.return_value = [cached_article]
-        mock_fetch.return_value = ([], False)  # API failed, no new articles
-        # With the fixed logic: if existing_articles and new_articles -> merge
-        # elif existing_articles -> use existing (this is now reachable!)
-        # So we need: existing_articles = [article], new_articles = []
+        if isinstance(fetch_result, Exception):
+            mock_fetch.side_effect = fetch_result
+        else:
+            mock_fetch.return_value = fetch_result
         mock_filter.return_value = [cached_article]
         mock_update.return_value = True
         
         topic_config = {"name": "Test", "title_query": "Test"}
-        config = {}
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
         rate_limited_flag = {'value': False}
         
-        # Capture logger output
         with capture_logger_output() as output:
-            result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", config, metrics, api_call_count, rate_limited_flag)
+            result, is_rate_limited = process_topic("test-topic", topic_config, "api-key", {}, metrics, api_call_count, rate_limited_flag)
             output_str = output.getvalue()
-            assert result is True
-            # The elif branch (lines 787-789) should now be hit
-            assert "API failed, using" in output_str or "cached article" in output_str
+        
+        assert result is True
+        assert expected_message.format(count=1) in output_str
+        other = ({update_news.MSG_INFO_NO_NEW_USING_CACHED, update_news.MSG_INFO_API_FAILED_CACHED} - {expected_message}).pop()
+        assert other.format(count=1) not in output_str
     
     @patch('update_news.load_existing_news')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.update_news_file')
-    @patch('update_news.merge_news_articles')
     @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_preserve_cached_on_save_failure(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
+    def test_process_topic_preserve_cached_on_save_failure(self, mock_filter, mock_update, mock_fetch, mock_load, capture_logger_output):
         """Test process_topic preserving cached articles when save fails (lines 817-818)."""
         mock_load.return_value = [{"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         mock_fetch.return_value = ([], False)  # API failed
-        mock_merge.return_value = []
         mock_filter.return_value = []
         mock_update.return_value = False  # Save failed
         
@@ -1163,18 +949,18 @@ class TestProcessTopicEdgeCases:
             output_str = output.getvalue()
             # Should preserve cached articles
             assert "Preserving 1 cached article" in output_str
+        # Everything cached expired, so the file is left alone rather than emptied
+        mock_update.assert_not_called()
     
     @patch('update_news.load_existing_news')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.update_news_file', side_effect=Exception("Save error"))
-    @patch('update_news.merge_news_articles')
     @patch('update_news.filter_articles_by_retention')
-    def test_process_topic_save_exception_with_cached(self, mock_filter, mock_merge, mock_update, mock_fetch, mock_load):
+    def test_process_topic_save_exception_with_cached(self, mock_filter, mock_update, mock_fetch, mock_load, capture_logger_output):
         """Test process_topic save exception with cached articles (lines 823-824)."""
         cached_article = {"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
         mock_load.return_value = [cached_article]
         mock_fetch.return_value = ([], False)
-        mock_merge.return_value = [cached_article]  # Merge returns articles
         mock_filter.return_value = [cached_article]  # Filter returns articles
         # update_news_file will raise exception
         
@@ -1190,6 +976,7 @@ class TestProcessTopicEdgeCases:
             output_str = output.getvalue()
             assert result is True  # Should return True because cached articles available
             assert "Cached articles are still available despite save error" in output_str
+        mock_update.assert_called_once_with("test-topic", [cached_article], update_news.DEFAULT_MAX_SAVED_ARTICLES)
 
 
 class TestMainFunction:
@@ -1198,7 +985,7 @@ class TestMainFunction:
     @patch('update_news.process_topic')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {}, clear=True)
-    def test_main_no_api_key(self, mock_load_config, mock_process_topic):
+    def test_main_no_api_key(self, mock_load_config, mock_process_topic, capture_logger_output):
         """Test main function without API key."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1219,7 +1006,7 @@ class TestMainFunction:
     @patch('update_news.process_topic')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_with_api_key(self, mock_load_config, mock_process_topic, tmp_path):
+    def test_main_with_api_key(self, mock_load_config, mock_process_topic, tmp_path, capture_logger_output):
         """Test main function with API key."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1242,7 +1029,7 @@ class TestMainFunction:
             assert "INFO" in output_str
     
     @patch('update_news.load_config')
-    def test_main_no_news_sources(self, mock_load_config):
+    def test_main_no_news_sources(self, mock_load_config, capture_logger_output):
         """Test main function with no news sources configured."""
         mock_load_config.return_value = {}
         
@@ -1255,7 +1042,7 @@ class TestMainFunction:
     @patch('update_news.process_topic')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_with_errors(self, mock_load_config, mock_process_topic):
+    def test_main_with_errors(self, mock_load_config, mock_process_topic, capture_logger_output):
         """Test main function with some topic processing errors."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1286,8 +1073,6 @@ class TestMainFunction:
             }
         }
         
-        from io import StringIO
-        import sys
         old_stdout = sys.stdout
         sys.stdout = StringIO()
         
@@ -1300,7 +1085,7 @@ class TestMainFunction:
     @patch('update_news.process_topic')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_rate_limit_detected(self, mock_load_config, mock_process_topic):
+    def test_main_rate_limit_detected(self, mock_load_config, mock_process_topic, capture_logger_output):
         """Test main function when rate limit is detected (lines 905-918)."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1326,7 +1111,7 @@ class TestMainFunction:
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_api_call_limit_reached(self, mock_load_config, mock_fetch):
+    def test_main_api_call_limit_reached(self, mock_load_config, mock_fetch, capture_logger_output):
         """Test main function when API call limit is reached (lines 922-926)."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1336,11 +1121,12 @@ class TestMainFunction:
             },
             "api": {
                 "max_api_calls": 2,
-                "combine_topics_in_single_request": False  # Disable combined mode to test individual processing
+                "combine_topics_in_single_request": False,  # Disable combined mode to test individual processing
+                "combine_topics_when_quota_tight": False
             }
         }
         # Mock fetch_from_newsapi to increment api_call_count
-        def fetch_side_effect(topic, api_key, config, metrics, api_call_count):
+        def fetch_side_effect(topic, api_key, config, metrics, api_call_count, known_urls=None):
             api_call_count['total'] += 1  # Simulate API call
             return ([], False)
         
@@ -1353,10 +1139,110 @@ class TestMainFunction:
             assert "Reached maximum API call limit" in output_str
             assert "topic(s) were skipped" in output_str
     
+    @patch('update_news.time.sleep')
     @patch('update_news.fetch_from_newsapi')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_success_with_api_calls(self, mock_load_config, mock_fetch):
+    def test_main_processes_topics_concurrently(self, mock_load_config, mock_fetch, mock_sleep, caplog):
+        """Test api.topic_concurrency runs topics in parallel without the between-topic delay."""
+        mock_load_config.return_value = {
+            "news_sources": {
+                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
+                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
+            },
+            "api": {
+                "max_api_calls": 10,
+                "combine_topics_in_single_request": False,
+                "topic_concurrency": 2
+            },
+            "metrics": {"export_to_json": False}
+        }
+        # Both topics must be in flight at once to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def fetch_side_effect(topic, api_key, config, metrics, api_call_count, known_urls=None):
+            barrier.wait()
+            update_news._reserve_api_calls(api_call_count, 10)
+            return ([], topic == "topic2")
+        
+        mock_fetch.side_effect = fetch_side_effect
+        
+        assert main() == 0
+        
+        assert mock_fetch.call_count == 2
+        mock_sleep.assert_not_called()
+        assert "Processing up to 2 topics in parallel" in caplog.text
+        assert update_news.MSG_INFO_TOTAL_CALLS.format(made=2, limit=10) in caplog.text
+        assert update_news.MSG_INFO_UPDATE_CACHED in caplog.text
+        assert caplog.text.count(update_news.MSG_WARNING_RATE_LIMIT_QUOTA_EXHAUSTED) == 1
+    
+    @patch('update_news.fetch_from_newsapi')
+    @patch('update_news.load_config')
+    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
+    def test_main_concurrent_topics_stop_when_budget_spent(self, mock_load_config, mock_fetch, caplog, tmp_path, monkeypatch):
+        """Test concurrent topics stop starting once max_api_calls is spent, like the sequential loop."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        mock_load_config.return_value = {
+            "news_sources": {f"topic{i}": {"name": f"Topic {i}", "title_query": f"Topic {i}"} for i in range(1, 5)},
+            "api": {
+                "max_api_calls": 2,
+                "combine_topics_in_single_request": False,
+                "combine_topics_when_quota_tight": False,
+                "topic_concurrency": 2
+            },
+            "metrics": {"export_to_json": False}
+        }
+        # Both in-flight topics reserve their call before either finishes, so no third topic can start
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def fetch_side_effect(topic, api_key, config, metrics, api_call_count, known_urls=None):
+            update_news._reserve_api_calls(api_call_count, 2)
+            barrier.wait()
+            metrics.record_api_call(topic, 10.0)
+            return ([], False)
+        
+        mock_fetch.side_effect = fetch_side_effect
+        
+        with patch('update_news.MetricsTracker.export_to_json'):
+            main()
+        
+        assert sorted(call.args[0] for call in mock_fetch.call_args_list) == ["topic1", "topic2"]
+        assert update_news.MSG_WARNING_REACHED_LIMIT.format(limit=2) in caplog.text
+        assert update_news.MSG_INFO_SKIPPED_TOPICS.format(count=2) in caplog.text
+        assert sorted(os.listdir(tmp_path)) == ["topic1.yml", "topic2.yml"]
+    
+    @patch('update_news.fetch_combined_from_newsapi')
+    @patch('update_news.fetch_from_newsapi')
+    @patch('update_news.load_config')
+    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
+    def test_main_switches_to_combined_when_quota_tight(self, mock_load_config, mock_fetch, mock_fetch_combined, tmp_path, monkeypatch, capture_logger_output):
+        """Test main uses one combined request when max_api_calls cannot cover every topic."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        mock_load_config.return_value = {
+            "news_sources": {
+                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
+                "topic2": {"name": "Topic 2", "title_query": "Topic 2"},
+                "topic3": {"name": "Topic 3", "title_query": "Topic 3"}
+            },
+            "api": {
+                "max_api_calls": 2,
+                "combine_topics_in_single_request": False
+            }
+        }
+        mock_fetch_combined.return_value = ({"topic1": [], "topic2": [], "topic3": []}, False)
+        
+        with capture_logger_output() as output:
+            main()
+            output_str = output.getvalue()
+        
+        assert "using combined request mode" in output_str
+        mock_fetch_combined.assert_called_once()
+        mock_fetch.assert_not_called()
+    
+    @patch('update_news.fetch_from_newsapi')
+    @patch('update_news.load_config')
+    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
+    def test_main_success_with_api_calls(self, mock_load_config, mock_fetch, capture_logger_output):
         """Test main function success message with API calls (lines 933-934)."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1365,7 +1251,7 @@ class TestMainFunction:
             "api": {"max_api_calls": 100}
         }
         # Mock fetch_from_newsapi to increment api_call_count and return articles
-        def fetch_side_effect(topic, api_key, config, metrics, api_call_count):
+        def fetch_side_effect(topic, api_key, config, metrics, api_call_count, known_urls=None):
             api_call_count['total'] += 1  # Simulate API call
             return ([{"title": "Test", "date": "2025-01-15", "url": "1"}], False)
         
@@ -1381,7 +1267,7 @@ class TestMainFunction:
     @patch('update_news.process_topic')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_rate_limited_complete(self, mock_load_config, mock_process_topic):
+    def test_main_rate_limited_complete(self, mock_load_config, mock_process_topic, capture_logger_output):
         """Test main function completion message when rate limited (lines 936-939)."""
         mock_load_config.return_value = {
             "news_sources": {
@@ -1396,156 +1282,67 @@ class TestMainFunction:
             main()
             output_str = output.getvalue()
             assert "[INFO] News update complete (using cached articles)" in output_str
-            assert "Rate limit detected" in output_str or "Rate limit error detected" in output_str
+            assert any(m in output_str for m in _RATE_LIMIT_ERROR_MARKERS)
             assert "Cached articles are still available" in output_str
             assert "Next run will fetch new articles" in output_str
 
 
 class TestMainBlockExecution:
-    """Test the __main__ block execution by directly executing the code paths."""
-    
-    def test_main_block_code_coverage(self):
-        """Test __main__ block code paths to achieve 100% coverage (lines 642-653)."""
-        # To achieve 100% coverage of the __main__ block, we need to execute the actual code
-        # from update_news.py when __name__ == "__main__". Since we can't easily do that in tests,
-        # we'll directly execute the equivalent code paths here.
-        
-        import update_news
-        import sys
-        import traceback
-        from io import StringIO
-        
-        # Test path 1: Successful execution (lines 642-645)
-        # This path is: try: main(); sys.exit(0)
-        with patch('update_news.main', return_value=None):
-            with patch('sys.exit') as mock_exit:
-                try:
-                    # Execute the code from lines 642-645
-                    update_news.main()
-                    sys.exit(0)
-                except SystemExit:
-                    pass
-                # This covers lines 642-645
-        
-        # Test path 2: KeyboardInterrupt (lines 646-648)  
-        # This path is: except KeyboardInterrupt: print(...); sys.exit(1)
-        with patch('update_news.main', side_effect=KeyboardInterrupt()):
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
-                # Execute the code from lines 641-648
-                try:
-                    update_news.main()
-                    sys.exit(0)
-                except KeyboardInterrupt:
-                    print("\n[INFO] Interrupted by user")
-                    try:
-                        sys.exit(1)
-                    except SystemExit:
-                        pass
-            except SystemExit:
-                pass
-            finally:
-                output = sys.stdout.getvalue()
-                sys.stdout = old_stdout
-            assert "Interrupted by user" in output
-            # This covers lines 646-648
-        
-        # Test path 3: General Exception (lines 649-653)
-        # This path is: except Exception as e: print(...); traceback.format_exc(); sys.exit(1)
-        with patch('update_news.main', side_effect=Exception("Unexpected error")):
-            old_stdout = sys.stdout
-            sys.stdout = StringIO()
-            try:
-                # Execute the code from lines 641-653
-                try:
-                    update_news.main()
-                    sys.exit(0)
-                except Exception as e:
-                    print(f"\n[FATAL ERROR] Unexpected error in main: {e}")
-                    print(traceback.format_exc())
-                    try:
-                        sys.exit(1)
-                    except SystemExit:
-                        pass
-            except SystemExit:
-                pass
-            finally:
-                output = sys.stdout.getvalue()
-                sys.stdout = old_stdout
-            assert "FATAL ERROR" in output
-            assert "Unexpected error" in output
-            # This covers lines 649-653
-        
-        # To actually cover the __main__ block lines, we need to execute the script as __main__
-        # Let's use subprocess to run the actual script file
-        script_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "update_news.py")
-        
-        # Test by running the script directly with subprocess
-        # This will execute the actual __main__ block
-        env = os.environ.copy()
-        env['PYTHONPATH'] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        # Create a wrapper script that mocks dependencies and runs update_news
-        wrapper_script = f"""
-import sys
-import os
-sys.path.insert(0, r'{os.path.dirname(os.path.dirname(os.path.abspath(__file__)))}')
-from unittest.mock import patch
-
-# Mock all dependencies
-with patch('update_news.load_config', return_value={{'news_sources': {{'test': {{'name': 'Test', 'title_query': 'Test'}}}}}}):
-    with patch('update_news.process_topic', return_value=True):
-        # Import and execute - this will run the __main__ block
-        import runpy
-        runpy.run_path(r'{script_path}', run_name='__main__')
-"""
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(wrapper_script)
-            wrapper_path = f.name
+    """Test the __main__ block execution of update_news.py."""
+    
+    @pytest.mark.parametrize(
+        "main_result,expected_exit,expected_log",
+        [
+            pytest.param(0, 0, "", id="success"),
+            pytest.param(KeyboardInterrupt(), 1, "Interrupted by user", id="keyboard_interrupt"),
+            pytest.param(Exception("Unexpected error"), 1, "FATAL ERROR", id="exception"),
+        ],
+    )
+    def test_main_block_code_paths(self, monkeypatch, caplog, recorder, main_result, expected_exit, expected_log):
+        """Test each exit path of the script's __main__ block (run_cli success, interrupt, crash)."""
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        monkeypatch.setattr(update_news, "main", recorder(main_result))
+        
+        with patch('sys.exit') as mock_exit:
+            runpy.run_path(_SCRIPT_PATH, run_name='__main__')
+        
+        mock_exit.assert_called_once_with(expected_exit)
+        assert expected_log in caplog.text
+    
+    def test_main_block_runs_main(self):
+        """Test executing update_news.py as __main__ runs a full (stubbed) update."""
+        config = {
+            'news_sources': {'test': {'name': 'Test', 'title_query': 'Test'}},
+            'metrics': {'export_to_json': False}
+        }
         
-        try:
-            # Run the wrapper script which will execute update_news.py as __main__
-            result = subprocess.run([sys.executable, wrapper_path], 
-                                  capture_output=True, text=True, timeout=10, env=env)
-            # Should complete successfully
-            assert result.returncode == 0 or "INFO" in result.stdout or "OK" in result.stdout
-        finally:
-            if os.path.exists(wrapper_path):
-                os.unlink(wrapper_path)
+        with patch('update_news.load_config', return_value=config), \
+             patch('update_news.process_topic', return_value=(True, False)), \
+             patch('sys.exit') as mock_exit:
+            runpy.run_path(_SCRIPT_PATH, run_name='__main__')
+        mock_exit.assert_called_once_with(0)
 
 
 class TestMissingCoverageLines:
     """Test missing coverage lines to achieve 100% coverage."""
     
-    def test_is_rate_limit_error_with_error_code(self):
+    @pytest.mark.parametrize("error_code", [
+        "rateLimitExceeded",
+        "tooManyRequests",
+        "quotaExceeded",
+        "RATELIMITEXCEEDED",  # Case insensitive
+    ])
+    def test_is_rate_limit_error_with_error_code(self, error_code):
         """Test _is_rate_limit_error when error_code matches rate limit codes (line 633)."""
-        # Import the private function for testing
-        import update_news
-        _is_rate_limit_error = update_news._is_rate_limit_error
-        
-        # Test that error_code matching triggers line 633
-        assert _is_rate_limit_error('rateLimitExceeded', '', '', None) is True
-        assert _is_rate_limit_error('tooManyRequests', '', '', None) is True
-        assert _is_rate_limit_error('quotaExceeded', '', '', None) is True
-        assert _is_rate_limit_error('RATELIMITEXCEEDED', '', '', None) is True  # Case insensitive
+        assert update_news._is_rate_limit_error(error_code, '', '', None) is True
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_validate_articles_response_no_articles_but_total_results(self, mock_build, mock_date, mock_process, mock_fetch):
+    def test_validate_articles_response_no_articles_but_total_results(self, monkeypatch, caplog):
         """Test _validate_articles_response when articles list is empty but total_results > 0 (line 827)."""
-        from update_news import fetch_from_newsapi
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        monkeypatch.setattr(update_news, "calculate_date_range", lambda config: _DATE_RANGE)
+        monkeypatch.setattr(update_news, "build_api_params", lambda *args: {"q": "test"})
         # Return response with totalResults > 0 but empty articles list
-        mock_fetch.return_value = ({
-            "status": "ok",
-            "totalResults": 50,
-            "articles": []  # Empty articles list
-        }, True, False, False)
+        monkeypatch.setattr(update_news, "fetch_articles_page", lambda *args, **kwargs: _PAGE_EMPTY)
         
         config = {
             "news_sources": {
@@ -1555,27 +1352,19 @@ class TestMissingCoverageLines:
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            assert "No articles in response" in output_str or "totalResults: 50" in output_str
-            assert result == []
+        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
+        output_str = caplog.text
+        assert "No articles in response" in output_str or "totalResults: 50" in output_str
+        assert result == []
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_free_tier_mode(self, mock_build, mock_date, mock_process, mock_fetch):
+    def test_fetch_from_newsapi_free_tier_mode(self, monkeypatch, caplog, recorder):
         """Test fetch_from_newsapi when free_tier_mode is True (lines 880-881)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        mock_fetch.return_value = ({
-            "status": "ok",
-            "totalResults": 50,
-            "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-        }, True, False, False)
-        mock_process.return_value = {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        monkeypatch.setattr(update_news, "calculate_date_range", lambda config: _DATE_RANGE)
+        monkeypatch.setattr(update_news, "build_api_params", lambda *args: {"q": "test"})
+        fetch_stub = recorder(_PAGE_OK)
+        monkeypatch.setattr(update_news, "fetch_articles_page", fetch_stub)
+        monkeypatch.setattr(update_news, "process_article", lambda *args, **kwargs: dict(_ARTICLE))
         
         config = {
             "news_sources": {
@@ -1586,18 +1375,17 @@ class TestMissingCoverageLines:
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            assert "Free tier mode enabled" in output_str
-            assert len(result) == 1
+        result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
+        output_str = caplog.text
+        assert "Free tier mode enabled" in output_str
+        assert len(result) == 1
+        # Free tier stops after the first page despite totalResults spanning three
+        assert len(fetch_stub.calls) == 1
     
-    @patch('update_news.calculate_date_range')
-    def test_fetch_combined_from_newsapi_max_pages_zero(self, mock_date):
+    def test_fetch_combined_from_newsapi_max_pages_zero(self, monkeypatch, caplog):
         """Test fetch_combined_from_newsapi when max_pages <= 0 (lines 1046-1047)."""
-        from update_news import fetch_combined_from_newsapi
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        monkeypatch.setattr(update_news, "calculate_date_range", lambda config: _DATE_RANGE)
         
         topics_config = {
             "deep-learning": {"name": "Deep Learning", "title_query": "Deep Learning"}
@@ -1606,18 +1394,15 @@ class TestMissingCoverageLines:
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_combined_from_newsapi(topics_config, "test-key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            assert "No API calls remaining" in output_str or "Skipping combined request" in output_str
-            assert is_rate_limited is False
+        result, is_rate_limited = fetch_combined_from_newsapi(topics_config, "test-key", config, metrics, api_call_count)
+        output_str = caplog.text
+        assert any(m in output_str for m in _COMBINED_SKIPPED_MARKERS)
+        assert is_rate_limited is False
     
-    @patch('update_news.calculate_date_range')
-    def test_fetch_combined_from_newsapi_api_limit_in_try(self, mock_date):
+    def test_fetch_combined_from_newsapi_api_limit_in_try(self, monkeypatch, caplog):
         """Test fetch_combined_from_newsapi when API limit reached in try block (lines 1052-1053)."""
-        from update_news import fetch_combined_from_newsapi
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        monkeypatch.setattr(update_news, "calculate_date_range", lambda config: _DATE_RANGE)
         
         topics_config = {
             "deep-learning": {"name": "Deep Learning", "title_query": "Deep Learning"}
@@ -1626,25 +1411,16 @@ class TestMissingCoverageLines:
         metrics = MetricsTracker()
         api_call_count = {'total': 5}  # Already at limit
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_combined_from_newsapi(topics_config, "test-key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            assert "API call limit reached" in output_str or "Skipping combined request" in output_str
-            assert is_rate_limited is False
+        result, is_rate_limited = fetch_combined_from_newsapi(topics_config, "test-key", config, metrics, api_call_count)
+        output_str = caplog.text
+        assert any(m in output_str for m in _COMBINED_SKIPPED_MARKERS)
+        assert is_rate_limited is False
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.calculate_date_range')
-    def test_fetch_combined_from_newsapi_articles_validation_fails(self, mock_date, mock_fetch):
+    def test_fetch_combined_from_newsapi_articles_validation_fails(self, monkeypatch):
         """Test fetch_combined_from_newsapi when articles validation fails (line 1076)."""
-        from update_news import fetch_combined_from_newsapi
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
+        monkeypatch.setattr(update_news, "calculate_date_range", lambda config: _DATE_RANGE)
         # Return response with totalResults > 0 but empty articles list
-        mock_fetch.return_value = ({
-            "status": "ok",
-            "totalResults": 50,
-            "articles": []  # Empty articles list
-        }, True, False, False)
+        monkeypatch.setattr(update_news, "fetch_articles_page", lambda *args, **kwargs: _PAGE_EMPTY)
         
         topics_config = {
             "deep-learning": {"name": "Deep Learning", "title_query": "Deep Learning"}
@@ -1657,13 +1433,11 @@ class TestMissingCoverageLines:
         assert is_rate_limited is False
         assert len(result.get("deep-learning", [])) == 0
     
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.calculate_date_range')
-    def test_fetch_combined_from_newsapi_exception(self, mock_date, mock_fetch):
+    def test_fetch_combined_from_newsapi_exception(self, monkeypatch, caplog, recorder):
         """Test fetch_combined_from_newsapi exception handling (lines 1110-1113)."""
-        from update_news import fetch_combined_from_newsapi
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_fetch.side_effect = Exception("Unexpected error")
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        monkeypatch.setattr(update_news, "calculate_date_range", lambda config: _DATE_RANGE)
+        monkeypatch.setattr(update_news, "fetch_articles_page", recorder(Exception("Unexpected error")))
         
         topics_config = {
             "deep-learning": {"name": "Deep Learning", "title_query": "Deep Learning"}
@@ -1672,310 +1446,115 @@ class TestMissingCoverageLines:
         metrics = MetricsTracker()
         api_call_count = {'total': 0}
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_combined_from_newsapi(topics_config, "test-key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            assert "Unexpected error fetching from NewsAPI (combined request)" in output_str
-            assert is_rate_limited is False
+        result, is_rate_limited = fetch_combined_from_newsapi(topics_config, "test-key", config, metrics, api_call_count)
+        output_str = caplog.text
+        assert "Unexpected error fetching from NewsAPI (combined request)" in output_str
+        assert is_rate_limited is False
     
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_exception(self, mock_load_config, mock_load_news, mock_fetch_combined):
+    def test_main_combined_mode_exception(self, combined_main, caplog):
         """Test main function exception handling in combined mode (lines 1419-1436)."""
-        from update_news import main
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []
-        mock_fetch_combined.side_effect = Exception("Fetch error")
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[], fetch_combined_from_newsapi=Exception("Fetch error"))
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            assert "Failed to fetch news (combined request)" in output_str
+        main()
+        output_str = caplog.text
+        assert "Failed to fetch news (combined request)" in output_str
     
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_rate_limited_skip(self, mock_load_config, mock_load_news, 
-                                                   mock_filter, mock_update):
-        """Test main function when rate limited flag is already set in combined mode (lines 1438-1439)."""
-        from update_news import main
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []
-        mock_filter.return_value = []
-        mock_update.return_value = True
+    def test_main_combined_mode_rate_limited_skip(self, combined_main, caplog):
+        """Test main function when the combined fetch reports a rate limit (lines 1438-1439)."""
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[], filter_articles_by_retention=[], update_news_file=True,
+                      fetch_combined_from_newsapi=({}, True))
         
-        # To hit lines 1438-1439, we need rate_limited_flag['value'] to be True BEFORE fetch_combined
-        # The flag is created at line 1374 as {'value': False}
-        # We can patch the main function to inject a flag with value=True
-        # Actually, the simplest approach is to use a side_effect that modifies the flag
-        # after it's created. But since the check happens immediately, we need a different approach.
-        # Let's use a context manager that patches the flag creation point.
-        # Actually, let's just verify the rate limit handling works and accept that
-        # 1438-1439 might require more complex integration testing
-        with patch('update_news.fetch_combined_from_newsapi', return_value=({}, True)):
-            # This will set the flag after fetch, but won't hit 1438-1439
-            # To hit 1438-1439, we'd need the flag True before fetch
-            # Let's test a simpler scenario: verify rate limit handling works
-            with capture_logger_output() as output:
-                main()
-                output_str = output.getvalue()
-                # Should show rate limit messages
-                assert "Rate Limit" in output_str or "Quota" in output_str
+        main()
+        output_str = caplog.text
+        # Should show rate limit messages
+        assert any(m in output_str for m in _RATE_LIMIT_MARKERS)
     
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.merge_news_articles')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.fetch_from_newsapi')  # Also patch individual fetch to prevent real calls
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_both_existing_and_new(self, mock_load_config, mock_load_news, mock_fetch_individual,
-                                                       mock_fetch_combined, mock_merge, mock_filter, mock_update):
+    def test_main_combined_mode_both_existing_and_new(self, combined_main, cached_article, sample_article, caplog):
         """Test main function when both existing and new articles exist in combined mode (lines 1454-1455)."""
-        from update_news import main
-        existing_article = {"title": "Existing", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
-        new_article = {"title": "New", "date": "2025-01-16", "url": "2", "description": "", "source": ""}
-        
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = [existing_article]
-        mock_fetch_combined.return_value = ({"topic1": [new_article], "topic2": []}, False)
-        mock_merge.return_value = [existing_article, new_article]
-        mock_filter.return_value = [existing_article, new_article]
-        mock_update.return_value = True
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            assert "Merged" in output_str or "existing +" in output_str or "existing" in output_str.lower()
-    
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.fetch_from_newsapi')  # Also patch individual fetch to prevent real calls
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_only_new_articles(self, mock_load_config, mock_load_news, mock_fetch_individual,
-                                                  mock_fetch_combined, mock_filter, mock_update):
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        # fetch_from_newsapi is stubbed too so nothing can reach the network
+        stubs = combined_main(load_existing_news=[cached_article], fetch_from_newsapi=([], False),
+                              fetch_combined_from_newsapi=({"topic1": [sample_article], "topic2": []}, False),
+                              merge_and_filter=[cached_article, sample_article],
+                              filter_articles_by_retention=[cached_article], update_news_file=True)
+        
+        main()
+        output_str = caplog.text
+        assert any(m in output_str for m in _MERGED_MARKERS)
+        # topic1 saves the merged list; cached-only topic2 goes through the retention filter
+        assert len(stubs["merge_and_filter"].calls) == 1
+        assert len(stubs["filter_articles_by_retention"].calls) == 1
+        assert "Saved 2 articles to topic1.yml" in output_str
+        assert "Saved 1 articles to topic2.yml" in output_str
+    
+    def test_main_combined_mode_only_new_articles(self, combined_main, sample_article, caplog):
         """Test main function when only new articles exist in combined mode (lines 1459-1461)."""
-        from update_news import main
-        new_article = {"title": "New", "date": "2025-01-16", "url": "2", "description": "", "source": ""}
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[], fetch_from_newsapi=([], False),
+                      fetch_combined_from_newsapi=({"topic1": [sample_article], "topic2": []}, False),
+                      filter_articles_by_retention=[sample_article], update_news_file=True)
         
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []  # No existing articles
-        mock_fetch_combined.return_value = ({"topic1": [new_article], "topic2": []}, False)
-        mock_filter.return_value = [new_article]
-        mock_update.return_value = True
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            assert "Using" in output_str and ("new article" in output_str or "new" in output_str.lower())
+        main()
+        output_str = caplog.text
+        assert "Using" in output_str and ("new article" in output_str or "new" in output_str.lower())
     
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_empty_merged_articles(self, mock_load_config, mock_load_news, mock_fetch_combined, 
-                                                       mock_filter, mock_update):
+    def test_main_combined_mode_empty_merged_articles(self, combined_main):
         """Test main function when merged_articles is empty in combined mode (line 1463, 1471)."""
-        from update_news import main
-        
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []
-        mock_fetch_combined.return_value = ({"topic1": [], "topic2": []}, False)  # No new articles
-        mock_filter.return_value = []
-        mock_update.return_value = True
+        stubs = combined_main(load_existing_news=[], fetch_combined_from_newsapi=({"topic1": [], "topic2": []}, False),
+                              filter_articles_by_retention=[], update_news_file=True)
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            # Should handle empty merged_articles case
+        main()
+        # Nothing to filter, but each fresh topic still gets an (empty) file
+        assert len(stubs["filter_articles_by_retention"].calls) == 0
+        assert len(stubs["update_news_file"].calls) == 2
     
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_save_no_articles(self, mock_load_config, mock_load_news, mock_fetch_combined, 
-                                                  mock_filter, mock_update):
+    def test_main_combined_mode_save_no_articles(self, combined_main, caplog):
         """Test main function when saving with no articles in combined mode (line 1482)."""
-        from update_news import main
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[], fetch_combined_from_newsapi=({"topic1": [], "topic2": []}, False),
+                      filter_articles_by_retention=[], update_news_file=True)
         
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []
-        mock_fetch_combined.return_value = ({"topic1": [], "topic2": []}, False)
-        mock_filter.return_value = []
-        mock_update.return_value = True
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            assert "No articles to save" in output_str
+        main()
+        output_str = caplog.text
+        assert "No articles to save" in output_str
     
-    @patch('update_news.update_news_file', side_effect=Exception("Save error"))
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_save_exception_with_cached(self, mock_load_config, mock_load_news, mock_fetch_combined, 
-                                                            mock_filter, mock_update):
+    def test_main_combined_mode_save_exception_with_cached(self, combined_main, cached_article, caplog):
         """Test main function save exception with cached articles in combined mode (lines 1489-1493)."""
-        from update_news import main
-        cached_article = {"title": "Cached", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[cached_article], fetch_combined_from_newsapi=({"topic1": [], "topic2": []}, False),
+                      filter_articles_by_retention=[cached_article], update_news_file=Exception("Save error"))
         
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = [cached_article]
-        mock_fetch_combined.return_value = ({"topic1": [], "topic2": []}, False)
-        mock_filter.return_value = [cached_article]
-        # update_news_file will raise exception
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            assert "Cached articles are still available" in output_str
+        main()
+        output_str = caplog.text
+        assert "Cached articles are still available" in output_str
     
-    @patch('update_news.update_news_file', side_effect=Exception("Save error"))
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_save_exception_no_cached(self, mock_load_config, mock_load_news, mock_fetch_combined, 
-                                                         mock_filter, mock_update):
+    def test_main_combined_mode_save_exception_no_cached(self, combined_main):
         """Test main function save exception without cached articles in combined mode (line 1494)."""
-        from update_news import main
-        
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []  # No cached articles
-        mock_fetch_combined.return_value = ({"topic1": [], "topic2": []}, False)
-        mock_filter.return_value = []
-        # update_news_file will raise exception
+        stubs = combined_main(load_existing_news=[], fetch_combined_from_newsapi=({"topic1": [], "topic2": []}, False),
+                              filter_articles_by_retention=[], update_news_file=Exception("Save error"))
         
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            # Should increment error_count
+        # A failed save on a fresh topic counts as an error but does not abort the run
+        assert main() == 0
+        assert len(stubs["update_news_file"].calls) == 2
     
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.fetch_from_newsapi')  # Also patch individual fetch to prevent real calls
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_rate_limit_handling(self, mock_load_config, mock_load_news, mock_fetch_individual,
-                                                      mock_fetch_combined, mock_filter, mock_update):
+    def test_main_combined_mode_rate_limit_handling(self, combined_main, caplog):
         """Test main function rate limit handling in combined mode (lines 1498-1507)."""
-        from update_news import main
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[], fetch_from_newsapi=([], False),
+                      fetch_combined_from_newsapi=({"topic1": [], "topic2": []}, True),
+                      filter_articles_by_retention=[], update_news_file=True)
         
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []
-        mock_fetch_combined.return_value = ({"topic1": [], "topic2": []}, True)  # is_rate_limited = True
-        mock_filter.return_value = []
-        mock_update.return_value = True
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            assert "Rate Limit Detected" in output_str or "Quota Exhausted" in output_str or "Quota" in output_str
-            assert "Quota Information" in output_str or "quota" in output_str.lower()
+        main()
+        output_str = caplog.text
+        assert any(m in output_str for m in _RATE_LIMIT_MARKERS)
+        assert "Quota Information" in output_str or "quota" in output_str.lower()
     
-    @patch('update_news.update_news_file')
-    @patch('update_news.filter_articles_by_retention')
-    @patch('update_news.load_existing_news')
-    @patch('update_news.load_config')
-    @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_combined_mode_rate_limited_before_fetch(self, mock_load_config, mock_load_news, 
-                                                          mock_filter, mock_update):
+    def test_main_combined_mode_rate_limited_before_fetch(self, combined_main, caplog):
         """Test main function when rate_limited is True before fetch (lines 1475-1476)."""
-        from update_news import main
-        import update_news
-        import inspect
-        import types
-        
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
-        mock_load_news.return_value = []
-        mock_filter.return_value = []
-        mock_update.return_value = True
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        combined_main(load_existing_news=[], filter_articles_by_retention=[], update_news_file=True)
         
         # To test lines 1475-1476, we need rate_limited_flag['value'] = True
         # before the check at line 1453. The flag is created at line 1411.
@@ -1987,7 +1566,6 @@ class TestMissingCoverageLines:
         def patched_info(msg, *args, **kwargs):
             # When we see the "Combined request mode" message, modify the flag
             if not flag_modified['done'] and 'Combined request mode' in str(msg):
-                import sys
                 # Find the main function's frame
                 frame = sys._getframe(1)
                 while frame:
@@ -1999,56 +1577,40 @@ class TestMissingCoverageLines:
             return original_info(msg, *args, **kwargs)
         
         with patch.object(update_news.logger, 'info', side_effect=patched_info):
-            with capture_logger_output() as output:
-                main()
-                output_str = output.getvalue()
-                # Should hit the rate_limited branch (lines 1475-1476)
-                # The message is "Skipping API call (rate limit detected). Using cached articles only"
-                assert "Skipping API" in output_str or "skipping api" in output_str.lower()
+            main()
+            output_str = caplog.text
+            # Should hit the rate_limited branch (lines 1475-1476)
+            # The message is "Skipping API call (rate limit detected). Using cached articles only"
+            assert "Skipping API" in output_str or "skipping api" in output_str.lower()
     
-    def test_run_cli_keyboard_interrupt(self):
+    def test_run_cli_keyboard_interrupt(self, caplog):
         """Test run_cli KeyboardInterrupt handling (lines 1578-1579)."""
-        from update_news import run_cli
-        import sys
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
         
         with patch('update_news.main', side_effect=KeyboardInterrupt()):
             with patch('sys.exit') as mock_exit:
-                # Capture logger output
-                with capture_logger_output() as output:
-                    try:
-                        run_cli()
-                    except SystemExit:
-                        pass
-                    output_str = output.getvalue()
-                    assert "Interrupted by user" in output_str
-                    mock_exit.assert_called_with(1)
+                run_cli()
+                assert "Interrupted by user" in caplog.text
+                mock_exit.assert_called_with(1)
     
-    @patch('update_news.fetch_combined_from_newsapi')
-    @patch('update_news.load_config')
-    def test_main_combined_mode_no_api_key(self, mock_load_config, mock_fetch_combined):
+    def test_main_combined_mode_no_api_key(self, combined_main, monkeypatch, caplog):
         """Test main function in combined mode when no API key is provided (lines 1474-1475)."""
-        mock_load_config.return_value = {
-            "news_sources": {
-                "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
-                "topic2": {"name": "Topic 2", "title_query": "Topic 2"}
-            },
-            "api": {"combine_topics_in_single_request": True}
-        }
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
+        stubs = combined_main(fetch_combined_from_newsapi=None)
+        monkeypatch.delenv('NEWSAPI_KEY')
         
-        # Remove NEWSAPI_KEY from environment
-        with patch.dict(os.environ, {}, clear=True):
-            with capture_logger_output() as output:
-                main()
-                output_str = output.getvalue()
-                assert "Skipping combined request (no API key)" in output_str
-                # Verify fetch_combined_from_newsapi was not called
-                mock_fetch_combined.assert_not_called()
+        main()
+        output_str = caplog.text
+        assert "Skipping combined request (no API key)" in output_str
+        # Verify fetch_combined_from_newsapi was not called
+        assert len(stubs["fetch_combined_from_newsapi"].calls) == 0
     
     @patch('update_news.process_topic')
     @patch('update_news.load_config')
     @patch.dict(os.environ, {'NEWSAPI_KEY': 'test-key'})
-    def test_main_individual_mode_error_count(self, mock_load_config, mock_process_topic):
+    def test_main_individual_mode_error_count(self, mock_load_config, mock_process_topic, caplog):
         """Test main function when process_topic returns success=False (line 1515)."""
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
         mock_load_config.return_value = {
             "news_sources": {
                 "topic1": {"name": "Topic 1", "title_query": "Topic 1"},
@@ -2062,81 +1624,30 @@ class TestMissingCoverageLines:
         # First topic fails, second succeeds
         mock_process_topic.side_effect = [(False, False), (True, False)]
         
-        with capture_logger_output() as output:
-            main()
-            output_str = output.getvalue()
-            # Should show error count
-            assert "error" in output_str.lower() or "News update complete" in output_str
+        main()
+        output_str = caplog.text
+        # Should show error count
+        assert "error" in output_str.lower() or "News update complete" in output_str
     
-    def test_run_cli_success(self):
+    def test_run_cli_success(self, monkeypatch, recorder):
         """Test run_cli success path with sys.exit(0) (line 1572)."""
-        from update_news import run_cli
         
-        with patch('update_news.main') as mock_main:
-            with patch('sys.exit') as mock_exit:
-                try:
-                    run_cli()
-                except SystemExit:
-                    pass
-                mock_main.assert_called_once()
-                mock_exit.assert_called_with(0)
+        main_stub = recorder()
+        monkeypatch.setattr(update_news, "main", main_stub)
+        with patch('sys.exit') as mock_exit:
+            try:
+                run_cli()
+            except SystemExit:
+                pass
+            assert len(main_stub.calls) == 1
+            mock_exit.assert_called_with(0)
     
     def test_main_block_execution(self):
         """Test __main__ block execution (line 1583) by executing the module as script."""
-        import os
-        import subprocess
-        import sys
-        
-        # Get the path to the update_news module
-        module_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'update_news', '__init__.py')
-        
-        # Execute the module as a script using Python
-        # We'll use a test script that imports and patches run_cli
-        test_script = f"""
-import sys
-import os
-sys.path.insert(0, r'{os.path.dirname(os.path.dirname(__file__))}')
-
-from unittest.mock import patch, Mock
-mock_run_cli = Mock()
-
-# Import the module and patch run_cli before the __main__ block executes
-# We need to modify the module's run_cli after import but before execution
-import importlib
-import update_news
-
-# Replace run_cli in the module
-original_run_cli = update_news.run_cli
-update_news.run_cli = mock_run_cli
-
-# Now execute the __main__ block by setting __name__ and executing
-# Actually, we can't easily do this. Let's use a different approach:
-# Read and execute the file with __name__ = '__main__'
-with open(r'{module_path}', 'r') as f:
-    code = f.read()
-    
-# Create namespace with __name__ = '__main__'
-namespace = {{'__name__': '__main__', '__file__': r'{module_path}'}}
-# Import everything from update_news
-import update_news
-for attr in dir(update_news):
-    if not attr.startswith('_'):
-        namespace[attr] = getattr(update_news, attr)
-# Replace run_cli with mock
-namespace['run_cli'] = mock_run_cli
-
-# Execute the code
-exec(compile(code, r'{module_path}', 'exec'), namespace)
-
-# Check if run_cli was called
-if not mock_run_cli.called:
-    sys.exit(1)
-"""
-        
-        # Actually, the simplest way is to just verify the line exists and is syntactically correct
+        # The simplest way is to just verify the line exists and is syntactically correct
         # Testing the actual execution of __main__ blocks is complex and not typically done
         # in unit tests. The line is there for backward compatibility.
-        with open(module_path, 'r', encoding='utf-8') as f:
+        with open(_PACKAGE_INIT_PATH, 'r', encoding='utf-8') as f:
             content = f.read()
             # Verify the __main__ block exists and is correct
             assert 'if __name__ == "__main__":' in content
@@ -2144,19 +1655,13 @@ if not mock_run_cli.called:
             # The line is covered by its existence - it's a guard clause that only
             # executes when the file is run as a script, which is tested via __main__.py
     
-    def test_run_cli_exception(self):
+    def test_run_cli_exception(self, caplog):
         """Test run_cli exception handling (lines 1581-1583)."""
-        from update_news import run_cli
+        caplog.set_level(logging.INFO, logger=update_news.logger.name)
         
         with patch('update_news.main', side_effect=Exception("Test error")):
             with patch('sys.exit') as mock_exit:
-                # Capture logger output
-                with capture_logger_output() as output:
-                    try:
-                        run_cli()
-                    except SystemExit:
-                        pass
-                    output_str = output.getvalue()
-                    assert "FATAL ERROR" in output_str
-                    assert "Unexpected error in main" in output_str
-                    mock_exit.assert_called_with(1)
+                run_cli()
+                assert "FATAL ERROR" in caplog.text
+                assert "Unexpected error in main" in caplog.text
+                mock_exit.assert_called_with(1)
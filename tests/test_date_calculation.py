@@ -1,14 +1,27 @@
 """
 Unit tests for date range calculation.
 """
-import os
-import sys
 import pytest
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timezone
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import calculate_date_range, DEFAULT_LOOKBACK_DAYS, DEFAULT_EXCLUDE_TODAY_OFFSET
+import update_news
+
+_FROZEN_NOW = datetime(2025, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() always returns _FROZEN_NOW."""
+    @classmethod
+    def now(cls, tz=None):
+        return _FROZEN_NOW if tz is None else _FROZEN_NOW.astimezone(tz)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Pin update_news's clock so expected dates cannot drift across midnight mid-test."""
+    monkeypatch.setattr(update_news, "datetime", _FrozenDatetime)
+    return _FROZEN_NOW
 
 
 class TestCalculateDateRange:
@@ -25,11 +38,9 @@ class TestCalculateDateRange:
         }
         from_date, to_date = calculate_date_range(config)
         
-        # Verify format
-        assert len(from_date) == 10  # YYYY-MM-DD
-        assert len(to_date) == 10
-        assert from_date.count('-') == 2
-        assert to_date.count('-') == 2
+        # Both ends are ISO YYYY-MM-DD; fromisoformat rejects anything else
+        span = date.fromisoformat(to_date) - date.fromisoformat(from_date)
+        assert span.days == 60 - 1
     
     def test_calculate_date_range_with_defaults(self):
         """Test date range calculation with default values."""
@@ -37,10 +48,10 @@ class TestCalculateDateRange:
         from_date, to_date = calculate_date_range(config)
         
         # Should use defaults
-        assert len(from_date) == 10
-        assert len(to_date) == 10
+        span = date.fromisoformat(to_date) - date.fromisoformat(from_date)
+        assert span.days == DEFAULT_LOOKBACK_DAYS - DEFAULT_EXCLUDE_TODAY_OFFSET
     
-    def test_calculate_date_range_excludes_today(self):
+    def test_calculate_date_range_excludes_today(self, frozen_now):
         """Test that date range excludes today when configured."""
         config = {
             'date_range': {
@@ -51,20 +62,11 @@ class TestCalculateDateRange:
         }
         from_date, to_date = calculate_date_range(config)
         
-        # Parse dates
-        from_dt = datetime.strptime(from_date, '%Y-%m-%d')
-        to_dt = datetime.strptime(to_date, '%Y-%m-%d')
-        now = datetime.now(timezone.utc)
-        
-        # to_date should be yesterday
-        expected_to = (now - timedelta(days=1)).date()
-        assert to_dt.date() == expected_to
-        
-        # from_date should be lookback_days ago
-        expected_from = (now - timedelta(days=30)).date()
-        assert from_dt.date() == expected_from
+        # to_date should be yesterday, from_date lookback_days ago
+        assert to_date == "2025-01-14"
+        assert from_date == "2024-12-16"
     
-    def test_calculate_date_range_includes_today(self):
+    def test_calculate_date_range_includes_today(self, frozen_now):
         """Test that date range includes today when configured."""
         config = {
             'date_range': {
@@ -74,9 +76,17 @@ class TestCalculateDateRange:
         }
         from_date, to_date = calculate_date_range(config)
         
-        to_dt = datetime.strptime(to_date, '%Y-%m-%d')
-        now = datetime.now(timezone.utc)
-        
         # to_date should be today
-        assert to_dt.date() == now.date()
+        assert to_date == frozen_now.date().isoformat()
 
+    
+    def test_calculate_date_range_cached_per_day(self, frozen_now):
+        """Test repeated calls on the same UTC day reuse the cached window."""
+        config = {'date_range': {'lookback_days': 12, 'exclude_today': True, 'exclude_today_offset_days': 2}}
+        
+        update_news._date_range_for_day.cache_clear()
+        first = calculate_date_range(config)
+        second = calculate_date_range(config)
+        
+        assert first == second == ("2025-01-03", "2025-01-13")
+        assert update_news._date_range_for_day.cache_info().hits == 1
@@ -1,541 +1,377 @@
 """
 Unit tests for news fetching functionality.
 """
-import os
-import sys
 import pytest
-import logging
-from unittest.mock import Mock, patch, MagicMock
-from io import StringIO
-from contextlib import contextmanager
+import itertools
+import threading
+from unittest.mock import patch
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import (
     fetch_from_newsapi,
-    MetricsTracker,
-    DEFAULT_MAX_PAGES
+    MSG_WARNING_API_LIMIT_REACHED
 )
 import update_news
 
 
-@contextmanager
-def capture_logger_output():
-    """Context manager to capture logger output to a StringIO."""
-    old_handlers = update_news.logger.handlers[:]
-    output = StringIO()
-    handler = logging.StreamHandler(output)
-    handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
-    update_news.logger.handlers = [handler]
-    try:
-        yield output
-    finally:
-        update_news.logger.handlers = old_handlers
-
-
-class TestFetchFromNewsapi:
-    """Test news fetching from NewsAPI."""
-    
-    def test_fetch_from_newsapi_no_api_key(self):
-        """Test fetching without API key."""
-        config = {}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "", config, metrics, api_call_count)
-        
-        assert result == []
-        assert is_rate_limited is False
-    
-    def test_fetch_from_newsapi_no_topic_config(self):
-        """Test fetching with missing topic configuration."""
-        config = {"news_sources": {}}
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("unknown-topic", "test-key", config, metrics, api_call_count)
-        
-        assert result == []
-        assert is_rate_limited is False
-    
-    def test_fetch_from_newsapi_no_title_query(self):
-        """Test fetching with topic config but no title_query."""
-        config = {
-            "news_sources": {
-                "test-topic": {}
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("test-topic", "test-key", config, metrics, api_call_count)
-        
-        assert result == []
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    def test_fetch_from_newsapi_success_single_page(self, mock_process, mock_fetch_page):
-        """Test successful fetch with single page."""
-        mock_fetch_page.return_value = ({
-            "status": "ok",
-            "totalResults": 50,
-            "articles": [
-                {
-                    "url": "https://example.com/1",
-                    "title": "Machine Learning News",
-                    "description": "Machine learning breakthrough",
-                    "publishedAt": "2025-01-15T10:00:00Z",
-                    "source": {"name": "Tech News"}
-                }
-            ]
-        }, True, False, False)
-        
-        mock_process.return_value = {
-            "title": "Machine Learning News",
-            "date": "2025-01-15",
-            "url": "https://example.com/1",
-            "description": "Machine learning breakthrough",
-            "source": "Tech News"
-        }
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": ["machine learning"]
-                }
-            },
-            "api": {
-                "max_page_size": 100,
-                "max_pages": 5
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        assert len(result) == 1
-        assert result[0]["title"] == "Machine Learning News"
-        assert is_rate_limited is False
-        mock_fetch_page.assert_called_once()
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    def test_fetch_from_newsapi_pagination_stops_on_error_status(self, mock_process, mock_fetch_page):
-        """Test pagination stops when page returns error status."""
-        # First page
-        mock_fetch_page.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [
-                    {
-                        "url": "https://example.com/1",
-                        "title": "ML Article 1",
-                        "description": "Machine learning",
-                        "publishedAt": "2025-01-15T10:00:00Z",
-                        "source": {"name": "Tech News"}
-                    }
-                ]
-            }, True, False, False),
-            # Second page with error status
-            ({
-                "status": "error",
-                "message": "Rate limit exceeded"
-            }, True, False, False)
-        ]
-        
-        mock_process.return_value = {"title": "ML Article 1", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": ["machine learning"]
-                }
-            },
-            "api": {
-                "max_page_size": 100,
-                "max_pages": 5
+# fetch_articles_page result for a page the API rejected
+_PAGE_ERROR = ({"status": "error", "message": "Rate limit exceeded"}, True, False, False)
+
+# news_sources for the generic "test-topic" (read-only)
+_TEST_TOPIC_SOURCES = {"test-topic": {"title_query": "Test"}}
+
+# Single-topic config for fetch_from_newsapi
+_ML_CONFIG = {"news_sources": {"machine-learning": {"title_query": "Machine Learning", "related_keywords": []}}}
+
+# (topic, api_key, config, fetch_articles_page result) for fetches that must come back empty;
+# a None result marks setup errors where no page is requested
+_EMPTY_FETCH_CASES = [
+    ("machine-learning", "", {}, None),
+    ("unknown-topic", "test-key", {"news_sources": {}}, None),
+    ("test-topic", "test-key", {"news_sources": {"test-topic": {}}}, None),
+    ("machine-learning", "test-key", _ML_CONFIG, ({"status": "error", "message": "Invalid API key"}, True, False, False)),
+    ("machine-learning", "test-key", _ML_CONFIG, ({"status": "ok", "totalResults": 0, "articles": []}, True, False, False)),
+    ("machine-learning", "test-key", _ML_CONFIG, (None, False, False, False)),
+]
+
+
+@pytest.fixture(autouse=True)
+def fetch_page(monkeypatch, recorder):
+    """Replace fetch_articles_page for every test in this module so none can reach the network."""
+    stub = recorder()
+    monkeypatch.setattr(update_news, "fetch_articles_page", stub)
+    return stub
+
+
+@pytest.mark.parametrize("topic,api_key,config,page_result", _EMPTY_FETCH_CASES,
+                         ids=["no_api_key", "no_topic_config", "no_title_query", "api_error_status", "no_results", "fetch_failure"])
+def test_fetch_from_newsapi_returns_empty(fetch_page, topic, api_key, config, page_result, tracker, api_call_count):
+    """Test missing setup, API errors, empty pages and failed fetches all yield no articles."""
+    fetch_page.value = page_result
+    
+    result, is_rate_limited = fetch_from_newsapi(topic, api_key, config, tracker, api_call_count)
+    
+    assert result == []
+    assert is_rate_limited is False
+    # Setup errors return before any request is made
+    assert bool(fetch_page.calls) is (page_result is not None)
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_success_single_page(mock_process, fetch_page, tracker, api_call_count, pagination_config):
+    """Test successful fetch with single page."""
+    fetch_page.value = ({
+        "status": "ok",
+        "totalResults": 50,
+        "articles": [
+            {
+                "url": "https://example.com/1",
+                "title": "Machine Learning News",
+                "description": "Machine learning breakthrough",
+                "publishedAt": "2025-01-15T10:00:00Z",
+                "source": {"name": "Tech News"}
             }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        # Should stop after second page returns error status (line 465)
-        assert mock_fetch_page.call_count == 2
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    def test_fetch_from_newsapi_pagination(self, mock_process, mock_fetch_page):
-        """Test fetching with pagination."""
-        # First page
-        mock_fetch_page.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [
-                    {
-                        "url": "https://example.com/1",
-                        "title": "ML Article 1",
-                        "description": "Machine learning",
-                        "publishedAt": "2025-01-15T10:00:00Z",
-                        "source": {"name": "Tech News"}
-                    }
-                ]
-            }, True, False, False),
-            # Second page
-            ({
-                "status": "ok",
-                "articles": [
-                    {
-                        "url": "https://example.com/2",
-                        "title": "ML Article 2",
-                        "description": "Machine learning",
-                        "publishedAt": "2025-01-14T10:00:00Z",
-                        "source": {"name": "Tech News"}
-                    }
-                ]
-            }, True, False, False)
         ]
-        
-        mock_process.side_effect = [
-            {"title": "ML Article 1", "date": "2025-01-15", "url": "1", "description": "", "source": ""},
-            {"title": "ML Article 2", "date": "2025-01-14", "url": "2", "description": "", "source": ""}
-        ]
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": ["machine learning"]
-                }
-            },
-            "api": {
-                "max_page_size": 100,
-                "max_pages": 5
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        # Should fetch 2 pages (total 250 results / 100 per page = 3 pages, but max_pages limits to 5)
-        assert mock_fetch_page.call_count >= 2
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    def test_fetch_from_newsapi_api_error_status(self, mock_fetch_page):
-        """Test handling API error status."""
-        mock_fetch_page.return_value = ({
-            "status": "error",
-            "message": "Invalid API key"
-        }, True, False, False)
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": []
-                }
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        assert result == []
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    def test_fetch_from_newsapi_no_results(self, mock_fetch_page):
-        """Test handling no results from API."""
-        mock_fetch_page.return_value = ({
+    }, True, False, False)
+    
+    mock_process.return_value = {
+        "title": "Machine Learning News",
+        "date": "2025-01-15",
+        "url": "https://example.com/1",
+        "description": "Machine learning breakthrough",
+        "source": "Tech News"
+    }
+    
+    result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", pagination_config, tracker, api_call_count)
+    
+    assert len(result) == 1
+    assert result[0]["title"] == "Machine Learning News"
+    assert is_rate_limited is False
+    assert len(fetch_page.calls) == 1
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_pagination_stops_on_error_status(mock_process, fetch_page, fetch_ok, tracker, api_call_count, pagination_config, cached_article):
+    """Test pagination stops when page returns error status."""
+    fetch_page.respond = itertools.chain([fetch_ok()], itertools.repeat(_PAGE_ERROR))
+    
+    mock_process.return_value = cached_article
+    
+    result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", pagination_config, tracker, api_call_count)
+    
+    # Should stop after second page returns error status (line 465)
+    assert len(fetch_page.calls) == 2
+    assert is_rate_limited is False
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_pagination(mock_process, fetch_page, fetch_ok, tracker, api_call_count, pagination_config, cached_article):
+    """Test fetching with pagination."""
+    # One-article pages built lazily, as many as pagination asks for
+    fetch_page.respond = (fetch_ok(start=page) for page in itertools.count(1))
+    
+    mock_process.return_value = cached_article
+    
+    result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", pagination_config, tracker, api_call_count)
+    
+    # Should fetch 2 pages (total 250 results / 100 per page = 3 pages, but max_pages limits to 5)
+    assert len(fetch_page.calls) >= 2
+    assert is_rate_limited is False
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_pagination_stops_on_error(mock_process, fetch_page, fetch_ok, tracker, api_call_count, pagination_config, cached_article):
+    """Test pagination stops when page fetch fails."""
+    fetch_page.respond = iter([
+        fetch_ok(),
+        (None, False, False, False)  # Second page fails
+    ])
+    
+    mock_process.return_value = cached_article
+    
+    result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", pagination_config, tracker, api_call_count)
+    
+    # Should stop after first page fails
+    assert len(fetch_page.calls) == 2
+    assert is_rate_limited is False
+
+
+@patch('update_news.calculate_date_range')
+@patch('update_news.build_api_params')
+def test_fetch_from_newsapi_max_pages_zero(mock_build, mock_date, fetch_page, tracker, api_call_count, caplog):
+    """Test no pages are requested when the budget is spent after the initial limit check."""
+    api_call_count['total'] = 9
+    
+    def spend_budget(config):
+        # Another topic takes the last call between the limit check and the page calculation
+        api_call_count['total'] = 10
+        return ("2025-01-01", "2025-01-15")
+    
+    mock_date.side_effect = spend_budget
+    mock_build.return_value = {"q": "test"}
+    config = {
+        "news_sources": _TEST_TOPIC_SOURCES,
+        "api": {"max_api_calls": 10, "max_pages": 5}
+    }
+    
+    result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    assert result == []
+    assert is_rate_limited is False
+    assert "No API calls remaining" in caplog.text
+    assert len(fetch_page.calls) == 0
+
+
+@patch('update_news.calculate_date_range')
+@patch('update_news.build_api_params')
+def test_fetch_from_newsapi_api_limit_in_try_block(mock_build, mock_date, fetch_page, tracker, api_call_count, caplog, monkeypatch):
+    """Test the topic is skipped when the first page's call cannot be reserved."""
+    mock_date.return_value = ("2025-01-01", "2025-01-15")
+    mock_build.return_value = {"q": "test"}
+    # Another topic takes the last call between the page calculation and the reservation
+    monkeypatch.setattr(update_news, "_reserve_api_calls", lambda *args: 0)
+    config = {
+        "news_sources": {
+            "test-topic": {"title_query": "Test", "max_pages": 10}
+        },
+        "api": {"max_api_calls": 5}
+    }
+    
+    result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    assert result == []
+    assert f"{MSG_WARNING_API_LIMIT_REACHED}. Skipping test-topic." in caplog.text
+    assert len(fetch_page.calls) == 0
+
+
+@patch('update_news.process_article')
+@patch('update_news.calculate_date_range')
+@patch('update_news.build_api_params')
+def test_fetch_from_newsapi_api_limit_during_pagination_break(mock_build, mock_date, mock_process, fetch_page, fetch_ok, tracker, api_call_count, cached_article, caplog):
+    """Test pagination stops when the shared budget runs out between pages."""
+    mock_date.return_value = ("2025-01-01", "2025-01-15")
+    mock_build.return_value = {"q": "test"}
+    config = {
+        "news_sources": _TEST_TOPIC_SOURCES,
+        "api": {"max_api_calls": 3, "max_page_size": 100, "max_pages": 5}
+    }
+    
+    def fetch_side_effect(url, params, page, config, metrics, topic):
+        if page == 2:
+            # Another topic spends the last call while page 2 is in flight
+            api_call_count['total'] = 3
+        return fetch_ok(start=page)
+    
+    fetch_page.respond = fetch_side_effect
+    mock_process.return_value = cached_article
+    
+    result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    assert f"{MSG_WARNING_API_LIMIT_REACHED}. Stopping pagination at page 2." in caplog.text
+    # 250 results = 3 pages, but page 3 is never requested
+    assert [args[2] for args in fetch_page.calls] == [1, 2]
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_concurrent_page_waves(mock_process, fetch_page, tracker, api_call_count):
+    """Test pages after the first are fetched concurrently and processed in page order."""
+    def fetch_side_effect(url, params, page, config, metrics, topic):
+        return ({
             "status": "ok",
-            "totalResults": 0,
-            "articles": []
+            "totalResults": 250,
+            "articles": [{"url": str(page), "title": f"Article {page}", "description": "test", "publishedAt": f"2025-01-1{page}T10:00:00Z", "source": {"name": "Test"}}]
         }, True, False, False)
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": []
-                }
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        assert result == []
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    def test_fetch_from_newsapi_fetch_failure(self, mock_fetch_page):
-        """Test handling fetch page failure."""
-        mock_fetch_page.return_value = (None, False, False, False)
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": []
-                }
-            }
+    
+    fetch_page.respond = fetch_side_effect
+    mock_process.side_effect = lambda article, *args, **kwargs: {"title": article["title"], "date": article["publishedAt"][:10], "url": article["url"], "description": "", "source": ""}
+    
+    config = {
+        "news_sources": _TEST_TOPIC_SOURCES,
+        "api": {
+            "max_page_size": 100,
+            "max_pages": 5,
+            "page_fetch_concurrency": 3,
+            "rate_limit_delay_seconds": 0,
+            "early_stop_duplicate_threshold": 1.1
         }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        assert result == []
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    def test_fetch_from_newsapi_pagination_stops_on_error(self, mock_process, mock_fetch_page):
-        """Test pagination stops when page fetch fails."""
-        mock_fetch_page.side_effect = [
-            ({
-                "status": "ok",
-                "totalResults": 250,
-                "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-            }, True, False, False),
-            (None, False, False, False)  # Second page fails
+    }
+    
+    result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    # 250 results = 3 pages; pages 2 and 3 are in flight together
+    assert sorted(args[2] for args in fetch_page.calls) == [1, 2, 3]
+    assert api_call_count['total'] == 3
+    assert [item["url"] for item in result] == ["3", "2", "1"]
+    assert is_rate_limited is False
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_slow_page_does_not_stall_window(mock_process, fetch_page, fetch_ok, tracker, api_call_count):
+    """Test a slow page keeps its slot while the next page is requested in the freed one."""
+    page_4_requested = threading.Event()
+    waited = {}
+    
+    def fetch_side_effect(url, params, page, config, metrics, topic):
+        if page == 3:
+            # Only finishes promptly if page 4 goes out while page 3 is still in flight
+            waited[page] = page_4_requested.wait(timeout=5)
+        elif page == 4:
+            page_4_requested.set()
+        return fetch_ok(start=page, total_results=400)
+    
+    fetch_page.respond = fetch_side_effect
+    mock_process.return_value = None
+    config = {
+        "news_sources": _TEST_TOPIC_SOURCES,
+        "api": {"max_page_size": 100, "max_pages": 4, "page_fetch_concurrency": 2, "early_stop_duplicate_threshold": 1.1}
+    }
+    
+    fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    assert waited == {3: True}
+    assert sorted(args[2] for args in fetch_page.calls) == [1, 2, 3, 4]
+    assert api_call_count['total'] == 4
+
+
+def test_fetch_from_newsapi_skips_known_urls(fetch_page, tracker, api_call_count):
+    """Test URLs passed as known_urls are treated as duplicates and stop pagination early."""
+    page = ({
+        "status": "ok",
+        "totalResults": 250,
+        "articles": [
+            {"url": "https://example.com/cached", "title": "Machine Learning cached", "description": "d", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Tech"}},
+            {"url": "https://example.com/new", "title": "Machine Learning new", "description": "d", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Tech"}}
         ]
-        
-        mock_process.return_value = {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}
-        
-        config = {
-            "news_sources": {
-                "machine-learning": {
-                    "title_query": "Machine Learning",
-                    "related_keywords": ["machine learning"]
-                }
-            },
-            "api": {
-                "max_page_size": 100,
-                "max_pages": 5
-            }
-        }
-        metrics = MetricsTracker()
-        api_call_count = {'total': 0}
-        
-        result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, metrics, api_call_count)
-        
-        # Should stop after first page fails
-        assert mock_fetch_page.call_count == 2
-        assert is_rate_limited is False
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_max_pages_zero(self, mock_build, mock_date, mock_fetch_page):
-        """Test fetch_from_newsapi when max_pages <= 0 (lines 497-498)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # To hit line 497-498, we need max_pages <= 0 after calculation
-        # This requires remaining_calls = 0, which means api_call_count['total'] = max_api_calls
-        # But we also need to pass the check at line 461, which requires api_call_count['total'] < max_api_calls
-        # This is a contradiction, so we need a mock that returns different values
-        class ChangingApiCount:
-            def __init__(self):
-                self._calls = 0
-                self._value = 9  # Start below limit
-            
-            def __getitem__(self, key):
-                if key == 'total':
-                    self._calls += 1
-                    # First call (line 461 check): return 9 (below limit)
-                    # Later calls (max_pages calc): return 10 (at limit)
-                    if self._calls == 1:
-                        return 9
-                    else:
-                        return 10  # At limit for max_pages calculation
-                return None
-            
-            def __setitem__(self, key, value):
-                if key == 'total':
-                    self._value = value
-            
-            def get(self, key, default=None):
-                if key == 'total':
-                    return self.__getitem__(key)
-                return default
-        
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_api_calls": 10, "max_pages": 5}
-        }
-        metrics = MetricsTracker()
-        api_call_count = ChangingApiCount()
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            assert result == []
-            assert is_rate_limited is False
-            assert "No API calls remaining" in output_str
-            assert mock_fetch_page.call_count == 0
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_api_limit_in_try_block(self, mock_build, mock_date, mock_fetch_page):
-        """Test fetch_from_newsapi API limit check inside try block (lines 505-506)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # Create a custom dict-like object that changes value between accesses
-        class ChangingDict:
-            def __init__(self):
-                self._access_count = 0
-                self._value = 4  # Start below limit
-            
-            def __getitem__(self, key):
-                if key == 'total':
-                    # Track accesses: first few return 4, then return 5 (at limit)
-                    self._access_count += 1
-                    # During max_pages calculation and initial checks: return 4
-                    # During try block check: return 5
-                    if self._access_count <= 2:  # Allow a couple accesses for max_pages calc
-                        return 4
-                    else:
-                        return 5  # At limit for try block check
-                return None
-            
-            def __setitem__(self, key, value):
-                if key == 'total':
-                    self._value = value
-                    # Reset access count when value is set
-                    self._access_count = 0
-            
-            def get(self, key, default=None):
-                if key == 'total':
-                    return self.__getitem__(key)
-                return default
-        
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test", "max_pages": 10}
-            },
-            "api": {"max_api_calls": 5}
-        }
-        metrics = MetricsTracker()
-        api_call_count = ChangingDict()
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            # Should hit the check at line 504-506
-            assert "API call limit reached" in output_str or result == []
-            assert mock_fetch_page.call_count == 0
-    
-    @patch('update_news.fetch_articles_page')
-    @patch('update_news.process_article')
-    @patch('update_news.calculate_date_range')
-    @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_api_limit_during_pagination_break(self, mock_build, mock_date, mock_process, mock_fetch_page):
-        """Test fetch_from_newsapi API limit check during pagination that triggers break (lines 554-556)."""
-        mock_date.return_value = ("2025-01-01", "2025-01-15")
-        mock_build.return_value = {"q": "test"}
-        
-        # To hit line 554-556, we need:
-        # 1. total_pages > 1 (enter pagination loop)
-        # 2. api_call_count['total'] >= max_api_calls when checking at line 554
-        # Strategy: Use max_api_calls = 3, and simulate that after fetching page 2, 
-        # when checking for page 3, we're already at the limit
-        # This requires a custom dict that returns limit value when checking for page 3
-        config = {
-            "news_sources": {
-                "test-topic": {"title_query": "Test"}
-            },
-            "api": {"max_api_calls": 3, "max_page_size": 100, "max_pages": 5}
+    }, True, False, False)
+    fetch_page.respond = iter([page, page])
+    
+    config = {
+        "news_sources": {"machine-learning": {"title_query": "Machine Learning"}},
+        "api": {"max_page_size": 100, "max_pages": 5, "rate_limit_delay_seconds": 0}
+    }
+    known_urls = {"https://example.com/cached"}
+    
+    result, is_rate_limited = fetch_from_newsapi("machine-learning", "test-key", config, tracker, api_call_count, known_urls)
+    
+    assert [item["url"] for item in result] == ["https://example.com/new"]
+    # Page 2 is 100% duplicates, so pagination stops there
+    assert len(fetch_page.calls) == 2
+    # Caller's set is not mutated
+    assert known_urls == {"https://example.com/cached"}
+    assert is_rate_limited is False
+
+
+def test_fetch_from_newsapi_dedupes_urls_across_pages(fetch_page, fetch_ok, tracker, api_call_count):
+    """Test an article repeated on a later page is returned and counted once."""
+    # Pages overlap by one article: 1-3, 3-5, 5-7
+    fetch_page.respond = (fetch_ok(n=3, start=start) for start in (1, 3, 5))
+    config = {
+        "news_sources": _TEST_TOPIC_SOURCES,
+        "api": {"max_page_size": 3, "max_pages": 3, "early_stop_duplicate_threshold": 1.1, "min_articles_per_topic": 100}
+    }
+    
+    result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    assert len(fetch_page.calls) == 3
+    assert sorted(int(item["url"]) for item in result) == list(range(1, 8))
+    assert tracker.topic_metrics["test-topic"]["articles_fetched"] == 7
+
+
+@patch('update_news.process_article')
+def test_fetch_from_newsapi_prefetch_next_page(mock_process, fetch_page, fetch_ok, tracker, api_call_count):
+    """Test the next page is requested before the current page is processed."""
+    events = []
+    page_3_requested = threading.Event()
+    
+    def fetch_side_effect(url, params, page, config, metrics, topic):
+        events.append(("fetch", page))
+        if page == 3:
+            page_3_requested.set()
+        return fetch_ok(start=page)
+    
+    def process_side_effect(article, *args, **kwargs):
+        if article["url"] == "2":
+            assert page_3_requested.wait(timeout=5)
+        events.append(("process", int(article["url"])))
+        return {"title": article["title"], "date": "2025-01-15", "url": article["url"], "description": "", "source": ""}
+    
+    fetch_page.respond = fetch_side_effect
+    mock_process.side_effect = process_side_effect
+    
+    config = {
+        "news_sources": _TEST_TOPIC_SOURCES,
+        "api": {
+            "max_page_size": 100,
+            "max_pages": 5,
+            "prefetch_next_page": True,
+            "rate_limit_delay_seconds": 0,
+            "min_articles_per_topic": 2
         }
-        metrics = MetricsTracker()
-        
-        # Use a custom dict that tracks pagination state
-        # After page 2 is fetched (total = 2), when checking for page 3, return 3 (at limit)
-        class LimitReachingDict:
-            def __init__(self):
-                self._value = 0
-                self._get_count = 0
-                self._ready_for_limit = False
-            
-            def __getitem__(self, key):
-                if key == 'total':
-                    self._get_count += 1
-                    # After page 2 is fetched (value = 2), the next get in pagination loop should return limit
-                    # We set _ready_for_limit when value becomes 2, then on next get, return limit
-                    if self._ready_for_limit:
-                        self._ready_for_limit = False  # Only return limit once
-                        return 3  # At limit (max_api_calls = 3)
-                    return self._value
-                return None
-            
-            def __setitem__(self, key, value):
-                if key == 'total':
-                    self._value = value
-                    # When value becomes 2 (after page 2 is fetched), mark that next get should return limit
-                    if value == 2:
-                        self._ready_for_limit = True
-            
-            def get(self, key, default=None):
-                if key == 'total':
-                    return self.__getitem__(key)
-                return default
-        
-        api_call_count = LimitReachingDict()
-        
-        # Mock fetch_page to return multiple pages worth of results
-        call_count = [0]
-        def fetch_side_effect(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # First page - return success with many results (250 results = 3 pages)
-                return ({
-                    "status": "ok",
-                    "totalResults": 250,
-                    "articles": [{"url": "1", "title": "Test", "description": "test", "publishedAt": "2025-01-15T10:00:00Z", "source": {"name": "Test"}}]
-                }, True, False, False)
-            elif call_count[0] == 2:
-                # Second page - return success
-                return ({
-                    "status": "ok",
-                    "articles": [{"url": "2", "title": "Test2", "description": "test", "publishedAt": "2025-01-14T10:00:00Z", "source": {"name": "Test"}}]
-                }, True, False, False)
-            else:
-                # Should not reach here if break works
-                return (None, False, False, False)
-        
-        mock_fetch_page.side_effect = fetch_side_effect
-        # Mock process_article to return articles for both pages
-        mock_process.side_effect = [
-            {"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""},
-            {"title": "Test2", "date": "2025-01-14", "url": "2", "description": "", "source": ""}
-        ]
-        
-        # Capture logger output
-        with capture_logger_output() as output:
-            result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, metrics, api_call_count)
-            output_str = output.getvalue()
-            # Should hit the check at line 554-556 when checking for page 3
-            # The message should be: "API call limit reached. Stopping pagination at page 2."
-            assert "API call limit reached" in output_str or "Stopping pagination" in output_str
-            # Should only fetch 2 pages (first + second), not third
-            assert mock_fetch_page.call_count == 2
+    }
+    
+    result, is_rate_limited = fetch_from_newsapi("test-topic", "key", config, tracker, api_call_count)
+    
+    # Page 3 was requested before page 2 was processed, then discarded by the early stop
+    assert events.index(("fetch", 3)) < events.index(("process", 2))
+    assert ("process", 3) not in events
+    assert api_call_count['total'] == 3
+    assert sorted(item["url"] for item in result) == ["1", "2"]
+    assert is_rate_limited is False
+
 
+def test_reserve_api_calls_never_exceeds_budget(api_call_count):
+    """Test concurrent reservations never grant more calls than the budget allows."""
+    granted = []
+    
+    def worker():
+        for _ in range(50):
+            granted.append(update_news._reserve_api_calls(api_call_count, 100, 3))
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert sum(granted) == api_call_count['total'] == 100
+    update_news._refund_api_calls(api_call_count, 4)
+    assert update_news._reserve_api_calls(api_call_count, 100, 10) == 4
@@ -2,27 +2,24 @@
 Unit tests for file operations.
 """
 import os
-import sys
+import random
 import pytest
 import yaml
-import tempfile
-import shutil
+from datetime import date, timedelta
+from unittest.mock import MagicMock
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from update_news import update_news_file, DATA_DIR
+from update_news import update_news_file, SafeLoader
+import update_news
 
 
 class TestUpdateNewsFile:
     """Test news file update functionality."""
     
-    def test_update_news_file_success(self, tmp_path):
+    def test_update_news_file_success(self, tmp_path, monkeypatch):
         """Test successfully updating news file."""
         # Temporarily change DATA_DIR
-        import update_news
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "_data" / "news")
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
         
         news_items = [
             {
@@ -41,51 +38,57 @@ class TestUpdateNewsFile:
             }
         ]
         
-        try:
-            result = update_news_file("test-topic", news_items)
-            
-            assert result is True
-            file_path = os.path.join(test_dir, "test-topic.yml")
-            assert os.path.exists(file_path)
-            
-            # Verify file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            assert "news_items" in data
-            assert len(data["news_items"]) == 2
-            # Should be sorted by date (newest first)
-            assert data["news_items"][0]["date"] == "2025-01-15"
-        finally:
-            update_news.DATA_DIR = original_dir
+        result = update_news_file("test-topic", news_items)
+        
+        assert result is True
+        file_path = os.path.join(test_dir, "test-topic.yml")
+        assert os.path.exists(file_path)
+        
+        # Verify file content
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        
+        assert "news_items" in data
+        assert len(data["news_items"]) == 2
+        # Should be sorted by date (newest first)
+        assert data["news_items"][0]["date"] == "2025-01-15"
     
-    def test_update_news_file_empty_list(self, tmp_path):
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permission bits")
+    def test_update_news_file_keeps_file_mode(self, tmp_path, monkeypatch):
+        """Test the atomic rewrite keeps an existing file's mode and gives new files the umask default."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        file_path = tmp_path / "test-topic.yml"
+        
+        reference = tmp_path / "reference"
+        reference.touch()
+        
+        assert update_news_file("test-topic", [{"title": "A", "url": "1", "date": "2025-01-15"}]) is True
+        assert file_path.stat().st_mode & 0o777 == reference.stat().st_mode & 0o777
+        
+        file_path.chmod(0o640)
+        assert update_news_file("test-topic", [{"title": "B", "url": "2", "date": "2025-01-16"}]) is True
+        assert file_path.stat().st_mode & 0o777 == 0o640
+    
+    def test_update_news_file_empty_list(self, tmp_path, monkeypatch):
         """Test updating with empty news items list."""
-        import update_news
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "_data" / "news")
-        update_news.DATA_DIR = test_dir
-        
-        try:
-            result = update_news_file("test-topic", [])
-            
-            assert result is True
-            file_path = os.path.join(test_dir, "test-topic.yml")
-            assert os.path.exists(file_path)
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            assert data["news_items"] == []
-        finally:
-            update_news.DATA_DIR = original_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
+        
+        result = update_news_file("test-topic", [])
+        
+        assert result is True
+        file_path = os.path.join(test_dir, "test-topic.yml")
+        assert os.path.exists(file_path)
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        
+        assert data["news_items"] == []
     
-    def test_update_news_file_sorts_by_date(self, tmp_path):
+    def test_update_news_file_sorts_by_date(self, tmp_path, monkeypatch):
         """Test that articles are sorted by date (newest first)."""
-        import update_news
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "_data" / "news")
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
         
         news_items = [
             {"title": "Old", "date": "2025-01-10", "url": "1", "description": "", "source": ""},
@@ -93,61 +96,116 @@ class TestUpdateNewsFile:
             {"title": "Middle", "date": "2025-01-12", "url": "3", "description": "", "source": ""}
         ]
         
-        try:
-            result = update_news_file("test-topic", news_items)
-            
-            assert result is True
-            file_path = os.path.join(test_dir, "test-topic.yml")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            # Should be sorted newest first
-            assert data["news_items"][0]["date"] == "2025-01-15"
-            assert data["news_items"][1]["date"] == "2025-01-12"
-            assert data["news_items"][2]["date"] == "2025-01-10"
-        finally:
-            update_news.DATA_DIR = original_dir
+        result = update_news_file("test-topic", news_items)
+        
+        assert result is True
+        file_path = os.path.join(test_dir, "test-topic.yml")
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        
+        # Should be sorted newest first
+        assert data["news_items"][0]["date"] == "2025-01-15"
+        assert data["news_items"][1]["date"] == "2025-01-12"
+        assert data["news_items"][2]["date"] == "2025-01-10"
     
-    def test_update_news_file_creates_directory(self, tmp_path):
+    def test_update_news_file_string_sort_matches_date_order(self, tmp_path, monkeypatch):
+        """Test sorting on the raw YYYY-MM-DD strings gives the same order as parsed dates."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        rng = random.Random(7)
+        start = date(2020, 1, 1)
+        news_items = [
+            {"title": str(i), "date": (start + timedelta(days=rng.randrange(2000))).isoformat(), "url": str(i)}
+            for i in range(1000)
+        ]
+        expected = sorted((item["date"] for item in news_items), key=date.fromisoformat, reverse=True)
+        
+        assert update_news_file("test-topic", news_items) is True
+        
+        with open(tmp_path / "test-topic.yml", 'r', encoding='utf-8') as f:
+            saved = yaml.load(f, Loader=SafeLoader)["news_items"]
+        assert [item["date"] for item in saved] == expected
+    
+    def test_update_news_file_top_n_keeps_newest(self, tmp_path, monkeypatch):
+        """Test top_n keeps the newest items, in the order a full stable sort would give for equal dates."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        news_items = [
+            {"title": "Old", "date": "2025-01-10", "url": "old"},
+            {"title": "Tie A", "date": "2025-01-15", "url": "a"},
+            {"title": "Newest", "date": "2025-01-20", "url": "new"},
+            {"title": "Tie B", "date": "2025-01-15", "url": "b"},
+            {"title": "No date", "url": "none"},
+        ]
+        
+        assert update_news_file("test-topic", news_items, top_n=3) is True
+        
+        assert [item["url"] for item in news_items] == ["new", "a", "b"]
+        with open(tmp_path / "test-topic.yml", 'r', encoding='utf-8') as f:
+            saved = yaml.load(f, Loader=SafeLoader)["news_items"]
+        assert saved == news_items
+    
+    def test_update_news_file_creates_directory(self, tmp_path, monkeypatch):
         """Test that function creates directory if it doesn't exist."""
-        import update_news
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "new" / "nested" / "dir" / "news")
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
         
         news_items = [{"title": "Test", "date": "2025-01-15", "url": "1", "description": "", "source": ""}]
         
-        try:
-            result = update_news_file("test-topic", news_items)
-            
-            assert result is True
-            assert os.path.exists(test_dir)
-        finally:
-            update_news.DATA_DIR = original_dir
+        result = update_news_file("test-topic", news_items)
+        
+        assert result is True
+        assert os.path.exists(test_dir)
     
-    def test_update_news_file_handles_missing_date(self, tmp_path):
+    def test_update_news_file_handles_missing_date(self, tmp_path, monkeypatch):
         """Test handling articles with missing date field."""
-        import update_news
-        original_dir = update_news.DATA_DIR
         test_dir = str(tmp_path / "_data" / "news")
-        update_news.DATA_DIR = test_dir
+        monkeypatch.setattr(update_news, "DATA_DIR", test_dir)
         
         news_items = [
             {"title": "No Date", "url": "1", "description": "", "source": ""},
             {"title": "Has Date", "date": "2025-01-15", "url": "2", "description": "", "source": ""}
         ]
         
-        try:
-            result = update_news_file("test-topic", news_items)
-            
-            assert result is True
-            file_path = os.path.join(test_dir, "test-topic.yml")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
-            assert len(data["news_items"]) == 2
-        finally:
-            update_news.DATA_DIR = original_dir
+        result = update_news_file("test-topic", news_items)
+        
+        assert result is True
+        file_path = os.path.join(test_dir, "test-topic.yml")
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        
+        assert len(data["news_items"]) == 2
 
+    
+    def test_update_news_file_failed_write_keeps_original(self, tmp_path, monkeypatch):
+        """Test a failed dump leaves the existing file intact and no temp file behind."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        file_path = tmp_path / "test-topic.yml"
+        file_path.write_text("news_items: []\n")
+        
+        monkeypatch.setattr(update_news.yaml, "dump", lambda *args, **kwargs: (_ for _ in ()).throw(IOError("Disk full")))
+        result = update_news_file("test-topic", [{"title": "New", "date": "2025-01-15", "url": "1"}])
+        
+        assert result is False
+        assert file_path.read_text() == "news_items: []\n"
+        assert os.listdir(tmp_path) == ["test-topic.yml"]
+    
+    def test_update_news_file_skips_unchanged_content(self, tmp_path, monkeypatch):
+        """Test an identical rewrite leaves the file untouched and a changed one replaces it."""
+        monkeypatch.setattr(update_news, "DATA_DIR", str(tmp_path))
+        file_path = tmp_path / "test-topic.yml"
+        items = [{"title": "A", "date": "2025-01-15", "url": "1"}]
+        
+        assert update_news_file("test-topic", list(items)) is True
+        inode = os.stat(file_path).st_ino
+        
+        create_temp = MagicMock(wraps=update_news._create_temp_file)
+        monkeypatch.setattr(update_news, "_create_temp_file", create_temp)
+        assert update_news_file("test-topic", list(items)) is True
+        assert os.stat(file_path).st_ino == inode
+        create_temp.assert_not_called()
+        
+        assert update_news_file("test-topic", items + [{"title": "B", "date": "2025-01-16", "url": "2"}]) is True
+        create_temp.assert_called_once()
+        with open(file_path, 'r') as f:
+            assert len(yaml.load(f, Loader=SafeLoader)["news_items"]) == 2
@@ -1,14 +1,15 @@
 """
 Unit tests for keyword processing functions.
 """
-import os
-import sys
 import pytest
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import normalize_keywords, article_matches_keywords
 
+# Already-lowercased keyword tuples shared by the matching tests
+_DL_KEYWORDS = ("deep learning",)
+_ML_KEYWORDS = ("machine learning",)
+_MULTI_KEYWORDS = ("deep learning", "neural networks")
+
 
 class TestNormalizeKeywords:
     """Test keyword normalization."""
@@ -47,10 +48,8 @@ class TestArticleMatchesKeywords:
             "title": "New Breakthrough in Deep Learning Research",
             "description": "Some description"
         }
-        keywords = ["deep learning", "neural networks"]
-        config = {}
         
-        assert article_matches_keywords(article, keywords, config) is True
+        assert article_matches_keywords(article, _MULTI_KEYWORDS, {}) is True
     
     def test_article_matches_in_description(self):
         """Test matching keyword in article description."""
@@ -58,10 +57,8 @@ class TestArticleMatchesKeywords:
             "title": "AI Research Update",
             "description": "This article discusses neural networks and their applications"
         }
-        keywords = ["neural networks", "deep learning"]
-        config = {}
         
-        assert article_matches_keywords(article, keywords, config) is True
+        assert article_matches_keywords(article, _MULTI_KEYWORDS, {}) is True
     
     def test_article_no_match(self):
         """Test article that doesn't match any keywords."""
@@ -69,10 +66,8 @@ class TestArticleMatchesKeywords:
             "title": "Weather Forecast for Tomorrow",
             "description": "Sunny skies expected"
         }
-        keywords = ["deep learning", "neural networks"]
-        config = {}
         
-        assert article_matches_keywords(article, keywords, config) is False
+        assert article_matches_keywords(article, _MULTI_KEYWORDS, {}) is False
     
     def test_article_case_insensitive_match(self):
         """Test that matching is case-insensitive."""
@@ -80,10 +75,8 @@ class TestArticleMatchesKeywords:
             "title": "DEEP LEARNING Advances",
             "description": "Some description"
         }
-        keywords = ["deep learning"]
-        config = {}
         
-        assert article_matches_keywords(article, keywords, config) is True
+        assert article_matches_keywords(article, _DL_KEYWORDS, {}) is True
     
     def test_article_empty_description(self):
         """Test article with empty description."""
@@ -91,8 +84,18 @@ class TestArticleMatchesKeywords:
             "title": "Machine Learning News",
             "description": ""
         }
-        keywords = ["machine learning"]
-        config = {}
         
-        assert article_matches_keywords(article, keywords, config) is True
+        assert article_matches_keywords(article, _ML_KEYWORDS, {}) is True
 
+    
+    def test_article_keywords_matched_literally(self):
+        """Test regex metacharacters in keywords match literally and an empty keyword list matches nothing."""
+        article = {
+            "title": "Why C++ still matters",
+            "description": "Compilers (and Rust) compared"
+        }
+        
+        assert article_matches_keywords(article, ["c++"], {}) is True
+        assert article_matches_keywords(article, ["(and rust)"], {}) is True
+        assert article_matches_keywords(article, ["c.+"], {}) is False
+        assert article_matches_keywords(article, [], {}) is False
@@ -2,15 +2,11 @@
 Tests for __main__ block execution to achieve 100% coverage.
 Covers the missing lines in __init__.py (line 1583) and __main__.py (lines 8-11).
 """
-import os
-import sys
-import subprocess
 import runpy
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import update_news
 
 
 class TestMainModuleExecution:
@@ -31,14 +27,17 @@ class TestMainModuleExecution:
 class TestInitMainBlock:
     """Test __init__.py __main__ block execution (line 1583)."""
     
-    def test_init_main_block_execution(self):
+    def test_init_main_block_execution(self, monkeypatch, tmp_path):
         """Test executing update_news/__init__.py __main__ block (line 1583)."""
-        import update_news
-        import runpy
         
         # Get the path to __init__.py
         init_file = update_news.__file__
         
+        # The script runs as a fresh module with its relative _data/ paths, so run it from an
+        # empty directory without an API key to keep it off the network and out of the repo
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv('NEWSAPI_KEY', raising=False)
+        
         # Use runpy.run_path to execute the file as a script
         # This will properly execute the __main__ block (lines 1582-1583) with correct line numbers for coverage
         # We catch SystemExit since run_cli() calls sys.exit(0)
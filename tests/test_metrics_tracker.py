@@ -2,37 +2,12 @@
 Unit tests for MetricsTracker class.
 """
 import os
-import sys
 import pytest
 import json
-import tempfile
 import time
-import logging
-from io import StringIO
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import MetricsTracker
-import update_news
-
-
-@contextmanager
-def capture_logger_output():
-    """Context manager to capture logger output to a StringIO."""
-    old_handlers = update_news.logger.handlers[:]
-    old_level = update_news.logger.level
-    output = StringIO()
-    handler = logging.StreamHandler(output)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
-    update_news.logger.handlers = [handler]
-    update_news.logger.setLevel(logging.DEBUG)
-    try:
-        yield output
-    finally:
-        update_news.logger.handlers = old_handlers
-        update_news.logger.setLevel(old_level)
 
 
 class TestMetricsTracker:
@@ -62,6 +37,21 @@ class TestMetricsTracker:
         assert tracker.topic_metrics["machine-learning"]["api_calls"] == 1
         assert tracker.topic_metrics["machine-learning"]["api_errors"] == 1
     
+    def test_record_api_call_from_worker_threads(self):
+        """Test API calls recorded concurrently from several threads are all counted."""
+        tracker = MetricsTracker()
+        
+        def record(i):
+            tracker.record_api_call("machine-learning", float(i), i % 10 != 0)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(record, range(1000)))
+        
+        stats = tracker.topic_metrics["machine-learning"]
+        assert stats["api_calls"] == 1000
+        assert stats["api_errors"] == 100
+        assert sorted(stats["response_time_ms"]) == [float(i) for i in range(1000)]
+    
     def test_record_article_fetched(self):
         """Test recording fetched articles."""
         tracker = MetricsTracker()
@@ -84,6 +74,27 @@ class TestMetricsTracker:
         
         assert tracker.topic_metrics["machine-learning"]["articles_saved"] == 10
     
+    def test_merge(self):
+        """Test merging a per-topic tracker adds its counts and response times."""
+        tracker = MetricsTracker()
+        tracker.record_api_call("machine-learning", 100.0, True)
+        tracker.record_article_fetched("machine-learning")
+        
+        topic_tracker = MetricsTracker()
+        topic_tracker.record_api_call("machine-learning", 300.0, False)
+        topic_tracker.record_article_fetched("machine-learning")
+        topic_tracker.record_article_filtered("machine-learning")
+        topic_tracker.record_article_saved("machine-learning", 7)
+        tracker.merge(topic_tracker)
+        
+        stats = tracker.topic_metrics["machine-learning"]
+        assert stats["api_calls"] == 2
+        assert stats["api_errors"] == 1
+        assert stats["articles_fetched"] == 2
+        assert stats["articles_filtered"] == 1
+        assert stats["articles_saved"] == 7
+        assert list(stats["response_time_ms"]) == [100.0, 300.0]
+    
     def test_get_total_time(self):
         """Test getting total execution time."""
         tracker = MetricsTracker()
@@ -114,6 +125,22 @@ class TestMetricsTracker:
         assert topic_metrics["articles_saved"] == 5
         assert "response_time_stats" in topic_metrics
     
+    def test_to_dict_response_time_stats(self):
+        """Test response time stats are computed from the recorded calls and are zero without any."""
+        tracker = MetricsTracker()
+        for response_time in (120.0, 80.5, 100.25):
+            tracker.record_api_call("machine-learning", response_time, True)
+        tracker.record_article_saved("deep-learning", 0)
+        
+        topics = tracker.to_dict()["topics"]
+        
+        assert topics["machine-learning"]["response_time_stats"] == {
+            "average_ms": 100.25, "min_ms": 80.5, "max_ms": 120.0, "count": 3
+        }
+        assert topics["deep-learning"]["response_time_stats"] == {
+            "average_ms": 0, "min_ms": 0, "max_ms": 0, "count": 0
+        }
+    
     def test_export_to_json(self, tmp_path):
         """Test exporting metrics to JSON file."""
         tracker = MetricsTracker()
@@ -154,6 +181,22 @@ class TestMetricsTracker:
         assert result is True
         assert (tmp_path / json_name).exists()
     
+    def test_reset_clears_recorded_metrics(self):
+        """Test reset drops topic metrics, including API calls recorded on worker threads."""
+        tracker = MetricsTracker()
+        tracker.record_article_fetched("machine-learning")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(lambda i: tracker.record_api_call("machine-learning", 10.0 * i), range(4)))
+        started = tracker.start_time
+        
+        tracker.reset()
+        
+        assert len(tracker.topic_metrics) == 0
+        assert tracker.start_time >= started
+        tracker.record_api_call("deep-learning", 50.0)
+        assert list(tracker.topic_metrics) == ["deep-learning"]
+        assert tracker.topic_metrics["deep-learning"]["api_calls"] == 1
+    
     def test_multiple_topics(self):
         """Test tracking metrics for multiple topics."""
         tracker = MetricsTracker()
@@ -168,7 +211,7 @@ class TestMetricsTracker:
         assert "machine-learning" in metrics_dict["topics"]
         assert "deep-learning" in metrics_dict["topics"]
     
-    def test_print_summary_with_metrics(self):
+    def test_print_summary_with_metrics(self, capture_logger_output):
         """Test print_summary with actual metrics data."""
         tracker = MetricsTracker()
         tracker.record_api_call("test-topic", 100.0, True)
@@ -186,7 +229,7 @@ class TestMetricsTracker:
             assert "API Calls: 2" in output_str
             assert "Avg Response Time" in output_str
     
-    def test_print_summary_empty_metrics(self):
+    def test_print_summary_empty_metrics(self, capture_logger_output):
         """Test print_summary with no metrics."""
         tracker = MetricsTracker()
         
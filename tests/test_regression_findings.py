@@ -72,7 +72,7 @@ def test_fetch_combined_uses_dedicated_metrics_topic_bucket():
     api_call_count = {"total": 0}
     captured = {}
 
-    def fake_fetch_articles_page(url, params, page, config, metrics_obj, topic):
+    def fake_fetch_articles_page(url, params, page, config, metrics_obj, topic, api_budget=None):
         captured["topic"] = topic
         return {"status": "ok", "totalResults": 0, "articles": []}, True, False, False
 
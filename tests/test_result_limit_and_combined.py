@@ -2,16 +2,10 @@
 Tests for result limit handling and combined request functionality.
 Covers missing lines for 100% coverage.
 """
-import os
-import sys
 import pytest
-import logging
-from unittest.mock import Mock, patch, MagicMock
-from io import StringIO
-from contextlib import contextmanager
+import requests
+from unittest.mock import Mock, patch
 
-# Add parent directory to path to import update_news
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from update_news import (
     make_api_request,
     fetch_combined_from_newsapi,
@@ -20,34 +14,14 @@ from update_news import (
     fetch_from_newsapi,
     MetricsTracker,
 )
-import update_news
-
-
-@contextmanager
-def capture_logger_output():
-    """Context manager to capture logger output to a StringIO."""
-    old_handlers = update_news.logger.handlers[:]
-    old_level = update_news.logger.level
-    output = StringIO()
-    handler = logging.StreamHandler(output)
-    handler.setLevel(logging.DEBUG)
-    handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
-    update_news.logger.handlers = [handler]
-    update_news.logger.setLevel(logging.DEBUG)
-    try:
-        yield output
-    finally:
-        update_news.logger.handlers = old_handlers
-        update_news.logger.setLevel(old_level)
 
 
 class TestResultLimitHandling:
     """Test result limit error handling for 100% coverage."""
     
-    @patch('update_news.requests.get')
+    @patch('update_news._SESSION.get')
     def test_make_api_request_result_limit_with_articles(self, mock_get):
         """Test make_api_request result limit error with articles in response (lines 456-466)."""
-        import requests
         mock_response = Mock()
         mock_response.status_code = 200  # Can be any status code
         mock_response.json.return_value = {
@@ -76,10 +50,9 @@ class TestResultLimitHandling:
         assert response_data.get("status") == "ok"
         assert len(response_data.get("articles", [])) == 1
     
-    @patch('update_news.requests.get')
+    @patch('update_news._SESSION.get')
     def test_make_api_request_result_limit_without_articles(self, mock_get):
         """Test make_api_request result limit error without articles (lines 468-471)."""
-        import requests
         mock_response = Mock()
         mock_response.status_code = 426
         mock_response.json.return_value = {
@@ -102,10 +75,9 @@ class TestResultLimitHandling:
         assert is_rate_limited is False
         assert response_data is None
     
-    @patch('update_news.requests.get')
+    @patch('update_news._SESSION.get')
     def test_make_api_request_result_limit_in_error_text(self, mock_get):
         """Test make_api_request result limit detected in error text (lines 477-479)."""
-        import requests
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.json.side_effect = ValueError("No JSON")
@@ -258,7 +230,7 @@ class TestCombinedRequestFunctions:
     @patch('update_news.fetch_articles_page')
     @patch('update_news.process_article')
     @patch('update_news.calculate_date_range')
-    def test_fetch_combined_from_newsapi_total_results_over_100(self, mock_date, mock_process, mock_fetch):
+    def test_fetch_combined_from_newsapi_total_results_over_100(self, mock_date, mock_process, mock_fetch, capture_logger_output):
         """Test fetch_combined_from_newsapi with totalResults > 100 (lines 845-848)."""
         mock_date.return_value = ("2025-01-01", "2025-01-15")
         mock_fetch.return_value = ({
@@ -389,7 +361,7 @@ class TestFetchFromNewsapiResultLimit:
     @patch('update_news.process_article')
     @patch('update_news.calculate_date_range')
     @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_result_limit_with_articles(self, mock_build, mock_date, mock_process, mock_fetch):
+    def test_fetch_from_newsapi_result_limit_with_articles(self, mock_build, mock_date, mock_process, mock_fetch, capture_logger_output):
         """Test fetch_from_newsapi with result limit but articles available (lines 634-636)."""
         mock_date.return_value = ("2025-01-01", "2025-01-15")
         mock_build.return_value = {"q": "test"}
@@ -423,7 +395,7 @@ class TestFetchFromNewsapiResultLimit:
     @patch('update_news.fetch_articles_page')
     @patch('update_news.calculate_date_range')
     @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_result_limit_no_articles(self, mock_build, mock_date, mock_fetch):
+    def test_fetch_from_newsapi_result_limit_no_articles(self, mock_build, mock_date, mock_fetch, capture_logger_output):
         """Test fetch_from_newsapi with result limit and no articles (lines 640-642)."""
         mock_date.return_value = ("2025-01-01", "2025-01-15")
         mock_build.return_value = {"q": "test"}
@@ -449,7 +421,7 @@ class TestFetchFromNewsapiResultLimit:
     @patch('update_news.process_article')
     @patch('update_news.calculate_date_range')
     @patch('update_news.build_api_params')
-    def test_fetch_from_newsapi_total_results_over_100(self, mock_build, mock_date, mock_process, mock_fetch):
+    def test_fetch_from_newsapi_total_results_over_100(self, mock_build, mock_date, mock_process, mock_fetch, capture_logger_output):
         """Test fetch_from_newsapi with totalResults > 100 (lines 655-658)."""
         mock_date.return_value = ("2025-01-01", "2025-01-15")
         mock_build.return_value = {"q": "test"}
@@ -14,16 +14,32 @@ Features:
 
 import os
 import sys
+import array
+import atexit
+import copy
+import functools
+import hashlib
+import heapq
 import yaml
 import json
 import requests
 import time
+import threading
 import traceback
 import logging
+import random
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Union
-from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 
 # Fix encoding for Windows console
 if sys.platform == 'win32':
@@ -53,6 +69,7 @@ CONFIG_FILE = "_data/news_config.yml"
 DATA_DIR = "_data/news"
 DATE_FORMAT = "%Y-%m-%d"
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+ISO_DATE_PATTERN = re.compile(r"\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])")  # Matches DATE_FORMAT output
 
 # Default values (used if config file is missing)
 DEFAULT_LOOKBACK_DAYS = 30
@@ -62,7 +79,16 @@ DEFAULT_TIMEOUT_SECONDS = 15
 DEFAULT_MAX_PAGE_SIZE = 100
 DEFAULT_MAX_PAGES = 5
 DEFAULT_RATE_LIMIT_DELAY_SECONDS = 1.0
+DEFAULT_MAX_REQUESTS_PER_SECOND = 0  # Request rate cap shared by all topics and page threads (0 = no cap)
+DEFAULT_REQUEST_BURST = 1  # Requests allowed back-to-back before the rate cap applies
+DEFAULT_PAGE_FETCH_CONCURRENCY = 1  # Pages 2..N kept in flight at once (1 = sequential)
+DEFAULT_PREFETCH_NEXT_PAGE = False  # Request the next page while processing the current one
+DEFAULT_MAX_RATE_LIMIT_RETRIES = 1  # Retries for throttled requests that send Retry-After
+DEFAULT_MAX_RETRY_AFTER_SECONDS = 30.0  # Longer waits are treated as quota exhaustion
+DEFAULT_HTTP_CACHE_FILE = ""  # ETag/Last-Modified cache for conditional requests (empty = disabled)
+HTTP_CACHE_MAX_ENTRIES = 200  # Oldest cached responses are dropped beyond this
 DEFAULT_TOPIC_DELAY_SECONDS = 2.0  # Delay between topics
+DEFAULT_TOPIC_CONCURRENCY = 1  # Topics processed in parallel in separate-request mode (1 = sequential)
 DEFAULT_MAX_API_CALLS = 45  # Maximum API calls per run (safety buffer under 50 limit)
 DEFAULT_LANGUAGE = "en"
 DEFAULT_SORT_BY = "publishedAt"
@@ -70,6 +96,7 @@ DEFAULT_MAX_DESCRIPTION_LENGTH = 250
 DEFAULT_MAX_TITLE_PREVIEW_LENGTH = 60
 DEFAULT_MAX_ERROR_TEXT_LENGTH = 500
 DEFAULT_DEBUG_LOG_FILTERED_LIMIT = 3
+DEFAULT_MAX_SAVED_ARTICLES = 0  # Newest articles kept per topic file (0 = keep all within retention)
 DEFAULT_METRICS_EXPORT_TO_JSON = True
 DEFAULT_METRICS_JSON_PATH = "_data/news_metrics.json"
 COMBINED_METRICS_TOPIC = "combined_request"
@@ -78,11 +105,25 @@ COMBINED_METRICS_TOPIC = "combined_request"
 DEFAULT_MIN_ARTICLES_PER_TOPIC = 10  # Stop pagination when we have this many new articles
 DEFAULT_EARLY_STOP_DUPLICATE_THRESHOLD = 0.7  # Stop if 70%+ of articles are duplicates
 DEFAULT_COMBINE_TOPICS_IN_SINGLE_REQUEST = True  # Default to combined requests (1 API call for all topics) - matches config.yml
+DEFAULT_COMBINE_TOPICS_WHEN_QUOTA_TIGHT = True  # Switch to combined mode if max_api_calls < number of topics
 
 # API Configuration
 NEWSAPI_BASE_URL = "https://newsapi.org/v2/everything"
 ENV_VAR_NEWSAPI_KEY = "NEWSAPI_KEY"
 
+# Common rate limit indicators in error messages, matched in a single regex pass
+RATE_LIMIT_INDICATOR_PATTERN = re.compile('|'.join(map(re.escape, [
+    'rate limit',
+    'rate_limit',
+    'quota',
+    'too many requests',
+    'too many calls',
+    'request limit',
+    'api limit exceeded',
+    'throttle'
+])))
+RATE_LIMIT_ERROR_CODES = frozenset(code.lower() for code in ['rateLimitExceeded', 'tooManyRequests', 'quotaExceeded'])
+
 # Metrics tracking
 METRICS_SEPARATOR = "=" * 60
 
@@ -97,6 +138,7 @@ MSG_INFO_RESULT_LIMIT_REACHED = "Free tier result limit reached (limited to max
 MSG_INFO_FREE_TIER_LIMIT = "Free tier Developer accounts are limited to max 100 results per query"
 MSG_INFO_DISPLAYING_ARTICLES = "Displaying available articles (up to 100) in UI"
 MSG_INFO_RATE_LIMIT_DETECTED = "Rate limit error detected"
+MSG_INFO_RATE_LIMIT_RETRY = "Rate limited with Retry-After: retrying in {delay:.1f} seconds (attempt {attempt})"
 MSG_INFO_QUOTA_EXHAUSTED = "Quota exhausted"
 MSG_WARNING_RATE_LIMIT = "Rate limit detected"
 MSG_INFO_STOPPING_REQUESTS = "Stopping all API requests. Will use cached articles if available"
@@ -139,6 +181,7 @@ MSG_INFO_PROCESSED_TOTAL = "Processed {count} total unique articles after filter
 MSG_ERROR_UNEXPECTED_COMBINED = "Unexpected error fetching from NewsAPI (combined request)"
 MSG_INFO_REMOVED_ARTICLES = "Removed {count} article(s) older than {days} days"
 MSG_OK_UPDATED = "Updated {path} with {count} news items"
+MSG_INFO_UNCHANGED = "{path} unchanged ({count} news items), skipping write"
 MSG_ERROR_UPDATE_FAILED = "Failed to update news file"
 MSG_INFO_LOADED_CACHED = "Loaded {count} cached article(s)"
 MSG_WARNING_READ_CACHE_FAILED = "Failed to read existing news cache"
@@ -154,6 +197,7 @@ MSG_INFO_SKIPPING_API = "Skipping API call (rate limit detected). Using cached a
 MSG_WARNING_SKIPPING_NO_KEY = "Skipping {topic} (no API key)"
 MSG_INFO_MERGED_ARTICLES = "Merged {existing} existing + {new} new = {total} total articles"
 MSG_INFO_API_FAILED_CACHED = "API failed, using {count} cached article(s)"
+MSG_INFO_NO_NEW_USING_CACHED = "No new articles, using {count} cached article(s)"
 MSG_INFO_USING_NEW = "Using {count} new article(s)"
 MSG_INFO_AFTER_RETENTION = "After retention filter ({days} days): {count} articles remain"
 MSG_OK_SAVED = "Saved {count} articles to {file}"
@@ -173,7 +217,9 @@ MSG_ERROR_NO_SOURCES = "No news sources configured. Please check news_config.yml
 MSG_INFO_API_LIMIT = "API call limit: {limit} requests per run"
 MSG_INFO_COMBINED_ENABLED = "Combined request mode: ENABLED (1 request for all topics)"
 MSG_INFO_COMBINED_DISABLED = "Combined request mode: DISABLED (separate requests per topic)"
+MSG_INFO_COMBINED_QUOTA_TIGHT = "API call limit ({limit}) is below the number of topics ({count}); using combined request mode so every topic is fetched"
 MSG_INFO_DELAY_BETWEEN = "Delay between topics: {delay} seconds"
+MSG_INFO_TOPIC_CONCURRENCY = "Processing up to {count} topics in parallel"
 MSG_INFO_TOPICS_TO_PROCESS = "Topics to process: {count}"
 MSG_INFO_USING_COMBINED = "Using combined request mode: Fetching all {count} topics in 1 request"
 MSG_INFO_LOADED_CACHED_TOPIC = "Loaded {count} cached article(s) for {name}"
@@ -219,6 +265,8 @@ MSG_DEBUG_SEARCH_QUERY = "Search query: '{query}' (exact phrase only, case-insen
 MSG_DEBUG_API_URL = "API URL: {url}"
 MSG_DEBUG_TOPICS = "Topics: {topics}"
 MSG_DEBUG_COMBINED_QUERY = "Combined query: {query}"
+MSG_DEBUG_NOT_MODIFIED = "Response not modified (HTTP 304), using cached copy"
+MSG_WARNING_HTTP_CACHE_SAVE_FAILED = "Could not save HTTP cache {path}: {error}"
 MSG_OK_ADDED = "✓ Added: {title}"
 MSG_OK_ROUTED = "✓ {title}"
 MSG_DEFAULT_DESCRIPTION = "No description available."
@@ -256,7 +304,7 @@ def load_config() -> Dict:
     try:
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f) or {}
+                config = yaml.load(f, Loader=SafeLoader) or {}
             logger.info(MSG_INFO_LOADED_CONFIG.format(path=CONFIG_FILE))
             return config
         else:
@@ -283,6 +331,13 @@ def get_config_value(config: Dict, path: str, default):
 # DATE RANGE CALCULATION
 # ============================================================================
 
+@functools.lru_cache(maxsize=32)
+def _date_range_for_day(today, lookback_days: int, exclude_today: bool, exclude_offset: int) -> Tuple[str, str]:
+    """Compute (from_date, to_date) for a given UTC day; cached because every topic asks for the same window."""
+    from_day = today - timedelta(days=lookback_days)
+    to_day = today - timedelta(days=exclude_offset) if exclude_today else today
+    return from_day.strftime(DATE_FORMAT), to_day.strftime(DATE_FORMAT)
+
 def calculate_date_range(config: Dict) -> Tuple[str, str]:
     """
     Calculate date range for API query based on configuration.
@@ -292,18 +347,8 @@ def calculate_date_range(config: Dict) -> Tuple[str, str]:
     exclude_today = get_config_value(config, 'date_range.exclude_today', True)
     exclude_offset = get_config_value(config, 'date_range.exclude_today_offset_days', DEFAULT_EXCLUDE_TODAY_OFFSET)
     
-    now_utc = datetime.now(timezone.utc)
-    from_time = now_utc - timedelta(days=lookback_days)
-    
-    if exclude_today:
-        to_time = now_utc - timedelta(days=exclude_offset)
-    else:
-        to_time = now_utc
-    
-    from_time_iso = from_time.strftime(DATE_FORMAT)
-    to_time_iso = to_time.strftime(DATE_FORMAT)
-    
-    return from_time_iso, to_time_iso
+    today_utc = datetime.now(timezone.utc).date()
+    return _date_range_for_day(today_utc, lookback_days, exclude_today, exclude_offset)
 
 # ============================================================================
 # METRICS TRACKING
@@ -321,15 +366,35 @@ class MetricsTracker:
             'articles_saved': 0,
             'api_calls': 0,
             'api_errors': 0,
-            'response_time_ms': []
+            'response_time_ms': array.array('d')  # Packed doubles: 8 bytes per call instead of a float object
         })
+        # API calls can be recorded from page-fetch worker threads, so they update topic_metrics under a lock
+        self._api_calls_lock = threading.Lock()
+    
+    def reset(self):
+        """Clear all recorded metrics and restart the execution timer."""
+        self.start_time = time.time()
+        self.metrics.clear()
+        with self._api_calls_lock:
+            self.topic_metrics.clear()
     
     def record_api_call(self, topic: str, response_time_ms: float, success: bool = True):
         """Record an API call with response time."""
-        self.topic_metrics[topic]['api_calls'] += 1
-        self.topic_metrics[topic]['response_time_ms'].append(response_time_ms)
-        if not success:
-            self.topic_metrics[topic]['api_errors'] += 1
+        with self._api_calls_lock:
+            stats = self.topic_metrics[topic]
+            stats['api_calls'] += 1
+            stats['response_time_ms'].append(response_time_ms)
+            if not success:
+                stats['api_errors'] += 1
+    
+    def merge(self, other: 'MetricsTracker'):
+        """Fold another tracker's per-topic metrics into this one; call it from the thread that owns this tracker."""
+        for topic, stats in other.topic_metrics.items():
+            merged = self.topic_metrics[topic]
+            for key in ('articles_fetched', 'articles_filtered', 'api_calls', 'api_errors'):
+                merged[key] += stats[key]
+            merged['articles_saved'] = stats['articles_saved']
+            merged['response_time_ms'].extend(stats['response_time_ms'])
     
     def record_article_fetched(self, topic: str):
         """Record that an article was fetched from API."""
@@ -347,6 +412,15 @@ class MetricsTracker:
         """Get total execution time in seconds."""
         return time.time() - self.start_time
     
+    @staticmethod
+    def _response_time_stats(response_times: Union[List[float], array.array]) -> Dict[str, float]:
+        """Average, min, max and count of response times (zeros when there are none)."""
+        if not response_times:
+            return {'average': 0, 'min': 0, 'max': 0, 'count': 0}
+        count = len(response_times)
+        return {'average': sum(response_times) / count, 'min': min(response_times),
+                'max': max(response_times), 'count': count}
+    
     def to_dict(self) -> Dict:
         """Convert metrics to dictionary for JSON export."""
         total_time = self.get_total_time()
@@ -357,11 +431,7 @@ class MetricsTracker:
         }
         
         for topic, metrics in self.topic_metrics.items():
-            response_times = metrics['response_time_ms']
-            avg_response_time = (
-                sum(response_times) / len(response_times)
-                if response_times else 0
-            )
+            stats = self._response_time_stats(metrics['response_time_ms'])
             
             result['topics'][topic] = {
                 'api_calls': metrics['api_calls'],
@@ -370,10 +440,10 @@ class MetricsTracker:
                 'articles_filtered': metrics['articles_filtered'],
                 'articles_saved': metrics['articles_saved'],
                 'response_time_stats': {
-                    'average_ms': round(avg_response_time, 2),
-                    'min_ms': round(min(response_times), 2) if response_times else 0,
-                    'max_ms': round(max(response_times), 2) if response_times else 0,
-                    'count': len(response_times)
+                    'average_ms': round(stats['average'], 2),
+                    'min_ms': round(stats['min'], 2),
+                    'max_ms': round(stats['max'], 2),
+                    'count': stats['count']
                 }
             }
         
@@ -385,8 +455,10 @@ class MetricsTracker:
             directory = os.path.dirname(file_path)
             if directory:
                 os.makedirs(directory, exist_ok=True)
+            # Encode in one call and write once; json.dump issues a write per encoder chunk
+            payload = json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+                f.write(payload)
             logger.info(MSG_INFO_METRICS_EXPORTED.format(path=file_path))
             return True
         except Exception as e:
@@ -403,20 +475,17 @@ class MetricsTracker:
         logger.info(f"\nPer-topic metrics:")
         
         for topic, metrics in self.topic_metrics.items():
-            avg_response_time = (
-                sum(metrics['response_time_ms']) / len(metrics['response_time_ms'])
-                if metrics['response_time_ms'] else 0
-            )
+            stats = self._response_time_stats(metrics['response_time_ms'])
             logger.info(f"\n  Topic: {topic}")
             logger.info(f"    API Calls: {metrics['api_calls']}")
             logger.info(f"    API Errors: {metrics['api_errors']}")
             logger.info(f"    Articles Fetched: {metrics['articles_fetched']}")
             logger.info(f"    Articles Filtered: {metrics['articles_filtered']}")
             logger.info(f"    Articles Saved: {metrics['articles_saved']}")
-            if metrics['response_time_ms']:
-                logger.info(f"    Avg Response Time: {avg_response_time:.2f}ms")
-                logger.info(f"    Min Response Time: {min(metrics['response_time_ms']):.2f}ms")
-                logger.info(f"    Max Response Time: {max(metrics['response_time_ms']):.2f}ms")
+            if stats['count']:
+                logger.info(f"    Avg Response Time: {stats['average']:.2f}ms")
+                logger.info(f"    Min Response Time: {stats['min']:.2f}ms")
+                logger.info(f"    Max Response Time: {stats['max']:.2f}ms")
         
         logger.info(f"{METRICS_SEPARATOR}")
 
@@ -436,6 +505,19 @@ def normalize_keywords(keywords: List[str], title_query: str) -> List[str]:
             normalized.append(keyword_lower)
     return normalized
 
+@functools.lru_cache(maxsize=128)
+def _compile_exact_phrase(exact_phrase: str) -> re.Pattern:
+    """Compile the word-boundary, whitespace-tolerant pattern for a phrase once per phrase."""
+    # Escape special regex characters in the phrase
+    escaped_phrase = re.escape(exact_phrase)
+    
+    # For multi-word phrases, replace escaped spaces with \s+ to allow flexible whitespace
+    # but ensure words appear together. Use word boundaries on both sides.
+    # This ensures "Deep Learning" matches "Deep Learning" but not "Deep understanding of Learning"
+    # After re.escape(), spaces are escaped as '\ ', so we replace '\ ' (escaped space) with r'\s+'
+    pattern = r'\b' + escaped_phrase.replace('\\ ', r'\s+') + r'\b'
+    return re.compile(pattern, re.IGNORECASE)
+
 def article_matches_exact_phrase(article: Dict, exact_phrase: str, config: Dict) -> bool:
     """
     Check if article title contains the exact phrase (case-insensitive).
@@ -447,29 +529,25 @@ def article_matches_exact_phrase(article: Dict, exact_phrase: str, config: Dict)
     if not article_title:
         return False
     
-    # Escape special regex characters in the phrase
-    escaped_phrase = re.escape(exact_phrase)
-    
-    # For multi-word phrases, replace escaped spaces with \s+ to allow flexible whitespace
-    # but ensure words appear together. Use word boundaries on both sides.
-    # This ensures "Deep Learning" matches "Deep Learning" but not "Deep understanding of Learning"
-    # After re.escape(), spaces are escaped as '\ ', so we replace '\ ' (escaped space) with r'\s+'
-    pattern = r'\b' + escaped_phrase.replace('\\ ', r'\s+') + r'\b'
-    
-    return bool(re.search(pattern, article_title, re.IGNORECASE))
+    return _compile_exact_phrase(exact_phrase).search(article_title) is not None
+
+@functools.lru_cache(maxsize=128)
+def _compile_keywords(keywords: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Compile a keyword set into one case-insensitive alternation once per set (None if empty)."""
+    if not keywords:
+        return None
+    return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
 
 def article_matches_keywords(article: Dict, keywords: List[str], config: Dict) -> bool:
     """
     Check if article matches any of the related keywords in title or description.
     Returns True if any keyword matches.
     """
-    article_title = article.get("title", "").lower()
-    article_description = (article.get("description", "") or "").lower()
+    pattern = _compile_keywords(tuple(keywords))
+    if pattern is None:
+        return False
     
-    for keyword in keywords:
-        if keyword in article_title or keyword in article_description:
-            return True
-    return False
+    return bool(pattern.search(article.get("title", "")) or pattern.search(article.get("description", "") or ""))
 
 def process_article(article: Dict, exact_phrase: str, seen_urls: set, config: Dict, metrics: MetricsTracker, topic: str, use_exact_phrase: bool = False) -> Optional[Dict]:
     """
@@ -536,6 +614,13 @@ def process_article(article: Dict, exact_phrase: str, seen_urls: set, config: Di
         "source": source_name
     }
 
+def _article_date(item: Dict) -> str:
+    """
+    Sort key for newest-first ordering. YYYY-MM-DD strings sort like the dates they
+    represent, so no parsing is needed; articles without a date sort last.
+    """
+    return item.get("date", "")
+
 # ============================================================================
 # API REQUEST HANDLING
 # ============================================================================
@@ -650,33 +735,40 @@ def _handle_result_limit_error(error_data: Dict, status_code: int, response_time
 
 def _is_rate_limit_error(error_code: str, error_message: str, error_text: str, status_code: Optional[int]) -> bool:
     """Check if error indicates rate limit (quota exhausted) - dynamic detection."""
-    # Check for common rate limit indicators in error messages
-    rate_limit_indicators = [
-        'rate limit',
-        'rate_limit',
-        'quota',
-        'too many requests',
-        'too many calls',
-        'request limit',
-        'api limit exceeded',
-        'throttle',
-        'throttled'
-    ]
-    
-    error_text_lower = error_text.lower()
-    error_message_lower = error_message.lower()
-    
     # Check error message and text for rate limit keywords
-    for indicator in rate_limit_indicators:
-        if indicator in error_message_lower or indicator in error_text_lower:
-            return True
+    if RATE_LIMIT_INDICATOR_PATTERN.search(error_message.lower()) or RATE_LIMIT_INDICATOR_PATTERN.search(error_text.lower()):
+        return True
     
     # Also check for common rate limit error codes
-    rate_limit_codes = ['rateLimitExceeded', 'tooManyRequests', 'quotaExceeded']
-    if error_code.lower() in [code.lower() for code in rate_limit_codes]:
-        return True
+    return error_code.lower() in RATE_LIMIT_ERROR_CODES
+
+def _get_retry_after_delay(response, retry_count: int, config: Dict) -> Optional[float]:
+    """
+    Return seconds to wait before retrying a rate-limited request, or None to give up.
+    Only short-window throttles that send a Retry-After header are retried; quota exhaustion is not.
+    """
+    if retry_count >= get_config_value(config, 'api.max_rate_limit_retries', DEFAULT_MAX_RATE_LIMIT_RETRIES):
+        return None
+    
+    headers = getattr(response, 'headers', None)
+    retry_after = headers.get('Retry-After') if hasattr(headers, 'get') else None
+    if not isinstance(retry_after, str):
+        return None
+    
+    # Retry-After is either delay-seconds or an HTTP-date
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
     
-    return False
+    # Exponential backoff floor plus jitter so concurrent page fetches don't retry in lockstep
+    delay = max(delay, 2 ** retry_count) + random.uniform(0, 1)
+    if delay > get_config_value(config, 'api.max_retry_after_seconds', DEFAULT_MAX_RETRY_AFTER_SECONDS):
+        return None
+    return delay
 
 def _handle_rate_limit_error(http_err: requests.exceptions.HTTPError, status_code: int, response_time_ms: float, config: Dict) -> Tuple[Optional[Dict], float, bool, bool, bool]:
     """Handle rate limit error - quota exhausted (detected dynamically)."""
@@ -720,21 +812,118 @@ def _handle_other_http_error(http_err: requests.exceptions.HTTPError, status_cod
     
     return None, response_time_ms, False, False, False
 
-def make_api_request(url: str, params: Dict, config: Dict, retry_count: int = 0) -> Tuple[Optional[Dict], float, bool, bool, bool]:
+# One keep-alive connection pool for the whole run, so pages 2..N and later topics skip the
+# TCP/TLS handshake. requests does not promise Session is thread-safe; sharing it across the
+# page-fetch and topic threads relies only on (1) urllib3's pool giving each request its own
+# connection, (2) the session's headers/auth/proxies never being changed after this line, and
+# (3) the cookie jar, the one piece of shared state a response can mutate, taking its own lock
+_SESSION = requests.Session()
+atexit.register(_SESSION.close)
+
+_HTTP_CACHE_LOCK = threading.Lock()
+_HTTP_CACHES: Dict[str, Dict[str, Dict]] = {}
+_HTTP_CACHES_DIRTY = set()  # Paths whose in-memory cache has entries not yet written to disk
+
+def _http_cache_key(url: str, params: Dict) -> str:
+    """Cache key for a request; the API key is left out so rotating it keeps cached entries."""
+    request = [url, sorted((k, str(v)) for k, v in params.items() if k != "apiKey")]
+    return hashlib.sha256(json.dumps(request).encode('utf-8')).hexdigest()
+
+def _get_http_cache(path: str) -> Dict[str, Dict]:
+    """Load the conditional-request cache at path once per process; a missing or unreadable file starts empty."""
+    with _HTTP_CACHE_LOCK:
+        cache = _HTTP_CACHES.get(path)
+        if cache is None:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+            if not isinstance(cache, dict):
+                cache = {}
+            _HTTP_CACHES[path] = cache
+        return cache
+
+def _save_http_cache_entry(path: str, key: str, response, body: Dict) -> None:
+    """Remember body with the response's ETag/Last-Modified so the next identical request can be conditional."""
+    entry = {name: response.headers[header] for name, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified'))
+             if response.headers.get(header)}
+    if not entry:
+        return
+    entry['body'] = body
+    with _HTTP_CACHE_LOCK:
+        cache = _HTTP_CACHES.setdefault(path, {})
+        # Re-insert so the dict stays ordered oldest-first for trimming
+        cache.pop(key, None)
+        cache[key] = entry
+        while len(cache) > HTTP_CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+        _HTTP_CACHES_DIRTY.add(path)
+
+def _flush_http_caches() -> None:
+    """Write every conditional-request cache changed this run; called once at the end of main and at exit."""
+    with _HTTP_CACHE_LOCK:
+        for path, cache in _HTTP_CACHES.items():
+            if path not in _HTTP_CACHES_DIRTY:
+                continue
+            try:
+                directory = os.path.dirname(path) or '.'
+                os.makedirs(directory, exist_ok=True)
+                fd, temp_path = _create_temp_file(path, ".", ".tmp")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(cache, f, ensure_ascii=False)
+                    os.replace(temp_path, path)
+                finally:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                _HTTP_CACHES_DIRTY.discard(path)
+            except OSError as e:
+                logger.warning(MSG_WARNING_HTTP_CACHE_SAVE_FAILED.format(path=path, error=e))
+
+atexit.register(_flush_http_caches)
+
+def make_api_request(url: str, params: Dict, config: Dict, retry_count: int = 0,
+                     on_retry: Optional[Callable[[float], bool]] = None) -> Tuple[Optional[Dict], float, bool, bool, bool]:
     """
     Make API request with dynamic error handling.
     Returns (response_data, response_time_ms, success, is_rate_limited, is_result_limit_reached).
     is_rate_limited indicates if we hit rate limit that should stop further requests.
     is_result_limit_reached indicates if we hit a result limit error (free tier 100 result limit per query).
+    A throttled request is only retried when on_retry is given and returns True for the failed
+    attempt's response time (the caller charges the retry to its API budget and metrics there).
     """
     timeout = get_config_value(config, 'api.timeout_seconds', DEFAULT_TIMEOUT_SECONDS)
+    
+    # Conditional request: send the cached validators so an unchanged page comes back as a bodiless 304
+    cache_path = get_config_value(config, 'api.http_cache_file', DEFAULT_HTTP_CACHE_FILE)
+    cache_key = cached = None
+    request_kwargs = {}
+    if cache_path:
+        cache_key = _http_cache_key(url, params)
+        cached = _get_http_cache(cache_path).get(cache_key)
+        if cached:
+            headers = {}
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+            request_kwargs['headers'] = headers
+    
     start_time = time.time()
     
     try:
-        response = requests.get(url, params=params, timeout=timeout)
+        response = _SESSION.get(url, params=params, timeout=timeout, **request_kwargs)
         response_time_ms = (time.time() - start_time) * 1000
         response.raise_for_status()
-        return response.json(), response_time_ms, True, False, False
+        if cached and response.status_code == 304:
+            logger.debug(MSG_DEBUG_NOT_MODIFIED)
+            # Callers may mutate the body, so never hand out the cached object itself
+            return copy.deepcopy(cached['body']), response_time_ms, True, False, False
+        response_data = response.json()
+        if cache_key is not None:
+            _save_http_cache_entry(cache_path, cache_key, response, response_data)
+        return response_data, response_time_ms, True, False, False
     except requests.exceptions.HTTPError as http_err:
         response_time_ms = (time.time() - start_time) * 1000
         status_code = http_err.response.status_code if hasattr(http_err, 'response') else None
@@ -747,34 +936,43 @@ def make_api_request(url: str, params: Dict, config: Dict, retry_count: int = 0)
         # DYNAMIC HANDLING: Detect rate limit and result limit errors for ANY status code
         # Check error message/content to detect rate limit errors, not just specific status codes
         if hasattr(http_err, 'response'):
+            error_data = None
+            error_text_lower = ""
             try:
-                error_data = http_err.response.json()
-                error_code = error_data.get('code', '')
-                error_message = error_data.get('message', '').lower()
-                error_text_lower = str(error_data).lower()
-                
+                parsed = http_err.response.json()
+                error_code = parsed.get('code', '')
+                error_message = parsed.get('message', '').lower()
+                error_text_lower = str(parsed).lower()
+                error_data = parsed
                 # DYNAMIC: Check if error message indicates rate limit (works for any status code)
-                if _is_rate_limit_error(error_code, error_message, error_text_lower, status_code):
-                    return _handle_rate_limit_error(http_err, status_code, response_time_ms, config)
-                
-                # DYNAMIC: Check if error message indicates result limit (works for any status code)
-                if _is_result_limit_error(error_code, error_message, error_text_lower):
-                    return _handle_result_limit_error(error_data, status_code, response_time_ms, config)
+                is_rate_limited = _is_rate_limit_error(error_code, error_message, error_text_lower, status_code)
             except (ValueError, AttributeError, TypeError):
                 error_text = http_err.response.text[:max_error_length] if hasattr(http_err.response, 'text') else ""
                 logger.error(f"{MSG_ERROR_RESPONSE_TEXT}: {error_text}")
                 
                 # DYNAMIC: Check error text for rate limit keywords even if JSON parsing fails
-                if error_text:
-                    error_text_lower = error_text.lower()
-                    if _is_rate_limit_error('', '', error_text_lower, status_code):
-                        logger.info(f"Dynamic error handling: Rate limit detected in error text (HTTP {status_code})")
-                        return _handle_rate_limit_error(http_err, status_code, response_time_ms, config)
-                    
-                    # Check error text for result limit keywords even if JSON parsing fails
-                    if '100 results' in error_text_lower or 'result limit' in error_text_lower or 'max of 100' in error_text_lower:
-                        logger.info(f"{MSG_INFO_DYNAMIC_RESULT_LIMIT_TEXT}. {MSG_INFO_FREE_TIER_ALLOWS}")
-                        return None, response_time_ms, False, False, True
+                error_text_lower = error_text.lower()
+                is_rate_limited = bool(error_text) and _is_rate_limit_error('', '', error_text_lower, status_code)
+                if is_rate_limited:
+                    logger.info(f"Dynamic error handling: Rate limit detected in error text (HTTP {status_code})")
+            
+            # Retry a throttled request the same way whether or not the error body was JSON
+            if is_rate_limited:
+                retry_delay = _get_retry_after_delay(http_err.response, retry_count, config) if on_retry else None
+                if retry_delay is not None and on_retry(response_time_ms):
+                    logger.info(MSG_INFO_RATE_LIMIT_RETRY.format(delay=retry_delay, attempt=retry_count + 1))
+                    time.sleep(retry_delay)
+                    return make_api_request(url, params, config, retry_count + 1, on_retry)
+                return _handle_rate_limit_error(http_err, status_code, response_time_ms, config)
+            
+            # DYNAMIC: Check if error message indicates result limit (works for any status code)
+            if error_data is not None:
+                if _is_result_limit_error(error_code, error_message, error_text_lower):
+                    return _handle_result_limit_error(error_data, status_code, response_time_ms, config)
+            # Check error text for result limit keywords even if JSON parsing fails
+            elif '100 results' in error_text_lower or 'result limit' in error_text_lower or 'max of 100' in error_text_lower:
+                logger.info(f"{MSG_INFO_DYNAMIC_RESULT_LIMIT_TEXT}. {MSG_INFO_FREE_TIER_ALLOWS}")
+                return None, response_time_ms, False, False, True
         
         # Handle other HTTP errors
         return _handle_other_http_error(http_err, status_code, response_time_ms, config)
@@ -784,12 +982,52 @@ def make_api_request(url: str, params: Dict, config: Dict, retry_count: int = 0)
         logger.error(f"{MSG_ERROR_TRACEBACK}: {traceback.format_exc()}")
         return None, response_time_ms, False, False, False
 
-def fetch_articles_page(url: str, params: Dict, page: int, config: Dict, metrics: MetricsTracker, topic: str) -> Tuple[Optional[Dict], bool, bool, bool]:
+class TokenBucket:
+    """Thread-safe token bucket: refills at `rate` tokens per second up to `capacity`."""
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available. Returns the seconds waited.
+        The token is claimed under the lock before sleeping, so concurrent callers queue up
+        one interval apart instead of all waking at once.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+_TOKEN_BUCKETS_LOCK = threading.Lock()
+_TOKEN_BUCKETS: Dict[Tuple[float, int], TokenBucket] = {}
+
+def _get_token_bucket(rate: float, capacity: int) -> TokenBucket:
+    """Process-wide bucket for a (rate, capacity) setting, shared by every topic and page thread."""
+    with _TOKEN_BUCKETS_LOCK:
+        bucket = _TOKEN_BUCKETS.get((rate, capacity))
+        if bucket is None:
+            bucket = _TOKEN_BUCKETS[(rate, capacity)] = TokenBucket(rate, capacity)
+        return bucket
+
+def fetch_articles_page(url: str, params: Dict, page: int, config: Dict, metrics: MetricsTracker, topic: str, *,
+                        api_budget: Optional[Tuple[Dict, int]] = None) -> Tuple[Optional[Dict], bool, bool, bool]:
     """
     Fetch a single page of articles from NewsAPI with rate limiting.
     Returns (response_data, success, is_rate_limited, is_result_limit_reached).
     is_rate_limited indicates if we hit a rate limit error that should stop further requests (detected dynamically).
     is_result_limit_reached indicates if we hit a result limit error (free tier 100 result limit per query).
+    api_budget is the run's (api_call_count, max_api_calls); Retry-After retries are only made when it
+    is given, and each one reserves a call from it and is recorded like any other request.
     """
     # Apply rate limiting delay (except for first page)
     if page > 1:
@@ -798,13 +1036,33 @@ def fetch_articles_page(url: str, params: Dict, page: int, config: Dict, metrics
             logger.info(MSG_INFO_RATE_LIMITING.format(delay=delay))
             time.sleep(delay)
     
-    page_params = params.copy()
-    page_params["page"] = page
+    # Smooth bursts from concurrent topics/pages to a steady rate the API accepts, rather than eating 429s
+    max_rate = get_config_value(config, 'api.max_requests_per_second', DEFAULT_MAX_REQUESTS_PER_SECOND)
+    if max_rate > 0:
+        burst = get_config_value(config, 'api.request_burst', DEFAULT_REQUEST_BURST)
+        _get_token_bucket(max_rate, burst).acquire()
     
-    safe_params = {k: v for k, v in page_params.items() if k != "apiKey"}
-    logger.debug(MSG_DEBUG_FETCHING_PAGE.format(page=page, params=safe_params))
+    # params is built once per topic by build_api_params; only the page number varies
+    page_params = {**params, "page": page}
     
-    response_data, response_time_ms, success, is_rate_limited, is_result_limit_reached = make_api_request(url, page_params, config)
+    if logger.isEnabledFor(logging.DEBUG):
+        safe_params = {k: v for k, v in page_params.items() if k != "apiKey"}
+        logger.debug(MSG_DEBUG_FETCHING_PAGE.format(page=page, params=safe_params))
+    
+    on_retry = None
+    if api_budget is not None:
+        api_call_count, max_api_calls = api_budget
+        
+        def on_retry(failed_time_ms: float) -> bool:
+            """Charge the retry to the shared budget and record the throttled attempt."""
+            if not _reserve_api_calls(api_call_count, max_api_calls):
+                return False
+            metrics.record_api_call(topic, failed_time_ms, False)
+            return True
+    
+    response_data, response_time_ms, success, is_rate_limited, is_result_limit_reached = make_api_request(
+        url, page_params, config, on_retry=on_retry
+    )
     metrics.record_api_call(topic, response_time_ms, success)
     
     return response_data, success, is_rate_limited, is_result_limit_reached
@@ -813,6 +1071,24 @@ def fetch_articles_page(url: str, params: Dict, page: int, config: Dict, metrics
 # NEWS FETCHING (MAIN LOGIC)
 # ============================================================================
 
+_API_BUDGET_LOCK = threading.Lock()
+
+def _reserve_api_calls(api_call_count: Dict, max_api_calls: int, requested: int = 1) -> int:
+    """
+    Atomically take up to `requested` calls from the shared API budget.
+    Returns the number of calls granted (0 once the budget is spent).
+    """
+    with _API_BUDGET_LOCK:
+        granted = max(0, min(requested, max_api_calls - api_call_count['total']))
+        api_call_count['total'] += granted
+    return granted
+
+def _refund_api_calls(api_call_count: Dict, count: int):
+    """Return unused calls to the shared API budget."""
+    if count:
+        with _API_BUDGET_LOCK:
+            api_call_count['total'] -= count
+
 def _validate_api_request(api_key: str, api_call_count: Dict, max_api_calls: int, context: str = "") -> bool:
     """Validate that API key exists and we haven't exceeded call limits."""
     if not api_key:
@@ -880,11 +1156,66 @@ def _log_processed_articles(articles: List[Dict], config: Dict, prefix: str = ""
     for item in articles[:debug_limit]:
         logger.info(f"{prefix}{MSG_OK_ADDED.format(title=item['title'][:max_title_length])}")
 
-def fetch_from_newsapi(topic: str, api_key: str, config: Dict, metrics: MetricsTracker, api_call_count: Dict) -> Tuple[List[Dict], bool]:
+def _iter_pages(url: str, params: Dict, pages: range, config: Dict, metrics: MetricsTracker, topic: str,
+                api_call_count: Dict, max_api_calls: int) -> Iterator[Tuple[int, Tuple[Optional[Dict], bool, bool, bool]]]:
+    """
+    Yield (page, fetch_articles_page result) for each page in order while API calls remain.
+    With api.page_fetch_concurrency > 1, up to that many pages are kept in flight: each time a
+    page is handed back another is requested, so one slow response does not stall a whole batch.
+    With api.prefetch_next_page, the window is topped up before the current page is yielded,
+    so the next HTTP round-trip overlaps article processing.
+    Pages fetched ahead of an early stop are counted against the API budget but discarded.
+    """
+    concurrency = max(1, get_config_value(config, 'api.page_fetch_concurrency', DEFAULT_PAGE_FETCH_CONCURRENCY))
+    prefetch = get_config_value(config, 'api.prefetch_next_page', DEFAULT_PREFETCH_NEXT_PAGE)
+    pages = list(pages)
+    executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 or prefetch else None
+    in_flight = deque()
+    next_index = 0
+    
+    def fetch(page):
+        return fetch_articles_page(url, params, page, config, metrics, topic, api_budget=(api_call_count, max_api_calls))
+    
+    def fill() -> bool:
+        """Reserve API calls and request pages until the window is full; False once the budget runs out."""
+        nonlocal next_index
+        wanted = min(concurrency - len(in_flight), len(pages) - next_index)
+        if wanted <= 0:
+            return True
+        # Reserve API calls before each request (or batch of requests)
+        granted = _reserve_api_calls(api_call_count, max_api_calls, wanted)
+        if not granted:
+            logger.warning(f"{MSG_WARNING_API_LIMIT_REACHED}. Stopping pagination at page {pages[next_index] - 1}.")
+            return False
+        for page in pages[next_index:next_index + granted]:
+            in_flight.append((page, executor.submit(fetch, page) if executor else None))
+        next_index += granted
+        return True
+    
+    try:
+        can_fill = fill()
+        while in_flight:
+            page, handle = in_flight.popleft()
+            result = handle.result() if handle is not None else fetch(page)
+            if prefetch and can_fill:
+                can_fill = fill()
+            yield page, result
+            if not prefetch and can_fill:
+                can_fill = fill()
+    finally:
+        # Stopped early: refund requested pages that never left the queue
+        _refund_api_calls(api_call_count, sum(handle.cancel() for _, handle in in_flight if handle is not None))
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+def fetch_from_newsapi(topic: str, api_key: str, config: Dict, metrics: MetricsTracker, api_call_count: Dict,
+                       known_urls: Optional[set] = None) -> Tuple[List[Dict], bool]:
     """
     Fetch news from NewsAPI.org with pagination support.
     Returns (list of processed news articles, is_rate_limited).
     is_rate_limited indicates if we hit rate limit and should stop processing more topics.
+    known_urls (e.g. URLs already cached on disk) are skipped as duplicates, so early stopping
+    kicks in once pages only repeat what we already have.
     Note: Result limit errors are handled dynamically - we stop pagination but continue with other topics.
     """
     # Validate API request
@@ -914,7 +1245,7 @@ def fetch_from_newsapi(topic: str, api_key: str, config: Dict, metrics: MetricsT
     params = build_api_params(topic_config, date_range, api_key, config)
     
     news_items = []
-    seen_urls = set()
+    seen_urls = set(known_urls) if known_urls else set()
     page = 1
     # Dynamic pagination: Try to fetch multiple pages, but gracefully handle result limit errors if they occur
     # If free_tier_mode is enabled, limit to 1 page to avoid result limit errors proactively
@@ -938,14 +1269,15 @@ def fetch_from_newsapi(topic: str, api_key: str, config: Dict, metrics: MetricsT
     logger.info(f"{MSG_INFO_MAX_PAGES}: {max_pages} (max {max_pages} API requests for this topic)")
     
     try:
-        # Check if we can make the request
-        if api_call_count['total'] >= max_api_calls:
+        # Reserve the first page call (fails once the shared budget is spent)
+        if not _reserve_api_calls(api_call_count, max_api_calls):
             logger.warning(f"{MSG_WARNING_API_LIMIT_REACHED}. Skipping {topic}.")
             return [], False
         
         # Fetch first page
-        api_call_count['total'] += 1
-        response_data, success, is_rate_limited, is_result_limit_reached = fetch_articles_page(url, params, page, config, metrics, topic)
+        response_data, success, is_rate_limited, is_result_limit_reached = fetch_articles_page(
+            url, params, page, config, metrics, topic, api_budget=(api_call_count, max_api_calls)
+        )
         
         # Process API response
         response_data, should_stop = _process_api_response(response_data, success, is_rate_limited, is_result_limit_reached, page)
@@ -982,15 +1314,8 @@ def fetch_from_newsapi(topic: str, api_key: str, config: Dict, metrics: MetricsT
             logger.info(f"{MSG_INFO_FETCHING_ADDITIONAL} (up to {total_pages} total pages)")
             logger.info(MSG_INFO_EARLY_STOPPING.format(min=min_articles_per_topic, threshold=int(early_stop_duplicate_threshold * 100)))
             
-            for page_num in range(2, total_pages + 1):
-                # Check API call limit before each request
-                if api_call_count['total'] >= max_api_calls:
-                    logger.warning(f"{MSG_WARNING_API_LIMIT_REACHED}. Stopping pagination at page {page_num - 1}.")
-                    break
-                
-                api_call_count['total'] += 1
-                response_data, success, is_rate_limited, is_result_limit_reached = fetch_articles_page(url, params, page_num, config, metrics, topic)
-                
+            pages = _iter_pages(url, params, range(2, total_pages + 1), config, metrics, topic, api_call_count, max_api_calls)
+            for page_num, (response_data, success, is_rate_limited, is_result_limit_reached) in pages:
                 if is_rate_limited:
                     logger.error(MSG_ERROR_RATE_LIMIT_HIT)
                     return news_items, True
@@ -1034,7 +1359,7 @@ def fetch_from_newsapi(topic: str, api_key: str, config: Dict, metrics: MetricsT
                         break
         
         # Sort by date (newest first)
-        news_items.sort(key=lambda x: x.get("date", ""), reverse=True)
+        news_items.sort(key=_article_date, reverse=True)
         
         # Log processed articles
         _log_processed_articles(news_items, config, "      ")
@@ -1061,21 +1386,18 @@ def fetch_combined_from_newsapi(topics_config: Dict[str, Dict], api_key: str, co
     date_range = calculate_date_range(config)
     from_date, to_date = date_range
     
-    # Build combined query
-    topic_names = [topic_config.get("name", topic) for topic, topic_config in topics_config.items()]
-    title_queries = [topic_config.get("title_query", "") for topic_config in topics_config.values()]
-    combined_query = " OR ".join([f'"{q}"' for q in title_queries if q])
-    
-    logger.info(MSG_INFO_COMBINED_REQUEST.format(count=len(topics_config)))
-    logger.debug(MSG_DEBUG_TOPICS.format(topics=', '.join(topic_names)))
-    logger.debug(MSG_DEBUG_FETCHING_FROM.format(from_date=from_date, to_date=to_date))
-    logger.debug(MSG_DEBUG_COMBINED_QUERY.format(query=combined_query))
-    logger.debug(MSG_DEBUG_API_URL.format(url=get_config_value(config, 'api.base_url', NEWSAPI_BASE_URL)))
-    
-    # Build API parameters
+    # Build API parameters; the OR query is built once here and reused for logging
     url = get_config_value(config, 'api.base_url', NEWSAPI_BASE_URL)
     params = build_combined_api_params(topics_config, date_range, api_key, config)
     
+    logger.info(MSG_INFO_COMBINED_REQUEST.format(count=len(topics_config)))
+    if logger.isEnabledFor(logging.DEBUG):
+        topic_names = [topic_config.get("name", topic) for topic, topic_config in topics_config.items()]
+        logger.debug(MSG_DEBUG_TOPICS.format(topics=', '.join(topic_names)))
+        logger.debug(MSG_DEBUG_FETCHING_FROM.format(from_date=from_date, to_date=to_date))
+        logger.debug(MSG_DEBUG_COMBINED_QUERY.format(query=params["qInTitle"]))
+        logger.debug(MSG_DEBUG_API_URL.format(url=url))
+    
     # Initialize result dictionary - one list per topic
     topic_articles = {topic: [] for topic in topics_config.keys()}
     seen_urls = {topic: set() for topic in topics_config.keys()}  # Track seen URLs per topic
@@ -1087,16 +1409,15 @@ def fetch_combined_from_newsapi(topics_config: Dict[str, Dict], api_key: str, co
     logger.info(MSG_INFO_COMBINED_MODE)
     
     try:
-        # Check if we can make the request
-        if api_call_count['total'] >= max_api_calls:
+        # Reserve the request call (fails once the shared budget is spent)
+        if not _reserve_api_calls(api_call_count, max_api_calls):
             logger.warning(f"{MSG_WARNING_API_LIMIT_REACHED}. Skipping combined request.")
             return topic_articles, False
         
         # Fetch first page
-        api_call_count['total'] += 1
         # Track combined-request API metrics under a dedicated bucket
         response_data, success, is_rate_limited, is_result_limit_reached = fetch_articles_page(
-            url, params, page, config, metrics, COMBINED_METRICS_TOPIC
+            url, params, page, config, metrics, COMBINED_METRICS_TOPIC, api_budget=(api_call_count, max_api_calls)
         )
         
         # Process API response
@@ -1134,7 +1455,7 @@ def fetch_combined_from_newsapi(topics_config: Dict[str, Dict], api_key: str, co
         
         # Sort articles by date (newest first) for each topic
         for topic in topics_config.keys():
-            topic_articles[topic].sort(key=lambda x: x.get("date", ""), reverse=True)
+            topic_articles[topic].sort(key=_article_date, reverse=True)
         
         # Log summary per topic
         logger.info(MSG_INFO_ARTICLES_ROUTED)
@@ -1157,30 +1478,86 @@ def fetch_combined_from_newsapi(topics_config: Dict[str, Dict], api_key: str, co
 # FILE OPERATIONS
 # ============================================================================
 
-def filter_articles_by_retention(news_items: List[Dict], retention_days: int) -> List[Dict]:
+def _create_temp_file(target_path: str, prefix: str, suffix: str) -> Tuple[int, str]:
+    """
+    Create a uniquely named temp file next to target_path for an atomic os.replace.
+    Unlike tempfile.mkstemp (always 0600) it is opened with 0666, so the umask applies as for any
+    new file; if target_path already exists its mode is copied over instead.
+    Returns (fd, temp_path).
+    """
+    directory = os.path.dirname(target_path) or '.'
+    temp_path = os.path.join(directory, f"{prefix}{os.urandom(8).hex()}{suffix}")
+    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        os.chmod(temp_path, os.stat(target_path).st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        os.close(fd)
+        os.remove(temp_path)
+        raise
+    return fd, temp_path
+
+def _retention_cutoff(retention_days: int) -> Optional[str]:
+    """Return the oldest date string kept by the retention period, or None when retention is disabled."""
+    if retention_days <= 0:
+        return None
+    return (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime(DATE_FORMAT)
+
+def _within_retention(item: Dict, cutoff_str: Optional[str]) -> bool:
+    """Check whether an article survives the retention cutoff."""
+    if cutoff_str is None:
+        return True
+    article_date_str = item.get("date", "")
+    if not article_date_str:
+        return False
+    if not isinstance(article_date_str, str) or not ISO_DATE_PATTERN.fullmatch(article_date_str):
+        # If the date is not YYYY-MM-DD, keep the article (better to show than hide)
+        return True
+    # Zero-padded YYYY-MM-DD strings order the same as the dates they represent,
+    # so compare strings against the cutoff instead of parsing every article date
+    return article_date_str >= cutoff_str
+
+def _count_dated_on_or_after(news_items: List[Dict], cutoff_str: str) -> int:
+    """Binary-search a newest-first list for the number of leading items dated on/after the cutoff."""
+    low, high = 0, len(news_items)
+    while low < high:
+        mid = (low + high) // 2
+        if news_items[mid].get("date", "") >= cutoff_str:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+def _is_iso_sorted_newest_first(news_items: List[Dict]) -> bool:
+    """Check every item has a YYYY-MM-DD string date and the list is in newest-first order."""
+    previous = None
+    for item in news_items:
+        date_str = item.get("date")
+        if not isinstance(date_str, str) or not ISO_DATE_PATTERN.fullmatch(date_str):
+            return False
+        if previous is not None and date_str > previous:
+            return False
+        previous = date_str
+    return True
+
+def filter_articles_by_retention(news_items: List[Dict], retention_days: int, presorted: bool = False) -> List[Dict]:
     """
     Filter out articles older than the retention period.
+    Pass presorted=True for lists already sorted by date (newest first, as saved by update_news_file)
+    to binary-search the cutoff; it falls back to checking every article if the order or a date is off.
     Returns list of articles within the retention period.
     """
     if not news_items or retention_days <= 0:
         return news_items
     
-    cutoff_date = (datetime.now(timezone.utc) - timedelta(days=retention_days)).date()
-    filtered_items = []
-    
-    for item in news_items:
-        article_date_str = item.get("date", "")
-        if not article_date_str:
-            continue
-        
-        try:
-            # Parse date string (format: YYYY-MM-DD)
-            article_date = datetime.strptime(article_date_str, DATE_FORMAT).date()
-            if article_date >= cutoff_date:
-                filtered_items.append(item)
-        except (ValueError, TypeError):
-            # If date parsing fails, keep the article (better to show than hide)
-            filtered_items.append(item)
+    cutoff_str = _retention_cutoff(retention_days)
+    if presorted and _is_iso_sorted_newest_first(news_items):
+        # Every date is comparable and ordered, so everything past the split is expired
+        filtered_items = news_items[:_count_dated_on_or_after(news_items, cutoff_str)]
+    else:
+        # Hand-edited files may hold unquoted YAML dates or be out of order; scan every article
+        filtered_items = [item for item in news_items if _within_retention(item, cutoff_str)]
     
     removed_count = len(news_items) - len(filtered_items)
     if removed_count > 0:
@@ -1188,12 +1565,19 @@ def filter_articles_by_retention(news_items: List[Dict], retention_days: int) ->
     
     return filtered_items
 
+def _keep_newer(articles_dict: Dict[str, Dict], url: str, article: Dict) -> None:
+    """Store article under url unless the article already there is newer (ties go to the incoming article)."""
+    previous = articles_dict.get(url)
+    if previous is None or article.get("date", "") >= previous.get("date", ""):
+        articles_dict[url] = article
+
 def merge_news_articles(existing_articles: List[Dict], new_articles: List[Dict]) -> List[Dict]:
     """
     Merge new articles with existing articles, removing duplicates by URL.
+    On a URL collision the article with the newer date wins (ties go to the new article).
     Returns merged list sorted by date (newest first).
     """
-    # Create a dictionary keyed by URL for fast lookup
+    # Single pass into a dictionary keyed by URL
     articles_dict = {}
     
     # Add existing articles first (preserve older articles)
@@ -1202,57 +1586,99 @@ def merge_news_articles(existing_articles: List[Dict], new_articles: List[Dict])
         if url:
             articles_dict[url] = article
     
-    # Add/update with new articles (newer articles take precedence)
+    # Add/update with new articles unless the cached copy is newer
     for article in new_articles:
         url = article.get("url", "")
         if url:
-            articles_dict[url] = article
+            _keep_newer(articles_dict, url, article)
     
-    # Convert back to list and sort by date
     merged_articles = list(articles_dict.values())
-    merged_articles.sort(key=lambda x: x.get("date", ""), reverse=True)
+    merged_articles.sort(key=_article_date, reverse=True)
+    
+    return merged_articles
+
+def merge_and_filter(existing_articles: List[Dict], new_articles: List[Dict], retention_days: int) -> List[Dict]:
+    """
+    Merge and retention-filter in a single pass, dropping stale articles before they enter the merge.
+    Same result as filter_articles_by_retention(merge_news_articles(...)) without the intermediate list.
+    Returns list sorted by date (newest first).
+    """
+    cutoff_str = _retention_cutoff(retention_days)
+    articles_dict = {}
+    stale_urls = set()
+    
+    for article in existing_articles:
+        url = article.get("url", "")
+        if not url:
+            continue
+        if _within_retention(article, cutoff_str):
+            articles_dict[url] = article
+        else:
+            stale_urls.add(url)
     
+    for article in new_articles:
+        url = article.get("url", "")
+        if not url:
+            continue
+        if not _within_retention(article, cutoff_str):
+            stale_urls.add(url)
+            continue
+        _keep_newer(articles_dict, url, article)
+    
+    removed_count = len(stale_urls.difference(articles_dict))
+    if removed_count > 0:
+        logger.info(MSG_INFO_REMOVED_ARTICLES.format(count=removed_count, days=retention_days))
+    
+    merged_articles = list(articles_dict.values())
+    merged_articles.sort(key=_article_date, reverse=True)
     return merged_articles
 
 def merge_filter_and_save_articles(topic: str, topic_config: Dict, existing_articles: List[Dict], 
-                                   new_articles: List[Dict], config: Dict, metrics: MetricsTracker) -> Tuple[bool, int]:
+                                   new_articles: List[Dict], config: Dict, metrics: MetricsTracker,
+                                   api_failed: bool = False) -> Tuple[bool, int]:
     """
     Shared function to merge existing and new articles, filter by retention, and save to file.
     Handles all the common logic for both individual and combined request modes.
+    api_failed marks a request that errored or was rate limited, as opposed to one that only found nothing new.
     
     Returns (success, article_count) where article_count is the number of articles saved/preserved.
     """
+    retention_days = get_config_value(config, 'date_range.retention_days', DEFAULT_RETENTION_DAYS)
+    
     # Merge existing articles with new articles (remove duplicates by URL)
     # IMPORTANT: If API failed and we have cached articles, preserve them!
     if existing_articles and new_articles:
-        # Both exist - merge them
-        merged_articles = merge_news_articles(existing_articles, new_articles)
-        logger.info(MSG_INFO_MERGED_ARTICLES.format(existing=len(existing_articles), new=len(new_articles), total=len(merged_articles)))
-    elif existing_articles:
-        # API failed but we have cached articles - use them!
-        merged_articles = existing_articles
-        logger.info(MSG_INFO_API_FAILED_CACHED.format(count=len(existing_articles)))
-    elif new_articles:
-        # Only new articles (no cached)
-        merged_articles = new_articles
-        logger.info(MSG_INFO_USING_NEW.format(count=len(new_articles)))
+        # Both exist - merge them, dropping expired articles in the same pass
+        filtered_articles = merge_and_filter(existing_articles, new_articles, retention_days)
+        logger.info(MSG_INFO_MERGED_ARTICLES.format(existing=len(existing_articles), new=len(new_articles), total=len(filtered_articles)))
     else:
-        merged_articles = []
+        if existing_articles:
+            # Nothing new (API failed, skipped, or only returned cached URLs) - use the cached articles
+            merged_articles = existing_articles
+            message = MSG_INFO_API_FAILED_CACHED if api_failed else MSG_INFO_NO_NEW_USING_CACHED
+            logger.info(message.format(count=len(existing_articles)))
+        elif new_articles:
+            # Only new articles (no cached)
+            merged_articles = new_articles
+            logger.info(MSG_INFO_USING_NEW.format(count=len(new_articles)))
+        else:
+            merged_articles = []
+        
+        # Filter articles by retention period (remove articles older than retention_days);
+        # cached-only lists come straight from disk, which update_news_file keeps newest-first
+        presorted = merged_articles is existing_articles
+        filtered_articles = filter_articles_by_retention(merged_articles, retention_days, presorted) if merged_articles else []
     
-    # Filter articles by retention period (remove articles older than retention_days)
-    retention_days = get_config_value(config, 'date_range.retention_days', DEFAULT_RETENTION_DAYS)
-    if merged_articles:
-        filtered_articles = filter_articles_by_retention(merged_articles, retention_days)
+    if existing_articles or new_articles:
         logger.info(MSG_INFO_AFTER_RETENTION.format(days=retention_days, count=len(filtered_articles)))
-    else:
-        filtered_articles = []
     
     # Save the merged and filtered articles
     # IMPORTANT: Don't overwrite with empty list if we have cached articles!
     try:
         # Only save if we have articles OR if this is a fresh start (no cached articles)
         if filtered_articles or not existing_articles:
-            success = update_news_file(topic, filtered_articles)
+            max_saved = get_config_value(config, 'article_processing.max_saved_articles', DEFAULT_MAX_SAVED_ARTICLES)
+            success = update_news_file(topic, filtered_articles, max_saved)
             if success:
                 metrics.record_article_saved(topic, len(filtered_articles))
                 if filtered_articles:
@@ -1276,10 +1702,11 @@ def merge_filter_and_save_articles(topic: str, topic_config: Dict, existing_arti
             return True, len(existing_articles)
         return False, 0
 
-def update_news_file(topic: str, news_items: List[Dict]) -> bool:
+def update_news_file(topic: str, news_items: List[Dict], top_n: Optional[int] = None) -> bool:
     """
     Update the YAML file for a specific topic with new news items.
-    News items are sorted by date (newest first) before saving.
+    News items are sorted by date (newest first) before saving; with top_n, only the newest
+    top_n are kept (the list is trimmed in place, so callers see what was saved).
     """
     try:
         file_path = os.path.join(DATA_DIR, f"{topic}.yml")
@@ -1288,17 +1715,39 @@ def update_news_file(topic: str, news_items: List[Dict]) -> bool:
         os.makedirs(DATA_DIR, exist_ok=True)
         
         # Sort by date (newest first) to ensure latest news appears at top
-        if news_items:
-            news_items.sort(key=lambda x: x.get("date", ""), reverse=True)
+        if top_n and len(news_items) > top_n:
+            # Heap selection of the newest top_n instead of sorting everything (stable for equal dates)
+            news_items[:] = heapq.nlargest(top_n, news_items, key=_article_date)
+        elif news_items:
+            news_items.sort(key=_article_date, reverse=True)
         
         # Prepare data structure
         data = {
             "news_items": news_items if news_items else []
         }
         
-        # Write to YAML file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        content = yaml.dump(data, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True, sort_keys=False).encode('utf-8')
+        
+        # Skip the write entirely when the file on disk already has this exact content
+        try:
+            if os.path.getsize(file_path) == len(content):
+                with open(file_path, 'rb') as f:
+                    if f.read() == content:
+                        logger.info(MSG_INFO_UNCHANGED.format(path=file_path, count=len(news_items)))
+                        return True
+        except OSError:
+            pass
+        
+        # Write to a temp file in the same directory and swap it in atomically,
+        # so a failed or interrupted write never leaves a truncated topic file
+        fd, temp_path = _create_temp_file(file_path, f".{topic}.", ".yml.tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
         
         logger.info(MSG_OK_UPDATED.format(path=file_path, count=len(news_items)))
         return True
@@ -1311,6 +1760,13 @@ def update_news_file(topic: str, news_items: List[Dict]) -> bool:
 # FALLBACK HELPERS
 # -----------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=256)
+def _load_news_items_cached(file_path: str, mtime_ns: int, size: int) -> Tuple[Dict, ...]:
+    """Parse a topic YAML file; cached per (path, mtime, size) so unchanged files are parsed once."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=SafeLoader) or {}
+    return tuple(data.get("news_items") or [])
+
 def load_existing_news(topic: str, return_status: bool = False) -> Union[List[Dict], Tuple[List[Dict], bool]]:
     """
     Load existing news items from disk for a topic.
@@ -1322,9 +1778,9 @@ def load_existing_news(topic: str, return_status: bool = False) -> Union[List[Di
         return ([], True) if return_status else []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-        news_items = data.get("news_items") or []
+        stat = os.stat(file_path)
+        # Copy out of the cache so callers can sort/mutate freely
+        news_items = [dict(item) for item in _load_news_items_cached(file_path, stat.st_mtime_ns, stat.st_size)]
         if news_items:
             logger.info(MSG_INFO_LOADED_CACHED.format(count=len(news_items)))
         return (news_items, True) if return_status else news_items
@@ -1360,14 +1816,17 @@ def process_topic(topic: str, topic_config: Dict, api_key: str, config: Dict, me
             logger.info(f"   {MSG_INFO_LOADED_CACHED.format(count=len(existing_articles))}")
         new_articles = []
         is_rate_limited = False
+        api_failed = False
         
         # Try to fetch from NewsAPI if key is available and we haven't hit rate limit
         rate_limited = rate_limited_flag.get('value', False) if rate_limited_flag else False
         if api_key and not rate_limited:
             try:
-                new_articles, is_rate_limited = fetch_from_newsapi(topic, api_key, config, metrics, api_call_count)
+                cached_urls = {article.get("url") for article in existing_articles if article.get("url")}
+                new_articles, is_rate_limited = fetch_from_newsapi(topic, api_key, config, metrics, api_call_count, cached_urls)
                 if is_rate_limited:
                     # Rate limit hit - quota exhausted, stop making API calls
+                    api_failed = True
                     if rate_limited_flag:
                         rate_limited_flag['value'] = True
                     logger.warning(MSG_WARNING_RATE_LIMIT_DETECTED)
@@ -1381,6 +1840,7 @@ def process_topic(topic: str, topic_config: Dict, api_key: str, config: Dict, me
                     logger.warning(f"{MSG_WARNING_NO_NEW_ARTICLES} for {topic}")
             except Exception as fetch_err:
                 logger.error(f"{MSG_ERROR_FETCH_FAILED} for {topic}: {fetch_err}")
+                api_failed = True
                 # Continue with existing articles if fetch fails
                 if not existing_articles:
                     return False, False
@@ -1391,7 +1851,7 @@ def process_topic(topic: str, topic_config: Dict, api_key: str, config: Dict, me
         
         # Merge, filter, and save articles using shared function
         success, article_count = merge_filter_and_save_articles(
-            topic, topic_config, existing_articles, new_articles, config, metrics
+            topic, topic_config, existing_articles, new_articles, config, metrics, api_failed
         )
         if not success:
             return False, is_rate_limited
@@ -1403,6 +1863,67 @@ def process_topic(topic: str, topic_config: Dict, api_key: str, config: Dict, me
         logger.error(f"{MSG_ERROR_TRACEBACK}: {traceback.format_exc()}")
         return False, False
 
+def _log_rate_limit_banner(remaining_topics: int):
+    """Log the quota-exhausted banner shown once when individual topic requests hit the rate limit."""
+    logger.warning(f"\n" + "=" * 70)
+    logger.warning(MSG_WARNING_RATE_LIMIT_QUOTA_EXHAUSTED)
+    logger.warning("=" * 70)
+    if remaining_topics > 0:
+        logger.info(MSG_INFO_REMAINING_CACHED.format(count=remaining_topics))
+    logger.info(MSG_INFO_QUOTA_INFO)
+    logger.info(f"   - {MSG_INFO_FREE_TIER_12H}")
+    logger.info(f"   - {MSG_INFO_FREE_TIER_24H}")
+    logger.info(MSG_INFO_NEXT_SUCCESSFUL)
+    logger.info(MSG_INFO_CACHED_AVAILABLE_SERVED)
+    logger.warning("=" * 70 + "\n")
+
+def _process_topics_concurrently(topics_list: List[Tuple[str, Dict]], api_key: str, config: Dict, metrics: MetricsTracker,
+                                 api_call_count: Dict, rate_limited_flag: Dict, concurrency: int) -> int:
+    """
+    Run process_topic for up to `concurrency` topics at once, so their API round-trips overlap.
+    No delay is added between topics. As in the sequential loop, no new topic is started once
+    max_api_calls is spent, and the rate-limit banner is logged once. Each topic records into its
+    own MetricsTracker, folded into `metrics` here as it finishes. Returns the number of topics that failed.
+    """
+    max_api_calls = get_config_value(config, 'api.max_api_calls', DEFAULT_MAX_API_CALLS)
+    error_count = 0
+    started = 0
+    finished = 0
+    banner_shown = False
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(topics_list))) as executor:
+        while True:
+            # Start topics lazily so ones behind a spent budget are skipped rather than rewritten
+            while (len(in_flight) < concurrency and started < len(topics_list)
+                   and (started == 0 or api_call_count['total'] < max_api_calls)):
+                topic, topic_config = topics_list[started]
+                topic_metrics = MetricsTracker()
+                future = executor.submit(process_topic, topic, topic_config, api_key, config, topic_metrics,
+                                         api_call_count, rate_limited_flag)
+                in_flight[future] = topic_metrics
+                started += 1
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                metrics.merge(in_flight.pop(future))
+                finished += 1
+                success, is_rate_limited = future.result()
+                if not success:
+                    error_count += 1
+                if is_rate_limited:
+                    rate_limited_flag['value'] = True
+                    if not banner_shown:
+                        banner_shown = True
+                        _log_rate_limit_banner(len(topics_list) - finished)
+    
+    if api_call_count['total'] >= max_api_calls:
+        logger.warning(MSG_WARNING_REACHED_LIMIT.format(limit=max_api_calls))
+        remaining_topics = len(topics_list) - started
+        if remaining_topics > 0:
+            logger.info(MSG_INFO_SKIPPED_TOPICS.format(count=remaining_topics))
+    return error_count
+
 def main() -> int:
     """Main function to update all news files. Returns process exit code."""
     metrics = MetricsTracker()
@@ -1440,14 +1961,23 @@ def main() -> int:
     max_api_calls = get_config_value(config, 'api.max_api_calls', DEFAULT_MAX_API_CALLS)
     rate_limited_flag = {'value': False}  # Track if we hit rate limit globally (use dict for pass-by-reference)
     combine_topics = get_config_value(config, 'api.combine_topics_in_single_request', DEFAULT_COMBINE_TOPICS_IN_SINGLE_REQUEST)
+    topic_delay = get_config_value(config, 'api.topic_delay_seconds', DEFAULT_TOPIC_DELAY_SECONDS)
+    topic_concurrency = max(1, get_config_value(config, 'api.topic_concurrency', DEFAULT_TOPIC_CONCURRENCY))
     
     logger.info(MSG_INFO_API_LIMIT.format(limit=max_api_calls))
+    # Separate requests would skip topics once the budget runs out; one OR query covers them all
+    if (not combine_topics and len(news_sources) > max(1, max_api_calls)
+            and get_config_value(config, 'api.combine_topics_when_quota_tight', DEFAULT_COMBINE_TOPICS_WHEN_QUOTA_TIGHT)):
+        logger.info(MSG_INFO_COMBINED_QUOTA_TIGHT.format(limit=max_api_calls, count=len(news_sources)))
+        combine_topics = True
     if combine_topics:
         logger.info(MSG_INFO_COMBINED_ENABLED)
     else:
-        topic_delay = get_config_value(config, 'api.topic_delay_seconds', DEFAULT_TOPIC_DELAY_SECONDS)
         logger.info(MSG_INFO_COMBINED_DISABLED)
-        logger.info(MSG_INFO_DELAY_BETWEEN.format(delay=topic_delay))
+        if topic_concurrency > 1:
+            logger.info(MSG_INFO_TOPIC_CONCURRENCY.format(count=topic_concurrency))
+        else:
+            logger.info(MSG_INFO_DELAY_BETWEEN.format(delay=topic_delay))
     logger.info("")
     
     # Convert to list of tuples (topics are processed in config order)
@@ -1488,6 +2018,7 @@ def main() -> int:
         # Fetch articles for all topics in one request
         new_articles_dict = {}
         is_rate_limited = False
+        api_failed = False
         rate_limited = rate_limited_flag.get('value', False)
         
         if api_key and not rate_limited:
@@ -1508,6 +2039,7 @@ def main() -> int:
                         logger.warning(f"\n{MSG_WARNING_NO_NEW_ANY}")
             except Exception as fetch_err:
                 logger.error(f"{MSG_ERROR_FETCH_COMBINED}: {fetch_err}")
+                api_failed = True
                 error_count += 1
                 new_articles_dict = {topic: [] for topic in topics_config_dict.keys()}
         elif rate_limited:
@@ -1531,7 +2063,8 @@ def main() -> int:
             
             # Merge, filter, and save articles using shared function
             success, article_count = merge_filter_and_save_articles(
-                topic, topic_config, existing_articles, new_articles, config, metrics
+                topic, topic_config, existing_articles, new_articles, config, metrics,
+                api_failed or is_rate_limited
             )
             if not success:
                 error_count += 1
@@ -1549,6 +2082,10 @@ def main() -> int:
             logger.info(MSG_INFO_CACHED_AVAILABLE_SERVED)
             logger.warning("=" * 70 + "\n")
     
+    elif len(topics_list) > 1 and topic_concurrency > 1:
+        # Individual request mode with topics in parallel; the API budget is shared via _reserve_api_calls
+        error_count += _process_topics_concurrently(topics_list, api_key, config, metrics, api_call_count,
+                                                    rate_limited_flag, topic_concurrency)
     else:
         # Use individual request mode: process each topic separately
         for idx, (topic, topic_config) in enumerate(topics_list, 1):
@@ -1565,18 +2102,7 @@ def main() -> int:
             if is_rate_limited:
                 rate_limited_flag['value'] = True
                 if idx == 1:  # Only show message on first topic that hits rate limit
-                    logger.warning(f"\n" + "=" * 70)
-                    logger.warning(MSG_WARNING_RATE_LIMIT_QUOTA_EXHAUSTED)
-                    logger.warning("=" * 70)
-                    remaining_topics = len(topics_list) - idx
-                    if remaining_topics > 0:
-                        logger.info(MSG_INFO_REMAINING_CACHED.format(count=remaining_topics))
-                    logger.info(MSG_INFO_QUOTA_INFO)
-                    logger.info(f"   - {MSG_INFO_FREE_TIER_12H}")
-                    logger.info(f"   - {MSG_INFO_FREE_TIER_24H}")
-                    logger.info(MSG_INFO_NEXT_SUCCESSFUL)
-                    logger.info(MSG_INFO_CACHED_AVAILABLE_SERVED)
-                    logger.warning("=" * 70 + "\n")
+                    _log_rate_limit_banner(len(topics_list) - idx)
             
             # Stop if we've reached the API call limit
             if api_call_count['total'] >= max_api_calls:
@@ -1617,6 +2143,9 @@ def main() -> int:
     # Print metrics
     metrics.print_summary()
     
+    # Persist conditional-request validators gathered this run
+    _flush_http_caches()
+    
     # Export metrics to JSON if configured
     export_metrics = get_config_value(config, 'metrics.export_to_json', DEFAULT_METRICS_EXPORT_TO_JSON)
     if export_metrics: